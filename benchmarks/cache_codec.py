@@ -0,0 +1,84 @@
+"""
+Benchmark: size and encode/decode time of cached payloads.
+
+Marshals realistic responses (recipe detail, a week of planner items,
+supermarket detail) and compares the legacy json strings with every
+serializer/compressor combination of server.caching.codec.
+
+Does not require Redis.
+
+    python -m benchmarks.cache_codec --repeats 2000
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from flask_restx import marshal
+
+from benchmarks import fixtures
+from server.caching.codec import CacheCodec, SERIALIZERS, COMPRESSORS
+from server.core.models.api_models.recipe import recipe_model_detail
+from server.core.models.api_models.planner import recipe_planner_item_model
+from server.core.models.api_models.supermarket import supermarket_model_detail
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description="Cache codec benchmark.")
+    parser.add_argument("--repeats", type=int, default=2_000)
+    return parser.parse_args()
+
+
+def get_payloads() -> dict:
+    app = fixtures.create_benchmark_app()
+
+    with app.app_context():
+        return {
+            "recipe detail": marshal(fixtures.get_recipe(), recipe_model_detail),  # noqa
+            "planner week": marshal(fixtures.get_planner_items(), recipe_planner_item_model),  # noqa
+            "supermarket": marshal(fixtures.get_supermarket(), supermarket_model_detail),  # noqa
+        }
+
+
+def measure(fn, value, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(value)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+
+    return statistics.median(timings)
+
+
+def get_codecs() -> dict:
+    codecs = {
+        "legacy json": (json.dumps, json.loads)
+    }
+    for serializer in SERIALIZERS.values():
+        for compressor in COMPRESSORS.values():
+            codec = CacheCodec(serializer.name, compressor.name, 0)
+            codecs[f"{serializer.name}+{compressor.name}"] = (
+                codec.encode, codec.decode
+            )
+
+    return codecs
+
+
+def run_benchmark():
+    args = get_args()
+    payloads = get_payloads()
+    codecs = get_codecs()
+
+    print(f"{'payload':>14} | {'codec':>12} | {'bytes':>6} | {'encode (us)':>11} | {'decode (us)':>11}")  # noqa
+    for payload_name, payload in payloads.items():
+        for codec_name, (encode, decode) in codecs.items():
+            encoded = encode(payload)
+            encode_us = measure(encode, payload, args.repeats)
+            decode_us = measure(decode, encoded, args.repeats)
+
+            print(f"{payload_name:>14} | {codec_name:>12} | {len(encoded):>6} | {encode_us:>11.1f} | {decode_us:>11.1f}")  # noqa
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,95 @@
+"""
+Benchmark: cache invalidation latency on writes.
+
+Compares the old pattern based invalidation (scan the keyspace for
+"<Model>:*") with the tag index invalidation used by
+AbstractRedisCache._clear_cache. Every round caches a fixed number of keys
+for the invalidated model, while the number of unrelated keys in Redis grows.
+
+Requires a running Redis (REDIS_HOST, REDIS_PORT).
+
+    python -m benchmarks.cache_invalidation --sizes 1000 10000 100000
+"""
+
+import argparse
+import statistics
+import time
+
+from server.caching.redis import redis, api_cache
+
+
+BENCH_PREFIX = "bench"
+TAGGED_KEYS_PER_ROUND = 50
+REPEATS = 20
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description="Cache invalidation benchmark.")  # noqa
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[1_000, 10_000, 100_000])
+    return parser.parse_args()
+
+
+def fill_unrelated_keys(count: int) -> None:
+    pipe = redis.pipeline(transaction=False)
+    for i in range(count):
+        pipe.set(f"{BENCH_PREFIX}-other:/api/v1/other/?page={i}", "{}")
+        if i % 1_000 == 0:
+            pipe.execute()
+    pipe.execute()
+
+
+def fill_tagged_keys(tag: str) -> None:
+    for i in range(TAGGED_KEYS_PER_ROUND):
+        api_cache.set(
+            f"{tag}:/api/v1/recipe/?page={i}",
+            {"id": i},
+            tags=[tag]
+        )
+
+
+def measure(fn, tag: str) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        fill_tagged_keys(tag)
+        start = time.perf_counter()
+        fn(tag)
+        timings.append((time.perf_counter() - start) * 1_000)
+
+    return statistics.median(timings)
+
+
+def clear_by_pattern(tag: str) -> None:
+    api_cache.clear_cache(f"{tag}:*")
+
+
+def clear_by_tag(tag: str) -> None:
+    api_cache.clear_cache_tags([tag])
+
+
+def cleanup() -> None:
+    api_cache.clear_cache(f"{BENCH_PREFIX}*")
+    api_cache.clear_cache(f"tag-zindex:{BENCH_PREFIX}*")
+
+
+def run_benchmark():
+    args = get_args()
+    tag = f"{BENCH_PREFIX}Recipe"
+
+    print(f"{'keys in redis':>14} | {'pattern (ms)':>12} | {'tag index (ms)':>14}")  # noqa
+    filled = 0
+    try:
+        for size in sorted(args.sizes):
+            fill_unrelated_keys(size - filled)
+            filled = size
+
+            pattern_ms = measure(clear_by_pattern, tag)
+            tag_ms = measure(clear_by_tag, tag)
+
+            print(f"{size:>14} | {pattern_ms:>12.3f} | {tag_ms:>14.3f}")
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    run_benchmark()
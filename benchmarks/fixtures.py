@@ -0,0 +1,164 @@
+"""
+Realistic object graphs for the benchmarks (in-memory sqlite database).
+"""
+
+from datetime import date, timedelta
+
+from flask import Flask
+
+from server.db import db
+from server.monolith import create_app
+from server.core.models.db_models.unit import Unit
+from server.core.models.db_models.tag import Tag
+from server.core.models.db_models.category import Category
+from server.core.models.db_models.ingredient import Ingredient
+from server.core.models.db_models.recipe import (
+    Recipe, RecipeImage, RecipeIngredient
+)
+from server.core.models.db_models.planner import (
+    RecipePlanner, RecipePlannerItem
+)
+from server.core.models.db_models.supermarket import (
+    Supermarket, SupermarketArea, SupermarketAreaIngredientComposite
+)
+
+
+INGREDIENT_COUNT = 60
+RECIPE_COUNT = 20
+INGREDIENTS_PER_RECIPE = 12
+TAGS_PER_RECIPE = 4
+IMAGES_PER_RECIPE = 3
+PLANNER_ITEMS_PER_DAY = 3
+AREA_COUNT = 8
+INGREDIENTS_PER_AREA = 7
+USER_ID = 1
+
+
+def create_benchmark_app() -> Flask:
+    app = create_app(database_uri="sqlite://")
+
+    with app.app_context():
+        populate_database()
+
+    return app
+
+
+def populate_database() -> None:
+    unit = Unit(name="gramm")
+    category = Category(name="Hauptgericht")
+    tags = [Tag(name=f"TagName{i}") for i in range(TAGS_PER_RECIPE * 2)]
+    db.session.add_all([unit, category, *tags])
+    db.session.flush()
+
+    ingredients = [
+        Ingredient(
+            name=f"IngredientName{i}",
+            displayname=f"Ingredient {i}",
+            default_price=1.99,
+            quantity_per_unit=500.,
+            is_spices=i % 5 == 0,
+            search_description=f"Ingredient search description {i}",
+            unit_id=unit.id
+        )
+        for i in range(INGREDIENT_COUNT)
+    ]
+    db.session.add_all(ingredients)
+    db.session.flush()
+
+    recipes = []
+    for i in range(RECIPE_COUNT):
+        recipe = Recipe(
+            name=f"RecipeName{i}",
+            person_count=4,
+            preperation_description=("Step by step preparation. " * 40)[:1_000],  # noqa
+            preperation_time_minutes=45,
+            difficulty="normal",
+            search_description="Pasta tomato basil parmesan",
+            creator_user_id=USER_ID,
+            category_id=category.id
+        )
+        recipe.tags = tags[i % 2:i % 2 + TAGS_PER_RECIPE]
+        recipe.images = [
+            RecipeImage(path=f"/images/recipe-{i}-{n}.png")
+            for n in range(IMAGES_PER_RECIPE)
+        ]
+        db.session.add(recipe)
+        db.session.flush()
+
+        for n in range(INGREDIENTS_PER_RECIPE):
+            db.session.add(
+                RecipeIngredient(
+                    recipe_id=recipe.id,
+                    ingredient_id=ingredients[(i + n) % INGREDIENT_COUNT].id,
+                    quantity=100 + n
+                )
+            )
+        recipes.append(recipe)
+
+    planner = RecipePlanner(
+        name="PlannerName",
+        owner_user_id=USER_ID,
+        is_active=True
+    )
+    db.session.add(planner)
+    db.session.flush()
+
+    monday = date(2024, 1, 1)
+    for day in range(7):
+        for n in range(PLANNER_ITEMS_PER_DAY):
+            db.session.add(
+                RecipePlannerItem(
+                    rplanner_id=planner.id,
+                    recipe_id=recipes[(day + n) % RECIPE_COUNT].id,
+                    date=str(monday + timedelta(days=day)),
+                    label="Abendessen",
+                    order_number=n + 1,
+                    planned_recipe_person_count=2
+                )
+            )
+
+    supermarket = Supermarket(
+        name="Supermarket",
+        street="Street 1",
+        postcode="12345",
+        district="District",
+        owner_user_id=USER_ID
+    )
+    db.session.add(supermarket)
+    db.session.flush()
+
+    for i in range(AREA_COUNT):
+        area = SupermarketArea(
+            name=f"AreaName{i}",
+            order_number=i + 1,
+            supermarket_id=supermarket.id
+        )
+        db.session.add(area)
+        db.session.flush()
+
+        for n in range(INGREDIENTS_PER_AREA):
+            db.session.add(
+                SupermarketAreaIngredientComposite(
+                    sarea_id=area.id,
+                    ingredient_id=ingredients[i * INGREDIENTS_PER_AREA + n].id,  # noqa
+                    ingredient_price=2.49
+                )
+            )
+
+    db.session.commit()
+
+
+def get_recipe() -> Recipe:
+    return Recipe.query.first()
+
+
+def get_recipes() -> list[Recipe]:
+    return Recipe.query.all()
+
+
+def get_planner_items() -> list[RecipePlannerItem]:
+    return RecipePlannerItem.query.all()
+
+
+def get_supermarket() -> Supermarket:
+    return Supermarket.query.first()
@@ -0,0 +1,210 @@
+"""
+Benchmark: recipe search latency.
+
+Compares the old search of RecipeController.handle_get_list (union of four
+LIKE '%text%' queries over recipe, tag, ingredient and category names) with
+the full-text indexes of server.search (SQLite FTS5 and the in-process
+inverted index). Every round adds recipes to an in-memory sqlite database,
+rebuilds the indexes and measures the first result page of each query.
+
+    python -m benchmarks.recipe_search --sizes 10000 100000 1000000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import insert, or_
+
+from server.db import db
+from server.monolith import create_app
+from server.core.models.db_models.tag import Tag
+from server.core.models.db_models.category import Category
+from server.core.models.db_models.ingredient import Ingredient
+from server.core.models.db_models.unit import Unit
+from server.core.models.db_models.recipe import (
+    Recipe, RecipeIngredient, RecipeTagComposite
+)
+from server.search.tokenizer import tokenize
+from server.search.backends import Fts5SearchBackend, InMemorySearchBackend
+
+
+QUERIES = ["tomat", "pasta basil", "suppe kartoffel", "vegetarisch"]
+PAGE_SIZE = 20
+REPEATS = 10
+INSERT_BATCH_SIZE = 10_000
+TAGS_PER_RECIPE = 2
+INGREDIENTS_PER_RECIPE = 6
+
+WORDS = [
+    "tomate", "pasta", "basilikum", "basil", "suppe", "kartoffel", "reis",
+    "curry", "huhn", "lachs", "spinat", "käse", "zwiebel", "knoblauch",
+    "paprika", "linsen", "bohnen", "ofen", "pfanne", "salat", "gratin",
+    "auflauf", "risotto", "pilze", "kürbis", "möhre", "lauch", "brot",
+]
+TAG_NAMES = ["Vegetarisch", "Vegan", "Schnell", "Günstig", "Scharf", "Kinder"]
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description="Recipe search benchmark.")
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[10_000, 100_000, 1_000_000])
+    return parser.parse_args()
+
+
+def populate_base_data() -> tuple[list[int], list[int], list[int]]:
+    unit = Unit(name="gramm")
+    categories = [Category(name=name) for name in ["Hauptgericht", "Dessert", "Vorspeise"]]  # noqa
+    tags = [Tag(name=name) for name in TAG_NAMES]
+    db.session.add_all([unit, *categories, *tags])
+    db.session.flush()
+
+    ingredients = [
+        Ingredient(
+            name=word.capitalize(),
+            displayname=word.capitalize(),
+            default_price=1.99,
+            quantity_per_unit=500.,
+            is_spices=False,
+            search_description=word,
+            unit_id=unit.id
+        )
+        for word in WORDS
+    ]
+    db.session.add_all(ingredients)
+    db.session.commit()
+
+    return (
+        [category.id for category in categories],
+        [tag.id for tag in tags],
+        [ingredient.id for ingredient in ingredients]
+    )
+
+
+def insert_recipes(
+        start: int,
+        count: int,
+        category_ids: list[int],
+        tag_ids: list[int],
+        ingredient_ids: list[int]
+) -> None:
+    rnd = random.Random(start)
+
+    for batch_start in range(start, start + count, INSERT_BATCH_SIZE):
+        batch_ids = range(batch_start + 1, min(start + count, batch_start + INSERT_BATCH_SIZE) + 1)  # noqa
+
+        db.session.execute(insert(Recipe), [
+            {
+                "id": id,
+                "name": f"{' '.join(rnd.sample(WORDS, 2)).capitalize()} {id}",
+                "person_count": 4,
+                "preperation_description": " ".join(rnd.choices(WORDS, k=30)),
+                "preperation_time_minutes": 30,
+                "difficulty": "normal",
+                "search_description": " ".join(rnd.choices(WORDS, k=5)),
+                "creator_user_id": 1,
+                "category_id": rnd.choice(category_ids)
+            }
+            for id in batch_ids
+        ])
+        db.session.execute(insert(RecipeTagComposite), [
+            {"recipe_id": id, "tag_id": tag_id}
+            for id in batch_ids
+            for tag_id in rnd.sample(tag_ids, TAGS_PER_RECIPE)
+        ])
+        db.session.execute(insert(RecipeIngredient), [
+            {"recipe_id": id, "ingredient_id": ingredient_id, "quantity": 100}
+            for id in batch_ids
+            for ingredient_id in rnd.sample(ingredient_ids, INGREDIENTS_PER_RECIPE)  # noqa
+        ])
+
+    db.session.commit()
+
+
+def like_search(search: str) -> list[Recipe]:
+    """
+    Search of RecipeController.handle_get_list before the full-text index.
+    """
+    search_str = f"%{search}%"
+    query = Recipe.query
+
+    query_recipe = query.filter(
+        or_(
+            Recipe.name.like(search_str),
+            Recipe.search_description.like(search_str),
+            Recipe.preperation_description.like(search_str)
+        )
+    )
+    query_tag_search = query \
+        .join(RecipeTagComposite) \
+        .join(Tag) \
+        .filter(Tag.name.like(search_str))
+    query_ingredient_search = query \
+        .join(RecipeIngredient) \
+        .join(Ingredient) \
+        .filter(Ingredient.name.like(search_str))
+    query_category_search = query.join(Category).filter(
+        Category.name.like(search_str)
+    )
+
+    return query_recipe.union(query_tag_search) \
+        .union(query_ingredient_search) \
+        .union(query_category_search) \
+        .limit(PAGE_SIZE) \
+        .all()
+
+
+def index_search(backend, search: str) -> list[Recipe]:
+    connection = db.session.connection()
+    recipe_ids = backend.search(connection, tokenize(search), PAGE_SIZE)
+
+    return Recipe.query.filter(Recipe.id.in_(recipe_ids)).all()
+
+
+def measure(fn, *args) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        fn(*args)
+        timings.append((time.perf_counter() - start) * 1_000)
+
+    return statistics.median(timings)
+
+
+def run_benchmark():
+    args = get_args()
+    app = create_app(database_uri="sqlite://")
+
+    with app.app_context():
+        ids = populate_base_data()
+        fts5_backend = Fts5SearchBackend()
+        memory_backend = InMemorySearchBackend(max_age=float("inf"))
+
+        print(f"{'recipes':>9} | {'query':<16} | {'LIKE (ms)':>10} | {'fts5 (ms)':>10} | {'memory (ms)':>11}")  # noqa
+        inserted = 0
+        for size in sorted(args.sizes):
+            insert_recipes(inserted, size - inserted, *ids)
+            inserted = size
+
+            start = time.perf_counter()
+            fts5_backend.rebuild(db.session.connection())
+            db.session.commit()
+            fts5_build_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            memory_backend.rebuild(db.session.connection())
+            memory_build_s = time.perf_counter() - start
+            print(f"{size:>9} | index build: fts5 {fts5_build_s:.1f} s, memory {memory_build_s:.1f} s")  # noqa
+
+            for search in QUERIES:
+                like_ms = measure(like_search, search)
+                fts5_ms = measure(index_search, fts5_backend, search)
+                memory_ms = measure(index_search, memory_backend, search)
+
+                print(f"{size:>9} | {search:<16} | {like_ms:>10.2f} | {fts5_ms:>10.2f} | {memory_ms:>11.2f}")  # noqa
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,80 @@
+"""
+Benchmark: response serialization time.
+
+Compares flask_restx.marshal with the precompiled serializers of
+server.utils.serializer on realistic object graphs (recipe detail, all
+recipes, a week of planner items, supermarket detail). The relationships
+are loaded before measuring, so only the serialization is timed. Every
+output is checked to be identical to the one of marshal.
+
+Does not require Redis.
+
+    python -m benchmarks.serializers --repeats 200
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from flask_restx import marshal
+
+from benchmarks import fixtures
+from server.utils.serializer import compile_serializer, serialize
+from server.core.models.api_models.recipe import (
+    recipe_model, recipe_model_detail
+)
+from server.core.models.api_models.planner import recipe_planner_item_model
+from server.core.models.api_models.supermarket import supermarket_model_detail
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description="Serializer benchmark.")
+    parser.add_argument("--repeats", type=int, default=200)
+    return parser.parse_args()
+
+
+def get_graphs() -> dict:
+    return {
+        "recipe detail": (fixtures.get_recipe(), recipe_model_detail),
+        "recipe list": (fixtures.get_recipes(), recipe_model),
+        "recipe details": (fixtures.get_recipes(), recipe_model_detail),
+        "planner week": (fixtures.get_planner_items(), recipe_planner_item_model),  # noqa
+        "supermarket": (fixtures.get_supermarket(), supermarket_model_detail),  # noqa
+    }
+
+
+def measure(fn, data, api_model, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(data, api_model)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+
+    return statistics.median(timings)
+
+
+def run_benchmark():
+    args = get_args()
+    app = fixtures.create_benchmark_app()
+
+    with app.app_context():
+        graphs = get_graphs()
+
+        print(f"{'graph':>14} | {'marshal (us)':>12} | {'compiled (us)':>13} | {'speedup':>7}")  # noqa
+        for graph_name, (data, api_model) in graphs.items():
+            compile_serializer(api_model)
+
+            # loads the relationships and checks the output
+            expected_data = json.dumps(marshal(data, api_model))
+            if json.dumps(serialize(data, api_model)) != expected_data:
+                raise AssertionError(f"Different output for '{graph_name}'.")  # noqa
+
+            marshal_us = measure(marshal, data, api_model, args.repeats)
+            compiled_us = measure(serialize, data, api_model, args.repeats)
+
+            print(f"{graph_name:>14} | {marshal_us:>12.1f} | {compiled_us:>13.1f} | {marshal_us / compiled_us:>6.1f}x")  # noqa
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -25,3 +25,10 @@ api = Api(
     security="Bearer Auth",
     doc="/swagger-docs",
 )
+
+# response headers of the api, which browser clients are allowed to read
+# (CORS expose_headers of every app)
+EXPOSED_HEADERS = [
+    "X-Next-Cursor", "X-Total-Count", "X-Missing-Ids",
+    "X-Search-Truncated"
+]
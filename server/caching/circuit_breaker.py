@@ -0,0 +1,87 @@
+import time
+
+from threading import Lock
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing backend for a cool-down window.
+
+    closed:    every call is allowed, consecutive failures are counted
+    open:      after failure_threshold failures no call is allowed
+               for reset_timeout seconds
+    half_open: after the cool-down one trial call is allowed, its result
+               closes or opens the circuit again
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._lock = Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.
+        self._is_trial_running = False
+        self._rejected_calls = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._get_state()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self._get_state()
+
+            if state == CLOSED:
+                return True
+
+            if state == HALF_OPEN and not self._is_trial_running:
+                self._is_trial_running = True
+                return True
+
+            self._rejected_calls += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._is_trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._is_trial_running = False
+
+            if self._state == OPEN or self._failures >= self._failure_threshold:  # noqa
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            state = self._get_state()
+            retry_in = 0.
+            if state == OPEN:
+                retry_in = round(self._opened_at + self._reset_timeout - time.monotonic(), 3)  # noqa
+
+            return {
+                "state": state,
+                "failures": self._failures,
+                "rejected_calls": self._rejected_calls,
+                "retry_in_seconds": retry_in
+            }
+
+    def _get_state(self) -> str:
+        if (
+            self._state == OPEN and
+            time.monotonic() - self._opened_at >= self._reset_timeout
+        ):
+            return HALF_OPEN
+
+        return self._state
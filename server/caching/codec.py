@@ -0,0 +1,148 @@
+"""
+Serialization of cached values.
+
+Every encoded value starts with one header byte:
+    bit 7:    always set (HEADER_FLAG)
+    bits 4-6: serializer id
+    bits 0-3: compressor id
+The header bytes are no ascii, a json text never starts with them. So
+values without header (plain json strings written by older versions) are
+still decoded as json.
+"""
+
+import os
+import json
+import zlib
+
+from typing import Any
+
+import orjson
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+
+CACHE_SERIALIZER = os.environ.get("CACHE_SERIALIZER", "orjson")
+CACHE_COMPRESSOR = os.environ.get("CACHE_COMPRESSOR", "zlib")
+CACHE_COMPRESSION_THRESHOLD = int(os.environ.get("CACHE_COMPRESSION_THRESHOLD", 1_024))  # noqa
+ZLIB_LEVEL = 1
+HEADER_FLAG = 0x80
+
+
+class JsonSerializer:
+    id = 1
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer:
+    id = 2
+    name = "orjson"
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class NoneCompressor:
+    id = 0
+    name = "none"
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+
+class ZlibCompressor:
+    id = 1
+    name = "zlib"
+
+    def __init__(self, level: int = ZLIB_LEVEL) -> None:
+        self._level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self._level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+SERIALIZERS = {
+    serializer.id: serializer
+    for serializer in [JsonSerializer(), OrjsonSerializer()]
+}
+
+COMPRESSORS = {
+    compressor.id: compressor
+    for compressor in [NoneCompressor(), ZlibCompressor()]
+}
+
+
+def _find_by_name(registry: dict, name: str) -> Any:
+    for item in registry.values():
+        if item.name == name:
+            return item
+
+    err_msg = f"Unknown cache codec '{name}'. Use: {[i.name for i in registry.values()]}."  # noqa
+    raise ValueError(err_msg)
+
+
+class CacheCodec:
+
+    def __init__(
+            self,
+            serializer: str = CACHE_SERIALIZER,
+            compressor: str = CACHE_COMPRESSOR,
+            compression_threshold: int = CACHE_COMPRESSION_THRESHOLD
+    ) -> None:
+        self._serializer = _find_by_name(SERIALIZERS, serializer)
+        self._compressor = _find_by_name(COMPRESSORS, compressor)
+        self._compression_threshold = compression_threshold
+
+    def encode(self, value: Any) -> bytes:
+        data = self._serializer.dumps(value)
+
+        compressor = COMPRESSORS[NoneCompressor.id]
+        if len(data) >= self._compression_threshold:
+            compressor = self._compressor
+
+        header = HEADER_FLAG | (self._serializer.id << 4) | compressor.id
+        return bytes([header]) + compressor.compress(data)
+
+    def decode(self, data: bytes | str) -> Any:
+        """
+        Raises ValueError (or an error of the serializer / compressor) for
+        data, which is neither encoded nor plain json.
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        if not data:
+            return None
+
+        header = data[0]
+        if not header & HEADER_FLAG:
+            # value without header: plain json
+            return json.loads(data)
+
+        serializer = SERIALIZERS.get((header >> 4) & 0x07)
+        compressor = COMPRESSORS.get(header & 0x0F)
+
+        if serializer is None or compressor is None:
+            err_msg = f"Unknown cache codec header {header:#04x}."
+            raise ValueError(err_msg)
+
+        return serializer.loads(compressor.decompress(data[1:]))
+
+
+cache_codec = CacheCodec()
@@ -1,232 +1,410 @@
 """
-IN DEV, JUST AN IDEA
+Dependency graph of the cached models.
+
+Every caching controller registers its main model and api models. At
+startup the graph follows the nested fields of the api models along the
+SQLAlchemy relationships, so it knows for every model in which cached
+responses (root models) it is embedded and through which relationship path.
+
+A write of one model then drops
+    - the tags of the changed model itself and
+    - the tags of every root model embedding it. For normalized roots only
+      the documents of the affected entities (found with one query along
+      the relationship path) are dropped, instead of the whole model.
+
+Scoped dependencies cover entries of custom queries, which only depend on
+the rows reachable from one scope entity (e.g. the shopping list of a
+planner). A write only drops the entries tagged with the affected scope
+entities (see ApiModelCache.gen_scope_tag).
 """
 
-from enum import Enum
-from abc import ABC, abstractclassmethod
-from typing import Type
+from threading import Lock
+from typing import Any, Type
+from dataclasses import dataclass, field
 
-from flask_restx import Model
+from flask_restx import Model, fields
+from sqlalchemy import inspect
+from sqlalchemy.orm import RelationshipProperty, InstrumentedAttribute
 
+from server.db import db
+from server.logger import logger
 from server.caching.redis import api_cache
-from server.core.models.db_models.planner import (
-    RecipePlanner, RecipePlannerItem
-)
-from server.core.models.db_models.unit import Unit
-from server.core.models.db_models.tag import Tag
-from server.core.models.db_models.category import Category
-from server.core.models.db_models.ingredient import Ingredient
-from server.core.models.db_models.recipe import Recipe, RecipeIngredient
-from server.core.models.db_models.collection import (
-    Collection, CollectionRecipeComposite
-)
-from server.core.models.db_models.cart import Cart, CartItem
-from server.core.models.db_models.supermarket import (
-    SupermarketArea,
-    SupermarketAreaIngredientComposite)
-
-
-class CachingComponentType(Enum):
-    MODEL = 1
-    COMPOSITE = 2
-
-
-class AbstractCachingComponent(ABC):
-
-    @abstractclassmethod
-    def set_parent(self, parent: 'CachingModelComposite') -> None: pass
+from server.core.models.db_models.planner import RecipePlanner
+from server.core.models.db_models.recipe import Recipe
+from server.core.models.db_models.collection import Collection
+from server.core.models.db_models.supermarket import Supermarket
+
+
+# api fields, which render a python property instead of a relationship
+PROPERTY_RELATIONSHIPS: dict[tuple[Type[db.Model], str], list[str]] = {
+    (Collection, "recipes"): ["recipes_", "recipe"],
+    (Supermarket, "areas"): ["areas_unsorted"],
+    (RecipePlanner, "items"): ["items_unsorted"],
+    (Recipe, "rating_aggregate"): ["ratings"],
+}
+
+# more affected entities than this drop the whole root model
+MAX_AFFECTED_IDS = 500
+
+
+@dataclass
+class CachingDependency:
+    root: Type[db.Model]
+    # relationships from the root to the embedded model,
+    # None: dependency without relationship (custom queries)
+    path: list[InstrumentedAttribute] = None
+    # the embedded model is the association model of the last relationship
+    is_association: bool = False
+    # the path starts at this model instead of the root
+    scope: Type[db.Model] = None
+
+
+@dataclass
+class CachingModel:
+    model: Type[db.Model]
+    api_models: list[Model] = field(default_factory=list)
+    dependencies: list[Type[db.Model]] = field(default_factory=list)
+    scoped_dependencies: list[tuple[Type[db.Model], str]] = field(default_factory=list)  # noqa
+    list_fields: set[str] = field(default_factory=set)
+    use_normalized_cache: bool = False
+
+
+class CachingModelGraph:
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._caching_models: dict[Type[db.Model], CachingModel] = {}
+        self._dependents: dict[Type[db.Model], list[CachingDependency]] = {}
+        self._is_built = False
+
+    def register(
+            self,
+            model: Type[db.Model],
+            api_models: list[Model] = None,
+            dependencies: list[Type[db.Model]] = None,
+            list_fields: list[str] = None,
+            use_normalized_cache: bool = False,
+            scoped_dependencies: list[tuple[Type[db.Model], str]] = None
+    ) -> None:
+        """
+        scoped_dependencies: (scope model, relationship path from the scope
+            model like "items_unsorted.recipe.ingredients")
+        """
+        with self._lock:
+            caching_model = self._caching_models.setdefault(
+                model, CachingModel(model))
+
+            caching_model.api_models += [
+                api_model for api_model in api_models or []
+                if api_model is not None and api_model not in caching_model.api_models  # noqa
+            ]
+            caching_model.dependencies += dependencies or []
+            caching_model.scoped_dependencies += scoped_dependencies or []
+            caching_model.list_fields |= set(list_fields or [])
+            caching_model.use_normalized_cache |= use_normalized_cache
+
+            self._is_built = False
+
+    def build(self) -> None:
+        with self._lock:
+            if self._is_built:
+                return
+
+            self._dependents = {}
+            for caching_model in self._caching_models.values():
+                for api_model in caching_model.api_models:
+                    self._add_api_model_dependencies(
+                        root=caching_model.model,
+                        model=caching_model.model,
+                        api_model=api_model,
+                        path=[]
+                    )
+
+                for dependency in caching_model.dependencies:
+                    self._add_dependency(
+                        dependency, CachingDependency(caching_model.model))
+
+                for scope, path in caching_model.scoped_dependencies:
+                    self._add_scoped_dependencies(
+                        caching_model.model, scope, path)
+
+            self._is_built = True
+
+    def get_dependents(
+            self,
+            model: Type[db.Model]
+    ) -> list[CachingDependency]:
+        self.build()
+        return self._dependents.get(model, [])
 
-    @abstractclassmethod
-    def reset_cache(self) -> None: pass
+    def get_invalidation_tags(
+            self,
+            model: Type[db.Model],
+            primary_key: tuple = None,
+            changed_fields: list[str] = None
+    ) -> set[str]:
+        """
+        Minimal set of cache tags to drop after a write of the model.
+        primary_key=None: unknown rows changed, drops everything of the model
+        changed_fields=None: the row was created or deleted
+        """
+        self.build()
 
-    @abstractclassmethod
-    def get_type(self) -> CachingComponentType: pass
+        tags = self._get_own_tags(model, primary_key, changed_fields)
 
+        for dependency in self.get_dependents(model):
+            tags |= self._get_dependent_tags(dependency, model, primary_key)
 
-class CachingModel(AbstractCachingComponent):
-    _parent: 'CachingModelComposite' = None
+        return tags
 
-    def __init__(
+    def has_foreign_keys(
             self,
-            model: Type[Model]
-    ) -> None:
-        self._model = model
+            model: Type[db.Model],
+            changed_fields: list[str]
+    ) -> bool:
+        mapper = inspect(model)
+        return any(
+            len(mapper.columns[field].foreign_keys) > 0
+            for field in changed_fields
+            if field in mapper.columns
+        )
+
+    def _get_own_tags(
+            self,
+            model: Type[db.Model],
+            primary_key: tuple = None,
+            changed_fields: list[str] = None
+    ) -> set[str]:
+        caching_model = self._caching_models.get(model)
+        is_normalized = (
+            caching_model is not None and
+            caching_model.use_normalized_cache
+        )
+
+        if not is_normalized or primary_key is None:
+            return {api_cache.gen_tag(model)}
+
+        tags = {
+            api_cache.gen_responses_tag(model),
+            api_cache.gen_entity_tag(model, primary_key[0])
+        }
+
+        if changed_fields is None or caching_model.list_fields.intersection(changed_fields):  # noqa
+            tags.add(api_cache.gen_ids_tag(model))
+
+        return tags
+
+    def _get_dependent_tags(
+            self,
+            dependency: CachingDependency,
+            model: Type[db.Model],
+            primary_key: tuple = None
+    ) -> set[str]:
+        root = dependency.root
+        caching_model = self._caching_models[root]
+
+        if dependency.scope is not None:
+            return self._get_scoped_tags(dependency, model, primary_key)
+
+        if (
+            not caching_model.use_normalized_cache or
+            dependency.path is None or
+            primary_key is None
+        ):
+            return {api_cache.gen_tag(root)}
+
+        root_ids = self._find_root_ids(dependency, model, primary_key)
+        if root_ids is None:
+            return {api_cache.gen_tag(root)}
+
+        # embedded data can be part of the list filters (search), so the
+        # id lists are dropped as well
+        return {
+            api_cache.gen_responses_tag(root),
+            api_cache.gen_ids_tag(root),
+            *[api_cache.gen_entity_tag(root, id) for id in root_ids]
+        }
+
+    def _get_scoped_tags(
+            self,
+            dependency: CachingDependency,
+            model: Type[db.Model],
+            primary_key: tuple = None
+    ) -> set[str]:
+        root = dependency.root
 
-    def get_type(self) -> CachingComponentType:
-        return CachingComponentType.MODEL
+        if primary_key is None:
+            return {api_cache.gen_tag(root)}
 
-    def set_parent(self, parent: 'CachingModelComposite') -> None:
-        self._parent = parent
+        scope_ids = self._find_root_ids(dependency, model, primary_key)
+        if scope_ids is None:
+            return {api_cache.gen_tag(root)}
 
-    def reset_cache(self) -> None:
-        redis_key_pattern = api_cache.gen_key(self._model, "*")
-        api_cache.clear_cache(redis_key_pattern)
-        print(f"{str(self)}: RESET MODEL CACHE: {redis_key_pattern}")
+        return {
+            api_cache.gen_scope_tag(root, dependency.scope, id)
+            for id in scope_ids
+        }
 
-    def __str__(self) -> str:
-        return f"CachingModel(model={self._model.__name__})"
+    def _find_root_ids(
+            self,
+            dependency: CachingDependency,
+            model: Type[db.Model],
+            primary_key: tuple
+    ) -> list | None:
+        """
+        Ids of the root (or of the scope) embedding the written row.
+        """
+        try:
+            root_mapper = inspect(dependency.scope or dependency.root)
+            query = db.session.query(root_mapper.primary_key[0])
+
+            path = dependency.path
+            if dependency.is_association:
+                path = path[:-1]
+
+            for relationship in path:
+                query = query.join(relationship)
+
+            if dependency.is_association:
+                # the ORM join of a many to many relationship aliases the
+                # secondary table, so it is joined explicitly
+                relationship = dependency.path[-1].property
+                query = query.join(
+                    relationship.secondary, relationship.primaryjoin)
+
+            query = query.filter(*[
+                column == value
+                for column, value in zip(inspect(model).primary_key, primary_key)  # noqa
+            ])
 
-    def __repr__(self) -> str:
-        return str(self)
+            rows = query.distinct().limit(MAX_AFFECTED_IDS + 1).all()
+            if len(rows) > MAX_AFFECTED_IDS:
+                return None
 
+            return [row[0] for row in rows]
 
-class CachingModelComposite(AbstractCachingComponent):
+        except Exception as e:
+            logger.error(f"Caching dependency query of '{dependency.root.__name__}' failed: {str(e)}")  # noqa
+            return None
 
-    def __init__(
+    def _add_api_model_dependencies(
             self,
-            components: list[AbstractCachingComponent] = None,
-            is_root: bool = False
+            root: Type[db.Model],
+            model: Type[db.Model],
+            api_model: Model,
+            path: list[InstrumentedAttribute]
     ) -> None:
-        self._is_root = is_root
-
-        self._components = components if components is not None else []
-        for child in self._components:
-            child.set_parent(self)
-
-    def get_type(self) -> CachingComponentType:
-        return CachingComponentType.COMPOSITE
-
-    def add(self, component: AbstractCachingComponent) -> None:
-        self._components.append(component)
-        component.set_parent(self)
-
-    def remove(self, component: AbstractCachingComponent) -> None:
-        self._components.remove(component)
-
-    def get_children(self) -> list[Model]:
-        return self._components
-
-    def reset_cache(self, reset_this_level: bool = False) -> None:
-        print(f"{str(self)}: RESET CACHE OF CHILDREN")
-        for child in self._components:
-            is_reset = (
-                reset_this_level or
-                child.get_type() == CachingComponentType.COMPOSITE
-            )
-
-            if not is_reset:
+        for name, api_field in api_model.items():
+            nested_api_model = self._get_nested_api_model(api_field)
+            if nested_api_model is None:
                 continue
 
-            child.reset_cache(reset_this_level=True)
+            attribute = api_field.attribute if isinstance(api_field.attribute, str) else name  # noqa
+            relationship_names = self._get_relationship_names(model, attribute)  # noqa
+            if relationship_names is None:
+                logger.warning(f"Caching dependency of '{model.__name__}.{attribute}' is not a relationship.")  # noqa
+                continue
 
-    def print_recursive(self) -> None:
-        self_str = f"CachingModelComposite(\nchildren={str(self._models)})"
-        print(self_str)
+            current_model = model
+            current_path = list(path)
+            for relationship_name in relationship_names:
+                relationship: RelationshipProperty = inspect(current_model).relationships[relationship_name]  # noqa
+                current_path.append(getattr(current_model, relationship_name))  # noqa
+                current_model = relationship.mapper.class_
+
+                # association model of a many to many relationship
+                association_model = self._find_association_model(relationship)  # noqa
+                if association_model is not None:
+                    self._add_dependency(
+                        association_model,
+                        CachingDependency(
+                            root, list(current_path), is_association=True)
+                    )
+
+                self._add_dependency(
+                    current_model,
+                    CachingDependency(root, list(current_path))
+                )
+
+            self._add_api_model_dependencies(
+                root=root,
+                model=current_model,
+                api_model=nested_api_model,
+                path=current_path
+            )
 
-    def _set_index(self) -> None:
-        # TODO SETUP INDEX!
-        pass
+    def _add_scoped_dependencies(
+            self,
+            root: Type[db.Model],
+            scope: Type[db.Model],
+            path: str
+    ) -> None:
+        current_model = scope
+        current_path = []
+        for relationship_name in path.split("."):
+            relationship: RelationshipProperty = inspect(current_model).relationships[relationship_name]  # noqa
+            current_path.append(getattr(current_model, relationship_name))
+            current_model = relationship.mapper.class_
+
+            association_model = self._find_association_model(relationship)
+            if association_model is not None:
+                self._add_dependency(
+                    association_model,
+                    CachingDependency(
+                        root,
+                        list(current_path),
+                        is_association=True,
+                        scope=scope
+                    )
+                )
+
+            self._add_dependency(
+                current_model,
+                CachingDependency(root, list(current_path), scope=scope)
+            )
 
+    def _add_dependency(
+            self,
+            model: Type[db.Model],
+            dependency: CachingDependency
+    ) -> None:
+        # the root model itself is handled by _get_own_tags
+        if model is dependency.root:
+            return
 
-if __name__ == "__main__":
+        self._dependents.setdefault(model, []).append(dependency)
 
-    # CACHING MODELS
+    def _get_nested_api_model(self, api_field: Any) -> Model | None:
+        if isinstance(api_field, fields.List):
+            api_field = api_field.container
 
-    unit_caching_model = CachingModel(Unit)
-    tag_caching_model = CachingModel(Tag)
-    category_caching_model = CachingModel(Category)
+        if isinstance(api_field, fields.Nested):
+            return api_field.nested
 
-    ingredient_caching_model = CachingModel(Ingredient)
-    recipe_ingredient_caching_model = CachingModel(RecipeIngredient)
-    recipe_caching_model = CachingModel(Recipe)
+        return None
 
-    supermarket_area_caching_model = CachingModel(SupermarketArea)
-    supermarket_area_ingredient_caching_model = CachingModel(
-        SupermarketAreaIngredientComposite)
+    def _get_relationship_names(
+            self,
+            model: Type[db.Model],
+            attribute: str
+    ) -> list[str] | None:
+        if attribute in inspect(model).relationships:
+            return [attribute]
 
-    recipe_planner_caching_model = CachingModel(RecipePlanner)
-    recipe_planner_item_caching_model = CachingModel(RecipePlannerItem)
+        return PROPERTY_RELATIONSHIPS.get((model, attribute))
 
-    collection_caching_model = CachingModel(Collection)
-    collection_recipe_caching_model = CachingModel(CollectionRecipeComposite)
+    def _find_association_model(
+            self,
+            relationship: RelationshipProperty
+    ) -> Type[db.Model] | None:
+        if relationship.secondary is None:
+            return None
 
-    cart_caching_model = CachingModel(Cart)
-    cart_item_caching_model = CachingModel(CartItem)
+        for mapper in db.Model.registry.mappers:
+            if mapper.local_table is relationship.secondary:
+                return mapper.class_
 
-    # COMPOSITE MODELS
+        return None
 
-    recipe_centered_composite = CachingModelComposite([
-        CachingModel(Unit),
-        CachingModel(Tag),
-        CachingModel(Category),
-        CachingModelComposite([
-            CachingModel(Ingredient),
-            CachingModel(RecipeIngredient),
-            CachingModelComposite([
-                CachingModel(Recipe),
-                CachingModelComposite([
-                    CachingModel(CollectionRecipeComposite),
-                    CachingModelComposite([
-                        CachingModel(Collection),
-                    ]),
-                ]),
-            ])
-        ])
-    ], is_root=True)
-
-    cart_composite = CachingModelComposite([
-        CachingModel(Ingredient),
-        CachingModel(RecipeIngredient),
-        CachingModelComposite([
-            CachingModel(Recipe),
-        ])
-    ], is_root=True)
-
-    recipe_service_components = CachingModelComposite([
-        CachingModel(Unit),
-        CachingModel(Tag),
-        CachingModel(Category),
-        CachingModelComposite([
-            CachingModel(Ingredient),
-            CachingModelComposite([
-                CachingModel(SupermarketAreaIngredientComposite),
-                CachingModel(SupermarketArea),
-
-                # SUPERMARKET
-                CachingModelComposite([
-                    CachingModel(RecipePlannerItem),
-                    CachingModelComposite([
-                        CachingModel(RecipePlanner)
-                    ])
-                ]),
-            ]),
-        ]),
-
-        CachingModelComposite([
-            CachingModel(Ingredient),
-            CachingModel(RecipeIngredient),
-
-            # RECIPE
-            CachingModelComposite([
-                CachingModel(Recipe),
-
-                # COLLECTION
-                CachingModelComposite([
-                    CachingModel(CollectionRecipeComposite),
-                    CachingModelComposite([
-                        CachingModel(Collection),
-                    ]),
-                ]),
-
-                # PLANNER
-                CachingModelComposite([
-                    CachingModel(RecipePlannerItem),
-                    CachingModelComposite([
-                        CachingModel(RecipePlanner)
-                    ])
-                ]),
-
-                # CART
-                CachingModelComposite([
-                    CachingModel(CartItem),
-                    CachingModelComposite([
-                        CachingModel(Cart)
-                    ])
-                ])
-            ])
-        ])
-    ])
 
-    # AM ENDE EIN DICTIONARY BAUEN, WLECHE MIT GET.RESET AREBIET!
-    cart_model = None
-    supermarket_model = None
+caching_model_graph = CachingModelGraph()
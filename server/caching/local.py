@@ -0,0 +1,138 @@
+import time
+
+from typing import Any
+from threading import Lock
+from collections import OrderedDict
+
+from server.caching.stats import CacheStats
+
+
+class LocalLRUCache:
+    """
+    Bounded in-process LRU cache with a fixed time to live per entry.
+    Entries are registered under tags, so they can be dropped together
+    (same tags as the redis tag index).
+
+    Every invalidation increments the generation of the cache. A value read
+    from Redis is only stored, if none of its tags was invalidated since the
+    generation before the read, otherwise an invalidation, which arrives
+    while the value is in flight, would be overwritten by the stale value.
+    """
+
+    def __init__(self, max_size: int, expiring_time: int) -> None:
+        self._max_size = max_size
+        self._ex = expiring_time
+        self._lock = Lock()
+        self._entries: OrderedDict[str, tuple[float, list[str], Any]] = OrderedDict()  # noqa
+        self._tag_index: dict[str, set[str]] = {}
+        self._generation = 0
+        # tag -> (generation, time) of its last invalidation, kept for the
+        # expiring time, older reads are rejected by the pruned generation
+        self._tag_generations: OrderedDict[str, tuple[int, float]] = OrderedDict()  # noqa
+        self._pruned_generation = 0
+        self._cleared_generation = 0
+        self.stats = CacheStats()
+
+    @property
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.stats.miss()
+                return None
+
+            expires_at, _, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.stats.miss()
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hit()
+            return value
+
+    def set(
+            self,
+            key: str,
+            value: Any,
+            tags: list[str] = None,
+            generation: int = None
+    ) -> None:
+        """
+        generation: generation before the value was read, the value is
+            dropped, if one of the tags was invalidated in the meantime
+        """
+        tags = tags if tags else []
+        with self._lock:
+            if generation is not None and self._is_invalidated(tags, generation):  # noqa
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            expires_at = time.monotonic() + self._ex
+            self._entries[key] = (expires_at, tags, value)
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self._max_size:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+
+    def clear_tags(self, tags: list[str]) -> None:
+        with self._lock:
+            self._generation += 1
+            now = time.monotonic()
+
+            for tag in tags:
+                self._tag_generations[tag] = (self._generation, now)
+                self._tag_generations.move_to_end(tag)
+                for key in list(self._tag_index.get(tag, [])):
+                    self._remove(key)
+
+            self._prune_tag_generations(now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._cleared_generation = self._generation
+            self._entries.clear()
+            self._tag_index.clear()
+            self._tag_generations.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _is_invalidated(self, tags: list[str], generation: int) -> bool:
+        if generation < max(self._cleared_generation, self._pruned_generation):  # noqa
+            return True
+
+        return any(
+            self._tag_generations.get(tag, (0, 0.))[0] > generation
+            for tag in tags
+        )
+
+    def _prune_tag_generations(self, now: float) -> None:
+        while self._tag_generations:
+            tag, (generation, invalidated_at) = next(iter(self._tag_generations.items()))  # noqa
+            if invalidated_at > now - self._ex:
+                return
+
+            del self._tag_generations[tag]
+            self._pruned_generation = generation
+
+    def _remove(self, key: str) -> None:
+        _, tags, _ = self._entries.pop(key)
+        for tag in tags:
+            tag_keys = self._tag_index.get(tag)
+            if tag_keys is None:
+                continue
+
+            tag_keys.discard(key)
+            if not tag_keys:
+                del self._tag_index[tag]
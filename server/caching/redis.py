@@ -1,30 +1,119 @@
 # type: ignore
 import os
 import json
+import time
+import hashlib
 
-from typing import Any
+from typing import Any, Callable
+from functools import wraps
+from threading import Thread, Lock
 
 from flask import request
-from redis import Redis
+from flask_restx import Model
+from redis import Redis, BlockingConnectionPool
+from redis.client import Pipeline
 from dotenv import load_dotenv
 
 from server.db import db
 from server.logger import logger
+from server.caching.local import LocalLRUCache
+from server.caching.codec import cache_codec
+from server.caching.stats import CacheStats
+from server.caching.circuit_breaker import CircuitBreaker
 
 
 load_dotenv()
 
 
 DEFAULT_CACHE_TIME = 60 * 60
+TAG_INDEX_PREFIX = "tag-zindex"
+CLEAR_CACHE_BATCH_SIZE = 500
+
+LOCAL_CACHE_TIME = int(os.environ.get("LOCAL_CACHE_TIME", 30))
+LOCAL_CACHE_MAX_SIZE = int(os.environ.get("LOCAL_CACHE_MAX_SIZE", 1_000))
+INVALIDATION_CHANNEL = "cache-invalidation"
+INVALIDATION_RECONNECT_TIME = 5
+
+LOAD_LOCK_PREFIX = "lock"
+LOAD_LOCK_TIME_MS = 10_000
+LOAD_LOCK_POLL_INTERVAL = 0.05
 
 REDIS_HOST = os.environ.get("REDIS_HOST")
 REDIS_PORT = os.environ.get("REDIS_PORT")
-
-redis = Redis(host=REDIS_HOST, port=REDIS_PORT)
+REDIS_CONNECT_TIMEOUT = float(os.environ.get("REDIS_CONNECT_TIMEOUT", 0.1))
+REDIS_SOCKET_TIMEOUT = float(os.environ.get("REDIS_SOCKET_TIMEOUT", 0.25))
+REDIS_MAX_CONNECTIONS = int(os.environ.get("REDIS_MAX_CONNECTIONS", 50))
+# max. waiting time for a free connection of the pool
+REDIS_POOL_TIMEOUT = float(os.environ.get("REDIS_POOL_TIMEOUT", 0.1))
+
+REDIS_FAILURE_THRESHOLD = int(os.environ.get("REDIS_FAILURE_THRESHOLD", 5))
+REDIS_RESET_TIMEOUT = float(os.environ.get("REDIS_RESET_TIMEOUT", 10))
+
+redis_pool = BlockingConnectionPool(
+    host=REDIS_HOST,
+    port=REDIS_PORT or 6379,
+    socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+    socket_timeout=REDIS_SOCKET_TIMEOUT,
+    max_connections=REDIS_MAX_CONNECTIONS,
+    timeout=REDIS_POOL_TIMEOUT
+)
+
+redis = Redis(connection_pool=redis_pool)
+
+# the subscriber blocks on reading, so it uses its own connection without
+# read timeout
+pubsub_redis = Redis(
+    host=REDIS_HOST,
+    port=REDIS_PORT or 6379,
+    socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+    health_check_interval=30
+)
+
+redis_circuit_breaker = CircuitBreaker(
+    failure_threshold=REDIS_FAILURE_THRESHOLD,
+    reset_timeout=REDIS_RESET_TIMEOUT
+)
+
+# deletes the lock only, if it is still owned by the given token
+_release_lock_script = redis.register_script("""
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+""")
+
+
+def redis_call(default: Any = None) -> Callable:
+    """
+    Decorator for the methods calling Redis.
+    While the circuit breaker is open, Redis is skipped and the default is
+    returned. Errors are logged, counted by the circuit breaker and return
+    the default as well.
+    """
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(self: "BaseRedisCaching", *args, **kwargs) -> Any:
+            if not redis_circuit_breaker.allow_request():
+                return default
+
+            try:
+                result = fn(self, *args, **kwargs)
+                redis_circuit_breaker.record_success()
+                return result
+            except Exception as e:
+                redis_circuit_breaker.record_failure()
+                self._log_redis_error(e)
+                return default
+
+        return wrapper
+    return decorator
 
 
 class BaseRedisCaching:
 
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
     def gen_key(
             self,
             key: str,
@@ -39,34 +128,223 @@ class BaseRedisCaching:
             self._log_redis_error(e)
 
     def get(self, key: str) -> dict:
-        try:
-            obj = redis.get(key)
-            if obj is None:
-                return None
-
-            return json.loads(obj)
-        except Exception as e:
-            self._log_redis_error(e)
+        obj = self._get(key)
+        value = self._decode(key, obj) if obj is not None else None
+        if value is None:
+            self.stats.miss()
             return None
 
+        self.stats.hit()
+        return value
+
+    def get_many(self, keys: list[str]) -> list[dict]:
+        """
+        Fetches all keys with one MGET. Missing keys are None.
+        """
+        if not keys:
+            return []
+
+        objs = self._mget(keys)
+        if objs is None:
+            objs = [None] * len(keys)
+
+        values = []
+        for key, obj in zip(keys, objs):
+            value = self._decode(key, obj) if obj is not None else None
+            if value is None:
+                self.stats.miss()
+                values.append(None)
+                continue
+
+            self.stats.hit()
+            values.append(value)
+
+        return values
+
+    def gen_tag_index_key(self, tag: str) -> str:
+        return f"{TAG_INDEX_PREFIX}:{tag}"
+
+    @redis_call()
     def set(
             self,
             key: str,
             value: dict,
-            ex: int = DEFAULT_CACHE_TIME
+            ex: int = DEFAULT_CACHE_TIME,
+            tags: list[str] = None
     ) -> None:
-        try:
-            value = json.dumps(value)
-            redis.set(key, value, ex=ex)
-        except Exception as e:
-            self._log_redis_error(e)
-
+        """
+        Stores the value and registers the key in the index of every
+        given tag, so the key can be invalidated with clear_cache_tags
+        without scanning the keyspace.
+        """
+        value = cache_codec.encode(value)
+        now = time.time()
+
+        pipe = redis.pipeline(transaction=False)
+        pipe.set(key, value, ex=ex)
+        for tag in tags if tags else []:
+            self._index_key(pipe, tag, key, now, ex)
+        pipe.execute()
+
+    @redis_call()
+    def set_many(
+            self,
+            values: dict[str, dict],
+            ex: int = DEFAULT_CACHE_TIME,
+            tags_by_key: dict[str, list[str]] = None
+    ) -> None:
+        """
+        Stores all values in one round trip. MSET has no expiring time,
+        so the SETs are sent in one pipeline instead.
+        """
+        if not values:
+            return
+
+        tags_by_key = tags_by_key if tags_by_key else {}
+
+        now = time.time()
+
+        pipe = redis.pipeline(transaction=False)
+        for key, value in values.items():
+            pipe.set(key, cache_codec.encode(value), ex=ex)
+            for tag in tags_by_key.get(key, []):
+                self._index_key(pipe, tag, key, now, ex)
+        pipe.execute()
+
+    @redis_call()
+    def clear_cache_tags(self, tags: list[str]) -> None:
+        """
+        Deletes all keys registered for the given tags.
+        Costs two round trips (ZRANGEBYSCORE + UNLINK/ZREM), independent of
+        the size of the keyspace. Members whose keys already expired are
+        only trimmed from the index, not unlinked.
+        """
+        index_keys = [self.gen_tag_index_key(tag) for tag in tags]
+        now = time.time()
+
+        pipe = redis.pipeline(transaction=False)
+        for index_key in index_keys:
+            pipe.zrangebyscore(index_key, now, "+inf")
+        tagged_keys = pipe.execute()
+
+        pipe = redis.pipeline(transaction=False)
+        for index_key, keys in zip(index_keys, tagged_keys):
+            pipe.zremrangebyscore(index_key, "-inf", now)
+            if not keys:
+                continue
+
+            # only remove the read members, keys added in the meantime
+            # stay indexed for the next invalidation
+            pipe.unlink(*keys)
+            pipe.zrem(index_key, *keys)
+        pipe.execute()
+
+    @redis_call()
     def clear_cache(self, key_pattern: str) -> None:
+        keys = []
+        for key in redis.scan_iter(
+                match=key_pattern,
+                count=CLEAR_CACHE_BATCH_SIZE):
+            keys.append(key)
+            if len(keys) >= CLEAR_CACHE_BATCH_SIZE:
+                redis.unlink(*keys)
+                keys = []
+
+        if keys:
+            redis.unlink(*keys)
+
+    def gen_lock_key(self, key: str) -> str:
+        return f"{LOAD_LOCK_PREFIX}:{key}"
+
+    @redis_call(default=True)
+    def acquire_lock(
+            self,
+            key: str,
+            token: str,
+            ex_ms: int = LOAD_LOCK_TIME_MS
+    ) -> bool:
+        """
+        Tries to get the short-lived lock for recomputing the key.
+        If Redis is not reachable, the lock counts as acquired, so the
+        caller computes the value itself.
+        """
+        is_acquired = redis.set(
+            self.gen_lock_key(key), token, nx=True, px=ex_ms)
+        return bool(is_acquired)
+
+    @redis_call()
+    def release_lock(self, key: str, token: str) -> None:
+        _release_lock_script(
+            keys=[self.gen_lock_key(key)], args=[token], client=redis)
+
+    @redis_call()
+    def wait_for_key(self, key: str, timeout: float) -> dict:
+        """
+        Polls the key while another worker holds its lock.
+        Returns None, if the lock was released or timed out without a value.
+        """
+        lock_key = self.gen_lock_key(key)
+        deadline = time.monotonic() + timeout
+
+        while time.monotonic() < deadline:
+            time.sleep(LOAD_LOCK_POLL_INTERVAL)
+
+            pipe = redis.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.exists(lock_key)
+            obj, is_locked = pipe.execute()
+
+            if obj is not None:
+                return self._decode(key, obj)
+
+            if not is_locked:
+                return None
+
+        return None
+
+    def _decode(self, key: str, obj: bytes) -> Any:
+        """
+        A value, which can't be decoded (corrupt or written by a foreign
+        client), is deleted and counts as a miss.
+        """
         try:
-            for key in redis.keys(key_pattern):
-                redis.delete(key)
+            return cache_codec.decode(obj)
         except Exception as e:
             self._log_redis_error(e)
+            self._delete(key)
+            return None
+
+    @redis_call()
+    def _delete(self, key: str) -> None:
+        redis.unlink(key)
+
+    @redis_call()
+    def _get(self, key: str) -> bytes:
+        return redis.get(key)
+
+    @redis_call()
+    def _mget(self, keys: list[str]) -> list[bytes]:
+        return redis.mget(keys)
+
+    def _index_key(
+            self,
+            pipe: Pipeline,
+            tag: str,
+            key: str,
+            now: float,
+            ex: int
+    ) -> None:
+        """
+        Adds the key to the sorted set index of the tag, scored by the
+        expiring time of the key. Expired members are trimmed on every
+        write, so the index of a hot tag does not grow with dead keys.
+        The index itself expires with its longest living member.
+        """
+        index_key = self.gen_tag_index_key(tag)
+        pipe.zadd(index_key, {key: now + ex})
+        pipe.zremrangebyscore(index_key, "-inf", now)
+        pipe.expire(index_key, ex, nx=True)
+        pipe.expire(index_key, ex, gt=True)
 
     def _log_redis_error(self, e: Exception) -> None:
         msg = f"Redis caching error: {str(e)}"
@@ -78,6 +356,7 @@ class ApiModelCache(BaseRedisCaching):
     def __init__(self, expiring_time: int) -> None:
         super().__init__()
         self._ex = expiring_time
+        self._fingerprints: dict[int, str] = {}
 
     def gen_key(
             self,
@@ -89,17 +368,109 @@ class ApiModelCache(BaseRedisCaching):
             if path is None:
                 path = request.full_path
 
-            key = f"{model.__name__}:{path}"
+            key = f"{self.gen_tag(model)}:{path}"
             return super().gen_key(key, redis_addition_key)
 
         except Exception as e:
             self._log_redis_error(e)
 
-    def set(self, key: str, value: dict) -> None:
-        return super().set(key, value, self._ex)
+    def gen_tag(self, model: db.Model) -> str:
+        return model.__name__
+
+    def gen_ids_tag(self, model: db.Model) -> str:
+        return f"{self.gen_tag(model)}:ids"
+
+    def gen_entity_tag(self, model: db.Model, id: Any) -> str:
+        return f"{self.gen_tag(model)}:id={id}"
+
+    def gen_responses_tag(self, model: db.Model) -> str:
+        return f"{self.gen_tag(model)}:responses"
+
+    def gen_scope_tag(
+            self,
+            model: db.Model,
+            scope_model: db.Model,
+            id: Any
+    ) -> str:
+        """
+        Entries of the model, which only depend on one entity of the scope
+        model (see the scoped dependencies of caching_model_graph).
+        """
+        return f"{self.gen_tag(model)}:{self.gen_tag(scope_model)}={id}"
+
+    def gen_ids_key(
+            self,
+            model: db.Model,
+            redis_addition_key: str = None
+    ) -> str:
+        return self.gen_key(
+            model,
+            path=f"ids:{request.full_path}",
+            redis_addition_key=redis_addition_key
+        )
+
+    def gen_entity_key(
+            self,
+            model: db.Model,
+            id: Any,
+            api_model: Model
+    ) -> str:
+        """
+        One document per entity and response model (list and detail
+        models of the same entity differ).
+        """
+        return f"{self.gen_entity_tag(model, id)}:{self._fingerprint(api_model)}"  # noqa
+
+    def set(
+            self,
+            key: str,
+            value: dict,
+            tags: list[str] = None,
+            ex: int = None
+    ) -> None:
+        return super().set(key, value, ex if ex else self._ex, tags)
+
+    def set_many(
+            self,
+            values: dict[str, dict],
+            tags_by_key: dict[str, list[str]] = None,
+            ex: int = None
+    ) -> None:
+        return super().set_many(values, ex if ex else self._ex, tags_by_key)
+
+    def clear_model_cache(self, models: list[db.Model]) -> None:
+        self.clear_tags([self.gen_tag(model) for model in models])
+
+    def clear_tags(self, tags: list[str]) -> None:
+        self.clear_cache_tags(tags)
+        self.publish_invalidation(tags)
+
+    @redis_call()
+    def publish_invalidation(self, tags: list[str]) -> None:
+        """
+        Notifies every worker to drop its local (L1) entries of the tags.
+        """
+        redis.publish(INVALIDATION_CHANNEL, json.dumps(tags))
+
+    def _fingerprint(self, api_model: Model) -> str:
+        # api models are module level singletons, but their names are not
+        # unique (e.g. RecipeModel), so the key uses a hash of the schema
+        fingerprint = self._fingerprints.get(id(api_model))
+        if fingerprint is not None:
+            return fingerprint
+
+        schema = json.dumps(api_model.__schema__, sort_keys=True)
+        fingerprint = hashlib.sha1(schema.encode("utf-8")).hexdigest()[:12]
+        self._fingerprints[id(api_model)] = fingerprint
+        return fingerprint
 
 
 class ApiAccessCache(BaseRedisCaching):
+    """
+    Positive results of the permission checks per (resource, user, level).
+    Keys are tagged with their resource, so ACL and ownership changes drop
+    the cached access of all users to the resource at once.
+    """
 
     def __init__(
             self,
@@ -113,23 +484,145 @@ class ApiAccessCache(BaseRedisCaching):
     def gen_key(
             self,
             model: db.Model,
-            id: Any
+            id: Any,
+            user_id: int,
+            level: str
     ) -> str:
-        try:
-            key = f"{self._prefix}:{model.__name__}:{str(id)}"
-            return key
-        except Exception as e:
-            self._log_redis_error(e)
+        return f"{self.gen_tag(model, id)}:uid={user_id}:{level}"
 
-    def set(self, key: str) -> None:
-        return super().set(key, {"access": True}, self._ex)
+    def gen_tag(self, model: db.Model, id: Any) -> str:
+        return f"{self._prefix}:{model.__name__}:id={str(id)}"
 
-    def has_access(self, key: str) -> bool:
-        cache_result = self.get(key)
+    def set(
+            self,
+            model: db.Model,
+            id: Any,
+            user_id: int,
+            level: str
+    ) -> None:
+        key = self.gen_key(model, id, user_id, level)
+        return super().set(
+            key, {"access": True}, self._ex, tags=[self.gen_tag(model, id)])
+
+    def has_access(
+            self,
+            model: db.Model,
+            id: Any,
+            user_id: int,
+            level: str
+    ) -> bool:
+        cache_result = self.get(self.gen_key(model, id, user_id, level))
         return (
             cache_result is not None and
             cache_result.get("access", False)
         )
 
+    def clear_access(self, model: db.Model, ids: list[Any]) -> None:
+        if not ids:
+            return
+
+        self.clear_cache_tags([self.gen_tag(model, id) for id in ids])
+
+
+class DbPrimaryStickyCache(BaseRedisCaching):
+    """
+    Keys (users, tables), whose reads stay on the primary database for a
+    short time after a write, shared by all workers.
+    """
+
+    def __init__(self, prefix: str) -> None:
+        super().__init__()
+        self._prefix = prefix
+
+    def gen_key(self, key: str) -> str:
+        return f"{self._prefix}:{key}"
+
+    @redis_call()
+    def mark(self, keys: list[str], seconds: float) -> None:
+        pipeline = redis.pipeline(transaction=False)
+        for key in keys:
+            pipeline.set(self.gen_key(key), 1, px=int(seconds * 1_000))
+        pipeline.execute()
+
+    @redis_call(default=False)
+    def is_marked(self, keys: list[str]) -> bool:
+        return redis.exists(*[self.gen_key(key) for key in keys]) > 0
+
+
+class CacheInvalidationSubscriber:
+    """
+    Background thread listening on the invalidation channel of the worker
+    process. The local cache may only be used while the subscription is
+    alive, otherwise invalidations of other workers could be missed.
+    """
+
+    def __init__(
+            self,
+            channel: str,
+            on_invalidate: Callable[[list[str]], None],
+            on_connection_lost: Callable[[], None]
+    ) -> None:
+        self._channel = channel
+        self._on_invalidate = on_invalidate
+        self._on_connection_lost = on_connection_lost
+        self._lock = Lock()
+        self._pid = None
+        self._is_subscribed = False
+
+    @property
+    def is_subscribed(self) -> bool:
+        return self._is_subscribed
+
+    def start(self) -> None:
+        # threads do not survive a fork (gunicorn workers), so the listener
+        # is started once per process
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+
+        with self._lock:
+            if self._pid == pid:
+                return
+
+            self._pid = pid
+            self._is_subscribed = False
+            Thread(target=self._listen, daemon=True).start()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = pubsub_redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._channel)
+                self._is_subscribed = True
+
+                for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+
+                    self._on_invalidate(json.loads(message["data"]))
+
+            except Exception as e:
+                logger.warning(f"Cache invalidation subscriber error: {str(e)}")  # noqa
+
+            self._is_subscribed = False
+            self._on_connection_lost()
+            time.sleep(INVALIDATION_RECONNECT_TIME)
+
 
 api_cache: ApiModelCache = ApiModelCache(DEFAULT_CACHE_TIME)
+
+api_access_cache: ApiAccessCache = ApiAccessCache(prefix="access")
+
+db_primary_sticky_cache: DbPrimaryStickyCache = DbPrimaryStickyCache(
+    prefix="db-primary")
+
+local_api_cache: LocalLRUCache = LocalLRUCache(
+    max_size=LOCAL_CACHE_MAX_SIZE,
+    expiring_time=LOCAL_CACHE_TIME
+)
+
+cache_invalidation_subscriber = CacheInvalidationSubscriber(
+    channel=INVALIDATION_CHANNEL,
+    on_invalidate=local_api_cache.clear_tags,
+    on_connection_lost=local_api_cache.clear
+)
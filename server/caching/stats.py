@@ -0,0 +1,33 @@
+from threading import Lock
+
+
+class CacheStats:
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def hit(self) -> None:
+        with self._lock:
+            self._hits += 1
+
+    def miss(self) -> None:
+        with self._lock:
+            self._misses += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            total = self._hits + self._misses
+            hit_rate = round(self._hits / total, 4) if total > 0 else 0.
+
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": hit_rate
+            }
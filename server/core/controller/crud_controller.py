@@ -1,23 +1,45 @@
 # type: ignore
+import copy
+import time
+import uuid
+
 from werkzeug import exceptions
 from typing import Any, Callable
 from abc import ABC, abstractmethod
-
-from flask_restx import marshal
-from flask import Response
-from sqlalchemy import or_, and_
+from threading import Lock
+from functools import partial
+from concurrent.futures import (
+    Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+)
+
+from flask import Response, copy_current_request_context
+from flask_restx import Model as ApiModel, fields
+from flask_restx.marshalling import make
+from sqlalchemy import Column, or_, and_, exists, inspect, select
 from flask_sqlalchemy.pagination import Pagination
 from flask_sqlalchemy.query import Query
 from flask_sqlalchemy.model import Model
+from sqlalchemy import orm
+from sqlalchemy.orm import Load
 
 from server.logger import logger
 from server.db import db
+from server.db_routing import replica_router
 from server.core.enums import searchtype
-from server.caching.redis import api_cache
+from server.caching.redis import (
+    api_cache,
+    api_access_cache,
+    local_api_cache,
+    cache_invalidation_subscriber
+)
+from server.caching.composite import caching_model_graph
+from server.core.permissions.resource import get_permission_object
 from server.api import api
 from server.errors import http_errors
 from server.errors import errors
 from server.utils import helper
+from server.utils.cursor import decode_cursor, encode_cursor
+from server.utils.serializer import compile_serializer, serialize
 
 
 class IController(ABC):
@@ -38,45 +60,541 @@ class IController(ABC):
     def handle_delete(self): pass
 
 
+SINGLE_FLIGHT_WAIT_TIME = 5
+BULK_MAX_ITEMS = 100
+BATCH_MAX_IDS = 500
+CACHE_REFRESH_WORKERS = 4
+
+cache_refresh_executor = ThreadPoolExecutor(
+    max_workers=CACHE_REFRESH_WORKERS,
+    thread_name_prefix="cache-refresh"
+)
+
+# errors of one element of a bulk write, reported per element
+BULK_ELEMENT_ERRORS = (
+    errors.DbModelValidationException,
+    errors.DbModelSerializationException,
+    errors.ForeignkeyNotFoundException,
+    errors.DbModelUnqiueConstraintException,
+    errors.DbModelAlreadyExistingException
+)
+
+
 class AbstractRedisCache:
+    # cache keys, which are currently recomputed by a thread of this process
+    _inflight_loads: dict[Any, Future] = {}
+    _inflight_refreshs: set[str] = set()
+    _inflight_lock = Lock()
 
     def __init__(
             self,
             model: Model,
             use_caching: bool,
-            clear_cache_models: list[Model] = None
+            cache_api_models: list[api.model] = None,
+            cache_dependencies: list[Model] = None,
+            use_local_cache: bool = False,
+            cache_soft_ttl: int = None,
+            cache_hard_ttl: int = None,
+            use_normalized_cache: bool = False,
+            cache_list_fields: list[str] = None,
+            access_resource: tuple[Model, str] = None,
+            cache_scoped_dependencies: list[tuple[Model, str]] = None
     ) -> None:
+        """
+        cache_api_models: the cached responses of these api models embed the
+            models of their nested relationships (see caching_model_graph)
+        cache_dependencies: further models the responses depend on, which are
+            not rendered through a relationship (e.g. joined in a query)
+        cache_list_fields: fields, which can change the result of list
+            queries (filters, order)
+        access_resource: (resource model, column of the resource id), the
+            cached permission checks of the resource are dropped on writes
+            of the model (ACL entries and ownership)
+        cache_scoped_dependencies: (scope model, relationship path from the
+            scope model), writes along the path only drop the entries tagged
+            with the affected scope entities (see _get_or_load_cache)
+        """
         self._main_model = model
         self._use_caching = use_caching
-
-        clear_cache_models = clear_cache_models if clear_cache_models else []
-        self._clear_cache_models = list(set([self._main_model] + clear_cache_models))  # noqa
+        self._use_local_cache = use_local_cache
+        self._cache_soft_ttl = cache_soft_ttl
+        self._cache_hard_ttl = cache_hard_ttl
+        self._use_normalized_cache = use_normalized_cache
+        self._access_resource = access_resource
+
+        if use_local_cache and not use_caching:
+            err_msg = f"The local cache is a layer of the Redis cache, '{model.__name__}' uses the local cache without caching."  # noqa
+            raise ValueError(err_msg)
+
+        if use_normalized_cache and len(inspect(model).primary_key) != 1:
+            err_msg = f"Normalized caching needs a single primary key column, '{model.__name__}' has a composite primary key."  # noqa
+            raise ValueError(err_msg)
+
+        caching_model_graph.register(
+            model,
+            api_models=cache_api_models if use_caching else None,
+            dependencies=cache_dependencies if use_caching else None,
+            list_fields=cache_list_fields,
+            use_normalized_cache=use_caching and use_normalized_cache,
+            scoped_dependencies=cache_scoped_dependencies if use_caching else None  # noqa
+        )
 
     # protected
     def _get_cache(self, redis_addition_key: str = None) -> Any:
+        cache_obj, _ = self._get_cache_entry(redis_addition_key)
+        return cache_obj
+
+    # protected
+    def _set_cache(self, data: Any, redis_addition_key: str = None) -> None:
         if not self._use_caching:
-            return None
+            return
 
         redis_key = api_cache.gen_key(
             self._main_model, redis_addition_key=redis_addition_key)
 
-        return api_cache.get(redis_key)
+        self._write_cache(redis_key, data)
 
     # protected
-    def _set_cache(self, data: Any, redis_addition_key: str = None) -> None:
+    def _clear_cache(
+            self,
+            primary_key: tuple = None,
+            changed_fields: list[str] = None
+    ) -> None:
+        """
+        Drops the cache of the main model and of all models embedding it.
+        Without primary_key everything of these models is dropped.
+        """
+        self._clear_cache_tags(
+            self._get_invalidation_tags(primary_key, changed_fields))
+
+    # protected
+    def _get_invalidation_tags(
+            self,
+            primary_key: tuple = None,
+            changed_fields: list[str] = None
+    ) -> set[str]:
+        return caching_model_graph.get_invalidation_tags(
+            self._main_model, primary_key, changed_fields)
+
+    # protected
+    def _clear_cache_tags(self, tags: set[str]) -> None:
+        tags = list(tags)
+        local_api_cache.clear_tags(tags)
+        api_cache.clear_tags(tags)
+
+    # protected
+    def _get_access_resource_ids(self, obj: Model) -> set:
+        if self._access_resource is None:
+            return set()
+
+        _, column = self._access_resource
+        return {getattr(obj, column)}
+
+    # protected
+    def _clear_access_cache(self, resource_ids: set) -> None:
+        if self._access_resource is None:
+            return
+
+        resource_model, _ = self._access_resource
+        api_access_cache.clear_access(resource_model, list(resource_ids))
+
+    # protected
+    def _get_or_load_cache(
+            self,
+            load_fn: Callable[[], Any],
+            redis_addition_key: str = None,
+            scope: tuple[Model, Any] = None
+    ) -> Any:
+        """
+        Returns the cached data or computes it with load_fn.
+        scope: (scope model, id), the entry only depends on this entity of
+            a scoped dependency and is tagged with it
+        Concurrent misses of the same key are coalesced: threads of this
+        process wait for the future of the loading thread and other
+        processes wait for the Redis lock of the key, so only one of them
+        recomputes the data.
+        In stale-while-revalidate mode (cache_soft_ttl), entries past the
+        soft ttl are returned directly and refreshed in the background.
+        """
+        if not self._use_caching:
+            return load_fn()
+
         redis_key = api_cache.gen_key(
             self._main_model, redis_addition_key=redis_addition_key)
-        if self._use_caching:
-            api_cache.set(redis_key, data)
+
+        tags = self._cache_tags()
+        if scope is not None:
+            scope_model, scope_id = scope
+            tags.append(
+                api_cache.gen_scope_tag(self._main_model, scope_model, scope_id))  # noqa
+
+        return self._get_or_load_key(load_fn, redis_key, tags)
 
     # protected
-    def _clear_cache(self) -> None:
+    def _get_or_load_normalized_list(
+            self,
+            load_fn: Callable[[], list[Model]],
+            api_model: api.model,
+            redis_addition_key: str = None
+    ) -> list:
+        """
+        Normalized mode: the query result is cached as ordered id list and
+        every entity as its own document, fetched with one MGET.
+        A write of one entity only drops its documents, the id lists stay
+        cached unless the write can change the list queries.
+        """
         if not self._use_caching:
-            return
+            return serialize(load_fn(), api_model)
+
+        ids_key = api_cache.gen_ids_key(
+            self._main_model, redis_addition_key=redis_addition_key)
+        ids_tags = self._cache_tags(api_cache.gen_ids_tag(self._main_model))
+
+        loaded_docs = {}
+
+        def load_ids() -> list:
+            objs = load_fn()
+            docs = self._marshal_entities(objs, api_model)
+            self._write_entity_docs(docs, api_model)
+            loaded_docs.update(docs)
+            return list(docs.keys())
+
+        def load_list(ids: list) -> list:
+            docs = self._get_entity_docs(ids, api_model, loaded_docs)
+            return [docs[id] for id in ids if id in docs]
+
+        ids, is_stale = self._read_cache_entry(ids_key, ids_tags)
+        if ids is not None:
+            if is_stale:
+                self._schedule_refresh(load_ids, ids_key, ids_tags)
+            return load_list(ids)
+
+        # the documents depend on the api model, the id list does not
+        return self._load_single_flight(
+            (ids_key, id(api_model)),
+            lambda: load_list(
+                self._load_with_lock(load_ids, ids_key, ids_tags)),
+            lambda: serialize(load_fn(), api_model)
+        )
+
+    # protected
+    def _get_or_load_entity(
+            self,
+            load_fn: Callable[[], Any],
+            id: Any,
+            api_model: api.model
+    ) -> Any:
+        if not self._use_caching:
+            return load_fn()
+
+        return self._get_or_load_key(
+            load_fn,
+            api_cache.gen_entity_key(self._main_model, id, api_model),
+            self._cache_tags(api_cache.gen_entity_tag(self._main_model, id))  # noqa
+        )
+
+    def _get_or_load_key(
+            self,
+            load_fn: Callable[[], Any],
+            redis_key: str,
+            tags: list[str]
+    ) -> Any:
+        cache_obj, is_stale = self._read_cache_entry(redis_key, tags)
+        if cache_obj is not None:
+            if is_stale:
+                self._schedule_refresh(load_fn, redis_key, tags)
+            return cache_obj
+
+        return self._load_single_flight(
+            redis_key,
+            lambda: self._load_with_lock(load_fn, redis_key, tags),
+            load_fn
+        )
+
+    def _load_single_flight(
+            self,
+            inflight_key: Any,
+            load_fn: Callable[[], Any],
+            fallback_fn: Callable[[], Any]
+    ) -> Any:
+        """
+        Only one thread of this process runs load_fn per key, the others
+        wait for its result (fallback_fn, if it takes too long).
+        """
+        with self._inflight_lock:
+            future = self._inflight_loads.get(inflight_key)
+            is_loading_thread = future is None
+            if is_loading_thread:
+                future = Future()
+                self._inflight_loads[inflight_key] = future
+
+        if not is_loading_thread:
+            try:
+                return future.result(timeout=SINGLE_FLIGHT_WAIT_TIME)
+            except FutureTimeoutError:
+                return fallback_fn()
+
+        try:
+            data = load_fn()
+            future.set_result(data)
+            return data
 
-        for model in self._clear_cache_models:
-            redis_key_pattern = api_cache.gen_key(model, "*")
-            api_cache.clear_cache(redis_key_pattern)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+
+        finally:
+            with self._inflight_lock:
+                self._inflight_loads.pop(inflight_key, None)
+
+    def _get_cache_entry(
+            self,
+            redis_addition_key: str = None
+    ) -> tuple[Any, bool]:
+        if not self._use_caching:
+            return None, False
+
+        redis_key = api_cache.gen_key(
+            self._main_model, redis_addition_key=redis_addition_key)
+
+        return self._read_cache_entry(redis_key, self._cache_tags())
+
+    def _read_cache_entry(
+            self,
+            redis_key: str,
+            tags: list[str]
+    ) -> tuple[Any, bool]:
+        is_local_cache_active = self._is_local_cache_active()
+        if is_local_cache_active:
+            cache_entry = local_api_cache.get(redis_key)
+            if cache_entry is not None:
+                return self._unwrap_cache_entry(cache_entry)
+
+        generation = local_api_cache.generation
+        cache_entry = api_cache.get(redis_key)
+
+        if cache_entry is not None and is_local_cache_active:
+            local_api_cache.set(
+                redis_key, cache_entry, tags=tags, generation=generation)
+
+        return self._unwrap_cache_entry(cache_entry)
+
+    def _write_cache(
+            self,
+            redis_key: str,
+            data: Any,
+            tags: list[str] = None
+    ) -> None:
+        tags = tags if tags else self._cache_tags()
+        cache_entry = self._wrap_cache_entry(data)
+
+        api_cache.set(
+            redis_key,
+            cache_entry,
+            tags=tags,
+            ex=self._cache_hard_ttl
+        )
+
+        if self._is_local_cache_active():
+            local_api_cache.set(redis_key, cache_entry, tags=tags)
+
+    def _get_entity_docs(
+            self,
+            ids: list,
+            api_model: api.model,
+            loaded_docs: dict
+    ) -> dict:
+        docs = {id: loaded_docs[id] for id in ids if id in loaded_docs}
+        missing_ids = [id for id in ids if id not in docs]
+
+        keys = {
+            id: api_cache.gen_entity_key(self._main_model, id, api_model)
+            for id in missing_ids
+        }
+
+        is_local_cache_active = self._is_local_cache_active()
+        if is_local_cache_active:
+            for id in missing_ids:
+                doc = local_api_cache.get(keys[id])
+                if doc is not None:
+                    docs[id] = doc
+            missing_ids = [id for id in missing_ids if id not in docs]
+
+        generation = local_api_cache.generation
+        cached_docs = api_cache.get_many([keys[id] for id in missing_ids])
+        for id, doc in zip(missing_ids, cached_docs):
+            if doc is None:
+                continue
+
+            docs[id] = doc
+            if is_local_cache_active:
+                local_api_cache.set(
+                    keys[id],
+                    doc,
+                    tags=self._entity_tags(id),
+                    generation=generation
+                )
+
+        missing_ids = [id for id in missing_ids if id not in docs]
+        if missing_ids:
+            # entities, which were deleted in the meantime, stay missing
+            loaded_docs = self._load_entity_docs(missing_ids, api_model)
+            self._write_entity_docs(loaded_docs, api_model)
+            docs |= loaded_docs
+
+        return docs
+
+    def _get_or_load_entities(self, ids: list, api_model: api.model) -> dict:
+        """
+        Documents of the entities by id: in normalized mode read with one
+        MGET, the missing ones loaded with one IN query and written with one
+        MSET. Ids without an entity are not part of the result.
+        """
+        if not (self._use_caching and self._use_normalized_cache):
+            return self._load_entity_docs(ids, api_model)
+
+        return self._get_entity_docs(ids, api_model, {})
+
+    def _load_entity_docs(self, ids: list, api_model: api.model) -> dict:
+        primary_key = inspect(self._main_model).primary_key[0]
+        objs = self._main_model.query \
+            .options(*self._get_loader_options(api_model)) \
+            .filter(primary_key.in_(ids)) \
+            .all()
+
+        return self._marshal_entities(objs, api_model)
+
+    def _write_entity_docs(self, docs: dict, api_model: api.model) -> None:
+        values = {}
+        tags_by_key = {}
+        for id, doc in docs.items():
+            key = api_cache.gen_entity_key(self._main_model, id, api_model)
+            values[key] = doc
+            tags_by_key[key] = self._entity_tags(id)
+
+        api_cache.set_many(values, tags_by_key, ex=self._cache_hard_ttl)
+
+        if self._is_local_cache_active():
+            for key, doc in values.items():
+                local_api_cache.set(key, doc, tags=tags_by_key[key])
+
+    def _marshal_entities(
+            self,
+            objs: list[Model],
+            api_model: api.model
+    ) -> dict:
+        mapper = inspect(self._main_model)
+        return {
+            mapper.primary_key_from_instance(obj)[0]: serialize(obj, api_model)
+            for obj in objs
+        }
+
+    def _entity_tags(self, id: Any) -> list[str]:
+        return self._cache_tags(
+            api_cache.gen_entity_tag(self._main_model, id))
+
+    def _wrap_cache_entry(self, data: Any) -> Any:
+        if self._cache_soft_ttl is None:
+            return data
+
+        return {
+            "data": data,
+            "stale_at": time.time() + self._cache_soft_ttl
+        }
+
+    def _unwrap_cache_entry(self, cache_entry: Any) -> tuple[Any, bool]:
+        is_wrapped = (
+            self._cache_soft_ttl is not None and
+            isinstance(cache_entry, dict) and
+            "stale_at" in cache_entry
+        )
+
+        if not is_wrapped:
+            return cache_entry, False
+
+        is_stale = cache_entry["stale_at"] <= time.time()
+        return cache_entry.get("data"), is_stale
+
+    def _load_with_lock(
+            self,
+            load_fn: Callable[[], Any],
+            redis_key: str,
+            tags: list[str]
+    ) -> Any:
+        token = str(uuid.uuid4())
+        has_lock = api_cache.acquire_lock(redis_key, token)
+
+        if not has_lock:
+            cache_entry = api_cache.wait_for_key(
+                redis_key, timeout=SINGLE_FLIGHT_WAIT_TIME)
+            cache_obj, _ = self._unwrap_cache_entry(cache_entry)
+            if cache_obj is not None:
+                return cache_obj
+
+        try:
+            data = load_fn()
+            self._write_cache(redis_key, data, tags)
+            return data
+        finally:
+            if has_lock:
+                api_cache.release_lock(redis_key, token)
+
+    def _schedule_refresh(
+            self,
+            load_fn: Callable[[], Any],
+            redis_key: str,
+            tags: list[str]
+    ) -> None:
+        with self._inflight_lock:
+            if redis_key in self._inflight_refreshs:
+                return
+            self._inflight_refreshs.add(redis_key)
+
+        @copy_current_request_context
+        def refresh() -> None:
+            token = str(uuid.uuid4())
+            try:
+                # another worker is already refreshing this key
+                if not api_cache.acquire_lock(redis_key, token):
+                    return
+
+                try:
+                    self._write_cache(redis_key, load_fn(), tags)
+                finally:
+                    api_cache.release_lock(redis_key, token)
+
+            except Exception as e:
+                logger.error(f"Cache refresh of '{redis_key}' failed: {str(e)}")  # noqa
+
+            finally:
+                with self._inflight_lock:
+                    self._inflight_refreshs.discard(redis_key)
+
+        try:
+            cache_refresh_executor.submit(refresh)
+        except Exception as e:
+            logger.error(e)
+            with self._inflight_lock:
+                self._inflight_refreshs.discard(redis_key)
+
+    def _cache_tags(self, sub_tag: str = None) -> list[str]:
+        """
+        Every entry is tagged with its main model. In normalized mode it
+        additionally gets a finer tag (entity, id lists or responses).
+        """
+        tags = [api_cache.gen_tag(self._main_model)]
+
+        if self._use_normalized_cache:
+            tags.append(sub_tag if sub_tag else api_cache.gen_responses_tag(self._main_model))  # noqa
+
+        return tags
+
+    def _is_local_cache_active(self) -> bool:
+        if not self._use_local_cache:
+            return False
+
+        cache_invalidation_subscriber.start()
+        return cache_invalidation_subscriber.is_subscribed
 
 
 class BaseCrudController(IController, AbstractRedisCache):
@@ -95,13 +613,45 @@ class BaseCrudController(IController, AbstractRedisCache):
             search_fields: list[str] = None,
             pagination_page_size: int = 20,
             use_caching: bool = True,
-            clear_cache_models: list[Model] = None
+            use_local_cache: bool = False,
+            cache_soft_ttl: int = None,
+            cache_hard_ttl: int = None,
+            use_normalized_cache: bool = False,
+            cache_list_fields: list[str] = None,
+            cache_dependencies: list[Model] = None,
+            cache_scoped_dependencies: list[tuple[Model, str]] = None,
+            access_resource: tuple[Model, str] = None,
+            loader_profiles: list[tuple[api.model, list[str]]] = None,
+            include_fields: dict[str, fields.Raw] = None,
+            include_loader_paths: dict[str, list[str]] = None,
+            cursor_sort_column: str = None
     ) -> None:
+        """
+        loader_profiles: (api model, relationship paths like
+            "ingredients.ingredient.unit"), the relationships rendered by the
+            api model are eager loaded: collections with selectinload,
+            many-to-one relationships with joinedload
+        include_fields: fields the list endpoints embed on request
+            (?include=tags,rating), a name like "recipe.tags" adds the field
+            to the nested model of the field "recipe"
+        include_loader_paths: relationship paths (or deferred columns) of the
+            include fields, loaded for the whole page
+        cursor_sort_column: column the cursor pagination orders by, ties are
+            ordered by the primary key (default: only the primary key)
+        """
         AbstractRedisCache.__init__(
             self,
             model=model,
             use_caching=use_caching,
-            clear_cache_models=clear_cache_models
+            cache_api_models=[api_model, api_model_detail],
+            cache_dependencies=cache_dependencies,
+            use_local_cache=use_local_cache,
+            cache_soft_ttl=cache_soft_ttl,
+            cache_hard_ttl=cache_hard_ttl,
+            use_normalized_cache=use_normalized_cache,
+            cache_list_fields=(search_fields or []) + (cache_list_fields or []),  # noqa
+            access_resource=access_resource,
+            cache_scoped_dependencies=cache_scoped_dependencies
         )
         self._model = model
         self._api_model = api_model
@@ -113,27 +663,56 @@ class BaseCrudController(IController, AbstractRedisCache):
         self._read_only_fields = read_only_fields
         self._foreign_key_columns = foreign_key_columns
         self._unique_columns_together = unique_columns_together
+        self._loader_profiles = loader_profiles or []
+        self._loader_options: dict[int, list[Load]] = {}
+        self._projected_models: dict[tuple[int, frozenset], api.model] = {}
+        self._include_fields = include_fields or {}
+        self._include_loader_paths = include_loader_paths or {}
+        self._included_models: dict[tuple[int, frozenset], api.model] = {}
+        self._included_loader_paths: dict[int, list[str]] = {}
+        self._cursor_sort_column = cursor_sort_column
+
+        for response_model in [self._api_model, self._api_model_detail]:
+            compile_serializer(response_model)
+
+        if self._include_fields and use_caching:
+            # the cached lists embed the models of the include fields
+            caching_model_graph.register(
+                model,
+                api_models=[self._create_included_model(
+                    api_model, frozenset(self._include_fields))]
+            )
 
     def handle_get(
             self,
             id: Any,
             redis_addition_key: str = None,  # like user_id
-            api_response_model: str = None
+            api_response_model: str = None,
+            reqargs: dict = None
     ) -> Response:
         try:
-            cache_obj = self._get_cache(redis_addition_key)
-            if cache_obj is not None:
-                return cache_obj, 200
-
-            obj = self._find_object_by_id(id)
+            api_response_model = self._get_projected_model(
+                api_response_model if api_response_model else self._api_model_detail,  # noqa
+                reqargs
+            )
 
-            api_response_model = api_response_model if api_response_model else self._api_model_detail  # noqa
-            response_data = marshal(obj, api_response_model)
+            def load_response_data() -> Any:
+                obj = self._find_object_by_id(id, api_response_model)
+                return serialize(obj, api_response_model)
 
-            self._set_cache(response_data, redis_addition_key)
+            with replica_router.reads(self._model):
+                if self._use_normalized_cache and redis_addition_key is None:
+                    response_data = self._get_or_load_entity(
+                        load_response_data, id, api_response_model)
+                else:
+                    response_data = self._get_or_load_cache(
+                        load_response_data, redis_addition_key)
 
             return response_data, 200
 
+        except errors.ValueErrorGeneral as e:
+            return http_errors.bad_request(e)
+
         except errors.DbModelNotFoundException as e:
             return http_errors.not_found(e)
 
@@ -141,6 +720,59 @@ class BaseCrudController(IController, AbstractRedisCache):
             logger.error(e)
             return http_errors.UNEXPECTED_ERROR_RESULT
 
+    def handle_get_batch(
+            self,
+            ids: str | list,
+            reqargs: dict = None,
+            api_response_model: str = None
+    ) -> Response:
+        """
+        Batch fetch of known ids (?ids=1,2,3 or a list in the body) with one
+        IN query, the entities of the normalized cache are read with MGET.
+        The data is in the order of the ids, ids without an entity are
+        listed in the 'X-Missing-Ids' header.
+        """
+        try:
+            api_response_model = self._get_projected_model(
+                api_response_model if api_response_model else self._api_model_detail,  # noqa
+                reqargs
+            )
+            ids = self._parse_ids(ids)
+
+            with replica_router.reads(self._model):
+                docs = self._get_or_load_entities(ids, api_response_model)
+
+            headers = {}
+            missing_ids = [id for id in ids if id not in docs]
+            if missing_ids:
+                headers["X-Missing-Ids"] = ",".join(str(id) for id in missing_ids)  # noqa
+
+            return [docs[id] for id in ids if id in docs], 200, headers
+
+        except errors.ValueErrorGeneral as e:
+            return http_errors.bad_request(e)
+
+        except Exception as e:
+            logger.error(e)
+            return http_errors.UNEXPECTED_ERROR_RESULT
+
+    def handle_post_batch(
+            self,
+            data: Any,
+            reqargs: dict = None,
+            api_response_model: str = None
+    ) -> Response:
+        """
+        Batch fetch with the ids in the body ({"ids": [1, 2, 3]}), see
+        handle_get_batch.
+        """
+        if not isinstance(data, dict):
+            err_msg = "The body has to be an object with the list 'ids'."
+            return http_errors.bad_request(err_msg)
+
+        return self.handle_get_batch(
+            data.get("ids"), reqargs, api_response_model)
+
     def handle_get_list(
             self,
             reqargs: dict,
@@ -149,28 +781,51 @@ class BaseCrudController(IController, AbstractRedisCache):
             api_response_model: str = None
     ) -> Response:
         try:
-            cache_obj = self._get_cache(redis_addition_key)
-            if cache_obj is not None:
-                return cache_obj, 200
+            api_response_model = self._get_included_model(
+                api_response_model if api_response_model else self._api_model,  # noqa
+                reqargs
+            )
+            api_response_model = self._get_projected_model(
+                api_response_model, reqargs)
 
-            model_query: Query = query if query else self._model.query
+            if reqargs is not None and reqargs.get("cursor") is not None:
+                self._validate_cursor_fields(api_response_model)
 
-            model_search = self._create_model_search(reqargs=reqargs)
+            def create_model_query() -> Query:
+                # rebind to the session of the current context, the data
+                # can be reloaded in a background thread (cache refresh)
+                model_query: Query = query.with_session(db.session()) if query else self._model.query  # noqa
 
-            if model_search is not None:
-                model_query = model_query.filter(model_search)
+                model_search = self._create_model_search(reqargs=reqargs)
 
-            result_data = self._paginate_model_query(
-                model_query=model_query,
-                reqargs=reqargs
-            )
+                if model_search is not None:
+                    model_query = model_query.filter(model_search)
 
-            api_response_model = api_response_model if api_response_model else self._api_model  # noqa
-            response_data = marshal(result_data, api_response_model)
+                return model_query
 
-            self._set_cache(response_data, redis_addition_key)
+            def load_objects() -> list[Model]:
+                model_query = create_model_query().options(
+                    *self._get_loader_options(api_response_model))
 
-            return response_data, 200
+                return self._paginate_model_query(
+                    model_query=model_query,
+                    reqargs=reqargs
+                )
+
+            with replica_router.reads(self._model):
+                if self._use_normalized_cache:
+                    response_data = self._get_or_load_normalized_list(
+                        load_objects, api_response_model, redis_addition_key)
+                else:
+                    response_data = self._get_or_load_cache(
+                        lambda: serialize(load_objects(), api_response_model),
+                        redis_addition_key
+                    )
+
+                headers = self._create_pagination_headers(
+                    create_model_query, response_data, reqargs)
+
+            return response_data, 200, headers
 
         except exceptions.NotFound:
             # pagination page could not found any data
@@ -193,17 +848,18 @@ class BaseCrudController(IController, AbstractRedisCache):
         try:
             obj = self._model.from_json(data, self._api_model_send)
 
-            self._check_foreignkeys_existing(data)
-            self._check_unqiue_column(data)
-            self._check_unique_columns_together(data)
-            self._ckeck_unique_primarykey(unique_primarykey)
+            self._check_constraints(
+                data=data,
+                unique_primarykey=unique_primarykey
+            )
 
             db.session.add(obj)
             db.session.commit()
 
-            self._clear_cache()
+            self._clear_cache(self._get_primary_key(obj))
+            self._clear_access_cache(self._get_access_resource_ids(obj))
 
-            return marshal(obj, self._api_model), 201
+            return serialize(obj, self._api_model), 201
 
         except (errors.DbModelValidationException,
                 errors.DbModelSerializationException) as e:
@@ -220,18 +876,109 @@ class BaseCrudController(IController, AbstractRedisCache):
             logger.error(e)
             return http_errors.UNEXPECTED_ERROR_RESULT
 
+    def handle_post_bulk(
+            self,
+            data_list: list[dict],
+            unique_primarykey_fields: list[str] = None,
+            fixed_data: dict = None
+    ) -> Response:
+        """
+        Creates the objects of data_list in one transaction, the elements
+        are validated as a batch (see _find_violations) and the cache is
+        cleared once. Invalid elements are skipped and reported with the
+        status and message of the single POST.
+
+        status: 201 if every element was created, otherwise 207
+        unique_primarykey_fields: fields of an element, which form the
+            primary key (like unique_primarykey of handle_post)
+        fixed_data: fields set on every element (like the parent id of the
+            route)
+        """
+        try:
+            self._validate_bulk_data(data_list)
+
+            results: list[dict] = [None] * len(data_list)
+            objs: dict[int, Model] = {}
+            checks: dict[int, list[tuple]] = {}
+            batch_keys: set = set()
+
+            for i, data in enumerate(data_list):
+                try:
+                    if not isinstance(data, dict):
+                        err_msg = f"Element {i} should be an object."
+                        raise errors.DbModelSerializationException(err_msg)
+
+                    data = {**data, **(fixed_data or {})}
+                    obj = self._model.from_json(data, self._api_model_send)
+                    unique_primarykey = tuple(
+                        data.get(field) for field in unique_primarykey_fields
+                    ) if unique_primarykey_fields else None
+
+                    self._check_unique_in_batch(
+                        data, unique_primarykey, batch_keys)
+
+                    checks[i] = self._create_constraint_checks(
+                        data=data,
+                        unique_primarykey=unique_primarykey
+                    )
+                    objs[i] = obj
+
+                except BULK_ELEMENT_ERRORS as e:
+                    results[i] = self._create_bulk_error(i, e)
+
+            for i, e in self._find_violations(checks).items():
+                results[i] = self._create_bulk_error(i, e)
+                del objs[i]
+
+            if objs:
+                db.session.add_all(objs.values())
+                db.session.commit()
+
+                invalidation_tags = set()
+                access_resource_ids = set()
+                for obj in objs.values():
+                    invalidation_tags |= self._get_invalidation_tags(
+                        self._get_primary_key(obj))
+                    access_resource_ids |= self._get_access_resource_ids(obj)
+
+                self._clear_cache_tags(invalidation_tags)
+                self._clear_access_cache(access_resource_ids)
+
+            for i, obj in objs.items():
+                results[i] = {
+                    "index": i,
+                    "status": 201,
+                    "data": serialize(obj, self._api_model)
+                }
+
+            status = 201 if len(objs) == len(data_list) else 207
+            return results, status
+
+        except errors.ValueErrorGeneral as e:
+            return http_errors.bad_request(e)
+
+        except Exception as e:
+            db.session.rollback()
+            logger.error(e)
+            return http_errors.UNEXPECTED_ERROR_RESULT
+
     def handle_patch(self, id: Any, data: dict) -> Response:
         try:
             obj = self._find_object_by_id(id)
+            primary_key = self._get_primary_key(obj)
+            changed_fields = list(data.keys())
 
             self._check_read_only_fields(data)
-            self._check_foreignkeys_existing(data)
-            self._check_unqiue_column(data)
-            self._check_unique_columns_together(
+            self._check_constraints(
                 data=data,
                 current_obj=obj
             )
 
+            # entities, which embed the object with its current relations
+            invalidation_tags = self._get_invalidation_tags(
+                primary_key, changed_fields)
+            access_resource_ids = self._get_access_resource_ids(obj)
+
             for key, value in data.items():
                 if not hasattr(obj, key):
                     err_msg = f"Field '{key}' doen't exist in object '{self._model.__name__}'"  # noqa
@@ -241,9 +988,15 @@ class BaseCrudController(IController, AbstractRedisCache):
 
             db.session.commit()
 
-            self._clear_cache()
+            if caching_model_graph.has_foreign_keys(self._model, changed_fields):  # noqa
+                invalidation_tags |= self._get_invalidation_tags(
+                    primary_key, changed_fields)
 
-            return marshal(obj, self._api_model), 200
+            self._clear_cache_tags(invalidation_tags)
+            self._clear_access_cache(
+                access_resource_ids | self._get_access_resource_ids(obj))
+
+            return serialize(obj, self._api_model), 200
 
         except (errors.DbModelValidationException,
                 errors.ReadOnlyFieldInPayloadException) as e:
@@ -263,11 +1016,15 @@ class BaseCrudController(IController, AbstractRedisCache):
     def handle_delete(self, id: Any) -> Response:
         try:
             obj = self._find_object_by_id(id)
+            invalidation_tags = self._get_invalidation_tags(
+                self._get_primary_key(obj))
+            access_resource_ids = self._get_access_resource_ids(obj)
 
             db.session.delete(obj)
             db.session.commit()
 
-            self._clear_cache()
+            self._clear_cache_tags(invalidation_tags)
+            self._clear_access_cache(access_resource_ids)
 
             return None, 204
 
@@ -278,85 +1035,283 @@ class BaseCrudController(IController, AbstractRedisCache):
             logger.error(e)
             return http_errors.UNEXPECTED_ERROR_RESULT
 
-    def _check_foreignkeys_existing(self, data: dict) -> None:
+    def _validate_bulk_data(self, data_list: Any) -> None:
+        if not isinstance(data_list, list) or len(data_list) == 0:
+            err_msg = "The payload should be a non-empty list."
+            raise errors.ValueErrorGeneral(err_msg)
+
+        if len(data_list) > BULK_MAX_ITEMS:
+            err_msg = f"The payload can contain at most {BULK_MAX_ITEMS} elements."  # noqa
+            raise errors.ValueErrorGeneral(err_msg)
+
+    def _check_unique_in_batch(
+            self,
+            data: dict,
+            unique_primarykey: tuple,
+            batch_keys: set
+    ) -> None:
+        """
+        Elements of one bulk request, which conflict with each other, the
+        database check only sees the existing rows.
+        """
+        unique_columns_list = ([self._unique_columns_together]
+                               if self._unique_columns_together and isinstance(self._unique_columns_together[0], str)  # noqa
+                               else self._unique_columns_together or [])
+
+        keys = [
+            *[(column, data.get(column)) for column in self._unique_columns or []],  # noqa
+            *[
+                (tuple(columns), tuple(data.get(column) for column in columns))  # noqa
+                for columns in unique_columns_list
+            ]
+        ]
+        if unique_primarykey is not None:
+            keys.append((None, unique_primarykey))
+
+        for key in keys:
+            if key in batch_keys:
+                err_msg = f"The given fields are already existing in the payload with these values: {key[1]}."  # noqa
+                raise errors.DbModelUnqiueConstraintException(msg=err_msg)
+
+        batch_keys.update(keys)
+
+    def _create_bulk_error(self, index: int, e: Exception) -> dict:
+        if isinstance(e, errors.ForeignkeyNotFoundException):
+            body, status = http_errors.not_found(e)
+        elif isinstance(e, (errors.DbModelUnqiueConstraintException,
+                            errors.DbModelAlreadyExistingException)):
+            body, status = http_errors.conflict(e)
+        else:
+            body, status = http_errors.bad_request(e)
+
+        return {"index": index, "status": status, **body}
+
+    def _check_constraints(
+            self,
+            data: dict,
+            current_obj: Model = None,
+            unique_primarykey: Any = None
+    ) -> None:
+        """
+        Foreign key, unique and primary key checks of a write in one round
+        trip (see _find_violations). The first violated check is raised.
+        """
+        checks = self._create_constraint_checks(
+            data, current_obj, unique_primarykey)
+
+        violations = self._find_violations({None: checks})
+        if None in violations:
+            raise violations[None]
+
+    def _create_constraint_checks(
+            self,
+            data: dict,
+            current_obj: Model = None,
+            unique_primarykey: Any = None
+    ) -> list[tuple]:
+        return [
+            *self._create_foreignkey_checks(data),
+            *self._create_unique_column_checks(data),
+            *self._create_unique_columns_together_checks(data, current_obj),
+            *self._create_unique_primarykey_checks(unique_primarykey)
+        ]
+
+    def _find_violations(
+            self,
+            checks_by_key: dict[Any, list[tuple]]
+    ) -> dict[Any, Exception]:
+        """
+        Every check is an EXISTS subquery, which is true if the check is
+        violated. The checks of all keys are probed with a single SELECT,
+        the error of the first violated check is returned per key.
+        """
+        columns = [
+            (key, create_error, violation)
+            for key, checks in checks_by_key.items()
+            for violation, create_error in checks
+        ]
+
+        if len(columns) == 0:
+            return {}
+
+        row = db.session.execute(
+            select(*[
+                violation.label(f"check_{i}")
+                for i, (_, _, violation) in enumerate(columns)
+            ])
+        ).one()
+
+        violations = {}
+        for (key, create_error, _), is_violated in zip(columns, row):
+            if is_violated and key not in violations:
+                violations[key] = create_error()
+
+        return violations
+
+    def _create_foreignkey_checks(self, data: dict) -> list[tuple]:
         if self._foreign_key_columns is None:
-            return
+            return []
 
+        checks = []
         model: Model
         for model, field in self._foreign_key_columns:
             if field not in data.keys():
                 continue
 
             id = data[field]
-            obj = model.query.get(id)
+            primary_key = inspect(model).primary_key[0]
+            err_msg = f"Foreignkey '{field}={id}' is not existing for model '{model.__name__}'."  # noqa
 
-            if obj is None:
-                err_msg = f"Foreignkey '{field}={id}' is not existing for model '{model.__name__}'."  # noqa
-                raise errors.ForeignkeyNotFoundException(err_msg)
+            checks.append((
+                ~exists().where(primary_key == id),
+                partial(errors.ForeignkeyNotFoundException, err_msg)
+            ))
+
+        return checks
 
-    def _check_unqiue_column(self, data: dict) -> None:
+    def _create_unique_column_checks(self, data: dict) -> list[tuple]:
         if self._unique_columns is None:
-            return
+            return []
 
+        checks = []
         for column in self._unique_columns:
             value = data.get(column)
-            filter_kwargs = {column: value}
-            result_count = self._model.query.filter_by(**filter_kwargs).count()
 
-            if result_count > 0:
-                raise errors.DbModelUnqiueConstraintException(
+            checks.append((
+                exists().where(getattr(self._model, column) == value),
+                partial(
+                    errors.DbModelUnqiueConstraintException,
                     filedname=column,
                     value=value
                 )
+            ))
+
+        return checks
 
-    def _check_unique_columns_together(
+    def _create_unique_columns_together_checks(
             self,
             data: dict,
             current_obj: Model = None
-    ) -> None:
+    ) -> list[tuple]:
         if self._unique_columns_together is None or len(self._unique_columns_together) == 0:  # noqa
-            return
+            return []
 
         unique_columns_list = ([self._unique_columns_together]
                                if isinstance(self._unique_columns_together[0], str)  # noqa
                                else self._unique_columns_together)
 
+        checks = []
         for unique_columns in unique_columns_list:
             filter_kwargs = {}
             for field in unique_columns:
                 value = data.get(field, None)
                 filter_kwargs |= {field: value}
 
-            result_count = self._model.query.filter_by(**filter_kwargs).count()
+            conditions = [
+                getattr(self._model, field) == value
+                for field, value in filter_kwargs.items()
+            ]
 
-            if result_count == 0:
-                continue
-
-            if result_count == 1 and current_obj is not None:
-                result_model = self._model.query.filter_by(**filter_kwargs).first()  # noqa
-                if result_model == current_obj:
-                    continue
+            # the updated object itself is no conflict
+            if current_obj is not None:
+                conditions.append(~self._create_primary_key_filter(
+                    self._get_primary_key(current_obj)))
 
             err_fields = str(filter_kwargs)
             err_msg = f"The given fields are already existing with these values: {err_fields}."  # noqa
-            raise errors.DbModelUnqiueConstraintException(msg=err_msg)
 
-    def _ckeck_unique_primarykey(self, unique_primarykeys: tuple[str]) -> None:
+            checks.append((
+                exists().where(*conditions),
+                partial(errors.DbModelUnqiueConstraintException, msg=err_msg)
+            ))
+
+        return checks
+
+    def _create_unique_primarykey_checks(
+            self,
+            unique_primarykeys: tuple[str]
+    ) -> list[tuple]:
         if unique_primarykeys is None:
-            return
+            return []
+
+        return [(
+            exists().where(
+                self._create_primary_key_filter(unique_primarykeys)),
+            partial(
+                errors.DbModelAlreadyExistingException,
+                model=self._model,
+                data=unique_primarykeys
+            )
+        )]
 
-        obj = self._model.query.get(unique_primarykeys)
+    def _create_primary_key_filter(self, primary_key: Any) -> Any:
+        values = primary_key if isinstance(primary_key, tuple) else (primary_key,)  # noqa
 
-        if obj is None:
-            return
+        return and_(*[
+            column == value
+            for column, value in zip(inspect(self._model).primary_key, values)
+        ])
 
-        raise errors.DbModelAlreadyExistingException(
-            model=self._model,
-            data=unique_primarykeys
-        )
+    def _parse_ids(
+            self,
+            ids: str | list,
+            max_ids: int = BATCH_MAX_IDS,
+            id_type: type = None
+    ) -> list:
+        """
+        Unique ids (in request order) of a comma separated string or a list,
+        converted to id_type (default: the type of the primary key).
+        """
+        if id_type is None:
+            primary_key = inspect(self._model).primary_key
+            if len(primary_key) != 1:
+                err_msg = f"Batch fetch needs a single primary key column, '{self._model.__name__}' has a composite primary key."  # noqa
+                raise errors.ValueErrorGeneral(err_msg)
+
+            id_type = primary_key[0].type.python_type
+
+        id_values = ids
+        if ids is None or isinstance(ids, str):
+            id_values = [id.strip() for id in (ids or "").split(",") if id.strip()]  # noqa
+
+        try:
+            if not isinstance(id_values, list):
+                raise ValueError()
 
-    def _find_object_by_id(self, id: int) -> Model:
-        obj = self._model.query.get(id)
+            parsed_ids = list(dict.fromkeys(id_type(id) for id in id_values))
+        except (ValueError, TypeError):
+            err_msg = f"Field 'ids' is invalid with value: '{ids}'"
+            raise errors.ValueErrorGeneral(err_msg)
+
+        if not parsed_ids or len(parsed_ids) > max_ids:
+            err_msg = f"Field 'ids' needs 1 to {max_ids} ids."
+            raise errors.ValueErrorGeneral(err_msg)
+
+        return parsed_ids
+
+    def _get_primary_key(self, obj: Model) -> tuple:
+        return inspect(obj).identity
+
+    def _find_object_by_id(
+            self,
+            id: int,
+            api_model: api.model = None
+    ) -> Model:
+        loader_options = self._get_loader_options(api_model)
+
+        if loader_options:
+            # reloads an object of the permission check with its relations
+            obj = db.session.get(
+                self._model,
+                id,
+                options=loader_options,
+                populate_existing=True
+            )
+        else:
+            # already loaded by the permission check of the request
+            obj = get_permission_object(self._model, id)
+            if obj is None:
+                obj = self._model.query.get(id)
 
         if not obj:
             raise errors.DbModelNotFoundException(
@@ -366,6 +1321,239 @@ class BaseCrudController(IController, AbstractRedisCache):
 
         return obj
 
+    def _get_loader_options(self, api_model: api.model = None) -> list[Load]:
+        # api models are dicts, so they are compared by identity
+        loader_options = self._loader_options.get(id(api_model))
+        if loader_options is not None:
+            return loader_options
+
+        loader_options = [
+            self._create_loader(path)
+            for path in self._get_loader_paths(api_model)
+        ]
+
+        # built lazily, the mappers need all models to be configured
+        self._loader_options[id(api_model)] = loader_options
+        return loader_options
+
+    def _get_loader_paths(self, api_model: api.model) -> list[str]:
+        loader_paths = self._included_loader_paths.get(id(api_model))
+        if loader_paths is not None:
+            return loader_paths
+
+        loader_paths = []
+        for profile_api_model, paths in self._loader_profiles:
+            if profile_api_model is api_model:
+                loader_paths = paths
+
+        return loader_paths
+
+    def _get_projected_model(
+            self,
+            api_model: api.model,
+            reqargs: dict = None
+    ) -> api.model:
+        """
+        Sparse fieldset (?fields=id,name): the api model reduced to the
+        requested fields. Its loader options only load the columns and
+        relationships of these fields, its cache keys differ from the ones
+        of the full model (request path and entity fingerprint).
+        """
+        fields_str = reqargs.get("fields") if reqargs is not None else None
+        if not fields_str:
+            return api_model
+
+        field_names = frozenset(
+            name.strip() for name in fields_str.split(",") if name.strip())
+        model_fields = getattr(api_model, "resolved", api_model)
+
+        unknown_fields = field_names - model_fields.keys()
+        if unknown_fields:
+            err_msg = f"Query parameter 'fields' contains unknown fields: {sorted(unknown_fields)}. Use: {list(model_fields.keys())}."  # noqa
+            raise errors.ValueErrorGeneral(err_msg)
+
+        if reqargs.get("cursor") is not None:
+            cursor_fields = [column.key for column in self._get_cursor_columns()]  # noqa
+            if not field_names.issuperset(cursor_fields):
+                err_msg = f"Query parameter 'fields' has to contain the fields of the cursor: {cursor_fields}."  # noqa
+                raise errors.ValueErrorGeneral(err_msg)
+
+        # cached, the loader options and cache fingerprints are looked up
+        # by the identity of the api model
+        projected_model = self._projected_models.get((id(api_model), field_names))  # noqa
+        if projected_model is not None:
+            return projected_model
+
+        projected_model = ApiModel(getattr(api_model, "name", "Projection"), {
+            key: field
+            for key, field in model_fields.items()
+            if key in field_names
+        })
+        self._loader_options[id(projected_model)] = self._create_projection_options(api_model, projected_model)  # noqa
+        self._projected_models[(id(api_model), field_names)] = projected_model  # noqa
+
+        return projected_model
+
+    def _create_projection_options(
+            self,
+            api_model: api.model,
+            projected_model: api.model
+    ) -> list[Load]:
+        model_fields = getattr(api_model, "resolved", api_model)
+
+        # paths, which start at a field (not a python property), are only
+        # loaded for the selected fields
+        loader_options = [
+            self._create_loader(path)
+            for path in self._get_loader_paths(api_model)
+            if path.split(".")[0] in projected_model
+            or path.split(".")[0] not in model_fields
+        ]
+
+        columns = self._get_projection_columns(projected_model)
+        if columns is None:
+            return loader_options
+
+        return [orm.load_only(*columns), *loader_options]
+
+    def _get_included_model(
+            self,
+            api_model: api.model,
+            reqargs: dict = None
+    ) -> api.model:
+        """
+        Relationship expansion (?include=tags,rating): the api model with the
+        requested include fields, their relationships are loaded for the
+        whole page with one query each.
+        """
+        include_str = reqargs.get("include") if reqargs is not None else None  # noqa
+        if not include_str:
+            return api_model
+
+        include_names = frozenset(
+            name.strip() for name in include_str.split(",") if name.strip())
+
+        unknown_names = include_names - self._include_fields.keys()
+        if unknown_names:
+            err_msg = f"Query parameter 'include' contains unknown relationships: {sorted(unknown_names)}. Use: {list(self._include_fields.keys())}."  # noqa
+            raise errors.ValueErrorGeneral(err_msg)
+
+        included_model = self._included_models.get((id(api_model), include_names))  # noqa
+        if included_model is not None:
+            return included_model
+
+        included_model = self._create_included_model(api_model, include_names)  # noqa
+        self._included_models[(id(api_model), include_names)] = included_model  # noqa
+
+        return included_model
+
+    def _create_included_model(
+            self,
+            api_model: api.model,
+            include_names: frozenset
+    ) -> api.model:
+        model_fields = dict(getattr(api_model, "resolved", api_model))
+        loader_paths = list(self._get_loader_paths(api_model))
+
+        for name in sorted(include_names):
+            model_fields = self._add_include_field(
+                model_fields, name.split("."), self._include_fields[name])
+            loader_paths += self._include_loader_paths.get(name, [])
+
+        # the name is part of the schema fingerprint of the cache keys
+        included_model = ApiModel(
+            f"{getattr(api_model, 'name', 'Model')}:include={','.join(sorted(include_names))}",  # noqa
+            model_fields
+        )
+        self._included_loader_paths[id(included_model)] = loader_paths
+
+        return included_model
+
+    def _add_include_field(
+            self,
+            model_fields: dict,
+            path: list[str],
+            include_field: fields.Raw
+    ) -> dict:
+        """
+        Copy of the fields with the include field, nested models along the
+        path (Nested or List of Nested fields) are copied as well.
+        """
+        name, *nested_path = path
+        if not nested_path:
+            return {**model_fields, name: include_field}
+
+        parent_field = make(model_fields[name])
+        nested_field = parent_field.container if isinstance(parent_field, fields.List) else parent_field  # noqa
+        nested_model = nested_field.model
+        nested_fields = getattr(nested_model, "resolved", nested_model)
+
+        included_nested_field = copy.copy(nested_field)
+        included_nested_field.model = ApiModel(
+            f"{getattr(nested_model, 'name', 'Model')}:include={'.'.join(nested_path)}",  # noqa
+            self._add_include_field(dict(nested_fields), nested_path, include_field)  # noqa
+        )
+
+        if isinstance(parent_field, fields.List):
+            included_field = copy.copy(parent_field)
+            included_field.container = included_nested_field
+        else:
+            included_field = included_nested_field
+
+        return {**model_fields, name: included_field}
+
+    def _get_projection_columns(self, projected_model: api.model) -> list:
+        """
+        Column attributes of the fields (relationships need their local
+        columns), None if a field is no mapped attribute (e.g. a property,
+        which can read any column).
+        """
+        mapper = inspect(self._model)
+        column_keys = {mapper.get_property_by_column(column).key for column in mapper.primary_key}  # noqa
+
+        for key, field in projected_model.items():
+            attribute = getattr(field, "attribute", None) or key
+            if isinstance(field, dict) or not isinstance(attribute, str):
+                return None
+
+            if attribute in mapper.relationships:
+                column_keys.update(
+                    mapper.get_property_by_column(column).key
+                    for column in mapper.relationships[attribute].local_columns  # noqa
+                )
+            elif attribute in mapper.column_attrs:
+                # query expressions (like the role of a user) are not loaded
+                # from a column
+                if isinstance(mapper.column_attrs[attribute].expression, Column):  # noqa
+                    column_keys.add(attribute)
+            else:
+                return None
+
+        return [getattr(self._model, key) for key in sorted(column_keys)]
+
+    def _create_loader(self, path: str) -> Load:
+        loader = None
+        model = self._model
+
+        for name in path.split("."):
+            attribute = getattr(model, name)
+            if name not in inspect(model).relationships:
+                # deferred column at the end of the path
+                loader = orm.undefer(attribute) if loader is None else loader.undefer(attribute)  # noqa
+                break
+
+            relationship = inspect(model).relationships[name]
+            strategy = "selectinload" if relationship.uselist else "joinedload"  # noqa
+
+            if loader is None:
+                loader = getattr(orm, strategy)(attribute)
+            else:
+                loader = getattr(loader, strategy)(attribute)
+
+            model = relationship.mapper.class_
+
+        return loader
+
     def _create_model_search(self, reqargs: dict) -> Query:
         if self._search_fields is None or reqargs is None:
             return None
@@ -419,6 +1607,15 @@ class BaseCrudController(IController, AbstractRedisCache):
 
         page = reqargs.get("page")
         page_size = reqargs.get("page_size", self._pagination_page_size)
+        cursor = reqargs.get("cursor")
+
+        if cursor is not None:
+            self._validate_page_size(page_size)
+            return self._paginate_model_query_cursor(
+                model_query=model_query,
+                cursor=cursor,
+                page_size=int(page_size)
+            )
 
         if page is None:
             return model_query.all()
@@ -426,13 +1623,106 @@ class BaseCrudController(IController, AbstractRedisCache):
         self._validate_page(page)
         self._validate_page_size(page_size)
 
+        # the total count is only queried on request (see
+        # _create_pagination_headers)
         result_pagination: Pagination = model_query.paginate(
             page=int(page),
-            per_page=int(page_size)
+            per_page=int(page_size),
+            count=False
         )
 
         return result_pagination.items
 
+    def _paginate_model_query_cursor(
+            self,
+            model_query: Query,
+            cursor: str,
+            page_size: int
+    ) -> list:
+        """
+        Keyset pagination: the rows after the sort key of the cursor, the
+        cost per page doesn't grow with its depth like an OFFSET.
+        An empty cursor requests the first page.
+        """
+        columns = self._get_cursor_columns()
+        model_query = model_query.order_by(None).order_by(*columns)
+
+        if cursor:
+            values = decode_cursor(
+                cursor, [column.type.python_type for column in columns])
+            model_query = model_query.filter(
+                self._create_keyset_filter(columns, values))
+
+        return model_query.limit(page_size).all()
+
+    def _create_keyset_filter(self, columns: list, values: list) -> Any:
+        # (a, b) > (x, y)  <=>  a > x OR (a = x AND b > y)
+        column, *other_columns = columns
+        value, *other_values = values
+
+        if not other_columns:
+            return column > value
+
+        return or_(
+            column > value,
+            and_(
+                column == value,
+                self._create_keyset_filter(other_columns, other_values)
+            )
+        )
+
+    def _get_cursor_columns(self) -> list:
+        primary_key = inspect(self._model).primary_key
+
+        if self._cursor_sort_column is None:
+            return list(primary_key)
+
+        return [getattr(self._model, self._cursor_sort_column), *primary_key]
+
+    def _create_pagination_headers(
+            self,
+            create_model_query: Callable[[], Query],
+            response_data: list,
+            reqargs: dict
+    ) -> dict:
+        """
+        X-Next-Cursor: cursor of the next page, if the page is full
+        X-Total-Count: count of all rows, on request (count=true)
+        """
+        headers = {}
+        if reqargs is None:
+            return headers
+
+        page_size = reqargs.get("page_size", self._pagination_page_size)
+        if (
+            reqargs.get("cursor") is not None and
+            len(response_data) == int(page_size)
+        ):
+            headers["X-Next-Cursor"] = self._create_next_cursor(response_data[-1])  # noqa
+
+        if str(reqargs.get("count", "")).lower() in ("true", "1"):
+            count_query = create_model_query().order_by(None)
+            headers["X-Total-Count"] = str(count_query.count())
+
+        return headers
+
+    def _create_next_cursor(self, last_item: dict) -> str:
+        # built from the response, so cached pages get a cursor as well,
+        # the fields are checked by _validate_cursor_fields
+        values = [last_item[column.key] for column in self._get_cursor_columns()]  # noqa
+        return encode_cursor(values)
+
+    def _validate_cursor_fields(self, api_response_model: api.model) -> None:
+        model_fields = getattr(api_response_model, "resolved", api_response_model)  # noqa
+        missing_fields = [
+            column.key
+            for column in self._get_cursor_columns()
+            if column.key not in model_fields
+        ]
+        if missing_fields:
+            err_msg = f"Cursor pagination needs the fields {missing_fields} in the response."  # noqa
+            raise errors.ValueErrorGeneral(err_msg)
+
     def _validate_page(self, page: int) -> None:
         if not helper.is_integer(page):
             err_msg = "Query parameter 'page' should be type of int."
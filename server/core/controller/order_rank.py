@@ -0,0 +1,209 @@
+from flask_sqlalchemy.model import Model
+from sqlalchemy import and_, case, func, inspect, select, tuple_, update
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.orm.attributes import set_committed_value
+
+from server.db import db
+from server.errors import errors
+from server.core.utils import model_validator as ModelValidator
+
+
+ORDER_RANK_GAP = 1024
+
+
+class OrderRank:
+    """
+    Gapped integer ranks, which order the rows of a group (like the areas of
+    a supermarket).
+
+    A move takes the middle between the ranks of the new neighbours, so only
+    the moved row is written. If no gap is left, the group is rebalanced to
+    multiples of ORDER_RANK_GAP with one UPDATE.
+
+    The ranks are internal, clients only see and send positions (starting
+    with 1), new rows get their rank from the position (see rank_for_insert).
+    The positions of loaded rows are set with one query (see load_positions).
+    """
+
+    def __init__(
+            self,
+            *,
+            model: Model,
+            rank_column: InstrumentedAttribute,
+            group_columns: list[InstrumentedAttribute],
+            position_attribute: str = "position"
+    ) -> None:
+        self._model = model
+        self._primary_key = inspect(model).primary_key[0]
+        self._rank_column = rank_column
+        self._group_columns = group_columns
+        self._position_attribute = position_attribute
+
+    def move(self, obj: Model, position: int) -> None:
+        """
+        Moves the object to the position (starting with 1) within its group,
+        a position after the last row moves it to the end.
+        """
+        group_values = {
+            column.key: getattr(obj, column.key)
+            for column in self._group_columns
+        }
+        obj_id = getattr(obj, self._primary_key.key)
+
+        rank = self._get_free_rank(group_values, position, obj_id)
+        setattr(obj, self._rank_column.key, rank)
+
+    def rank_for_insert(self, group_values: dict, position: int) -> int:
+        """
+        Rank of a new row at the position (starting with 1) within the group,
+        a position after the last row appends it.
+        """
+        return self._get_free_rank(group_values, position)
+
+    def load_positions(self, objs: list[Model]) -> None:
+        """
+        Sets the positions of the objects with one query, which numbers the
+        rows of their groups with row_number over the ranks. The objects can
+        be any page of the groups, a count per row would be quadratic.
+        """
+        if len(objs) == 0:
+            return
+
+        ids = [getattr(obj, self._primary_key.key) for obj in objs]
+        groups = select(*self._group_columns) \
+            .where(self._primary_key.in_(ids))
+
+        positions = select(
+            self._primary_key,
+            func.row_number().over(
+                partition_by=self._group_columns,
+                order_by=[self._rank_column, self._primary_key]
+            ).label(self._position_attribute)
+        ).where(tuple_(*self._group_columns).in_(groups)).subquery()
+
+        positions_by_id = dict(db.session.execute(
+            select(positions.c[self._primary_key.key],
+                   positions.c[self._position_attribute])
+            .where(positions.c[self._primary_key.key].in_(ids))
+        ).all())
+
+        for obj, id in zip(objs, ids):
+            set_committed_value(
+                obj, self._position_attribute, positions_by_id.get(id))
+
+    def set_order(self, group_values: dict, ids: list) -> None:
+        """
+        Applies a new order to all rows of the group with one UPDATE, ids
+        has to contain every row of the group exactly once.
+        """
+        if not isinstance(ids, list) or not all(isinstance(id, int) for id in ids):  # noqa
+            err_msg = "The order should be a list of ids."
+            raise errors.ValueErrorGeneral(err_msg)
+
+        group_filter = self._create_group_filter(group_values)
+        group_ids = db.session.execute(
+            select(self._primary_key).where(group_filter)
+        ).scalars().all()
+
+        if len(ids) != len(set(ids)) or set(ids) != set(group_ids):
+            err_msg = f"The order has to contain every id of the group exactly once: {sorted(group_ids)}."  # noqa
+            raise errors.ValueErrorGeneral(err_msg)
+
+        self._update_ranks(group_filter, ids)
+
+    # protected
+    def _get_free_rank(
+            self,
+            group_values: dict,
+            position: int,
+            obj_id: int = None
+    ) -> int:
+        ModelValidator.validate_integer(
+            fieldname=self._rank_column.key,
+            value=position,
+            min_=1
+        )
+
+        group_filter = self._create_group_filter(group_values)
+
+        rank = self._find_rank(obj_id, position, group_filter)
+        if rank is None:
+            self._rebalance(group_filter)
+            rank = self._find_rank(obj_id, position, group_filter)
+
+        return rank
+
+    # protected
+    def _find_rank(
+            self,
+            obj_id: int | None,
+            position: int,
+            group_filter
+    ) -> int | None:
+        """
+        Rank between the neighbours of the position, None if there is no
+        gap between them. obj_id: the moved row, None for a new row
+        """
+        query = select(self._rank_column) \
+            .where(group_filter, self._primary_key != obj_id) \
+            .order_by(self._rank_column, self._primary_key)
+
+        if position == 1:
+            before = 0
+            after = db.session.execute(query.limit(1)).scalar()
+        else:
+            neighbours = db.session.execute(
+                query.offset(position - 2).limit(2)).scalars().all()
+
+            if len(neighbours) == 0:
+                # after the last row
+                before = db.session.execute(
+                    select(func.max(self._rank_column))
+                    .where(group_filter, self._primary_key != obj_id)
+                ).scalar() or 0
+                after = None
+            else:
+                before = neighbours[0]
+                after = neighbours[1] if len(neighbours) == 2 else None
+
+        if after is None:
+            return before + ORDER_RANK_GAP
+
+        if after - before < 2:
+            return None
+
+        return (before + after) // 2
+
+    # protected
+    def _rebalance(self, group_filter) -> None:
+        ids = db.session.execute(
+            select(self._primary_key)
+            .where(group_filter)
+            .order_by(self._rank_column, self._primary_key)
+        ).scalars().all()
+
+        self._update_ranks(group_filter, ids)
+
+    # protected
+    def _update_ranks(self, group_filter, ids: list) -> None:
+        if len(ids) == 0:
+            return
+
+        ranks = case(
+            {id: (i + 1) * ORDER_RANK_GAP for i, id in enumerate(ids)},
+            value=self._primary_key
+        )
+
+        db.session.execute(
+            update(self._model)
+            .where(group_filter)
+            .values({self._rank_column.key: ranks})
+            .execution_options(synchronize_session="fetch")
+        )
+
+    # protected
+    def _create_group_filter(self, group_values: dict):
+        return and_(*[
+            column == group_values[column.key]
+            for column in self._group_columns
+        ])
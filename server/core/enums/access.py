@@ -0,0 +1,8 @@
+OWNER = "owner"
+ACCESS = "access"
+EDIT = "edit"
+
+# role of the user for a resource in list responses
+ROLE_OWNER = "owner"
+ROLE_EDITOR = "editor"
+ROLE_VIEWER = "viewer"
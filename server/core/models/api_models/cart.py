@@ -1,6 +1,18 @@
-from flask_restx import fields
+from flask_restx import fields, reqparse
 from server.api import api
 from server.core.models.api_models.ingredient import ingredient_model
+from server.core.models.api_models.utils import (
+    add_include_argument, reqparse_add_queryparams_doc
+)
+
+
+# GET QUERY MODELS
+
+qpp_cart_model = reqparse_add_queryparams_doc(
+    parser=reqparse.RequestParser(),
+    add_search_utils=False,
+    add_pagination=True
+)
 
 
 # API MODELS
@@ -41,6 +53,12 @@ cart_model = api.model("CartModel", {
     "is_active": fields.Boolean
 })
 
+# list of the carts the user owns or which are shared with the user
+cart_model_list = api.model("CartModelList", {
+    **cart_model,
+    "role": fields.String(description="owner, editor or viewer")
+})
+
 cart_model_send = api.model("CartModelSend", {
     "name": fields.String,
     "is_active": fields.Boolean
@@ -50,3 +68,12 @@ user_shared_cart_model = api.model("UserSharedCartModel", {
     "cart_id": fields.Integer,
     "user_id": fields.Integer
 })
+
+
+# INCLUDE FIELDS
+
+cart_include_fields = {
+    "items": cart_model_detail["items"]
+}
+
+add_include_argument(qpp_cart_model, cart_include_fields)
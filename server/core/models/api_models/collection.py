@@ -1,11 +1,13 @@
 from flask_restx import reqparse, fields
 
 from server.core.models.api_models.utils import (
-    acl_model, reqparse_add_queryparams_doc
+    acl_model, add_include_argument, reqparse_add_queryparams_doc
 )
 from server.api import api
 from server.core.models.api_models.category import category_model
-from server.core.models.api_models.recipe import recipe_image_model
+from server.core.models.api_models.recipe import (
+    recipe_image_model, recipe_include_fields
+)
 from server.core.models.api_models.tag import tag_model
 
 
@@ -46,6 +48,12 @@ collection_model = api.model("CollectionModelDetail", {
     "acl": fields.List(fields.Nested(acl_model))
 })
 
+# list of the collections the user owns or which are shared with the user
+collection_model_list = api.model("CollectionModelList", {
+    **collection_model,
+    "role": fields.String(description="owner, editor or viewer")
+})
+
 collection_model_send = api.model("CollectionModelSend", {
     "name": fields.String,
     "is_default": fields.Boolean
@@ -65,3 +73,13 @@ user_shared_collection_model = api.model("CollectionUserModel", {
 user_shared_collection_model_send = api.model("CollectionUserModelSend", {
     "can_edit": fields.Boolean
 })
+
+
+# INCLUDE FIELDS
+
+collection_include_fields = {
+    "recipes.ingredients": recipe_include_fields["ingredients"],
+    "recipes.rating": recipe_include_fields["rating"]
+}
+
+add_include_argument(qpp_collection_model, collection_include_fields)
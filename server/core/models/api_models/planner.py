@@ -4,8 +4,10 @@ from flask_restx import fields, reqparse
 
 from server.api import api
 from server.core.models.api_models.category import category_model
+from server.core.models.api_models.ingredient import ingredient_model
+from server.core.models.api_models.recipe import recipe_include_fields
 from server.core.models.api_models.utils import (
-    acl_model, reqparse_add_queryparams_doc
+    acl_model, add_include_argument, reqparse_add_queryparams_doc
 )
 
 
@@ -29,6 +31,17 @@ qpp_recipe_planner_item_model = reqparse_add_queryparams_doc(
     ]
 )
 
+qpp_shopping_list_model = reqparse_add_queryparams_doc(
+    parser=reqparse.RequestParser(),
+    add_search_utils=False,
+    add_pagination=False,
+    query_params=[
+        ("date_of_week", date),
+        ("date_from", date),
+        ("date_to", date)
+    ]
+)
+
 
 # API MODELS
 
@@ -43,7 +56,7 @@ recipe_planner_item_model = api.model("RecipePlannerItemModel", {
     "rplanner_id": fields.Integer,
     "date": fields.Date,
     "label": fields.String,
-    "order_number": fields.Integer,
+    "order_number": fields.Integer(attribute="position", description="position within the date"),  # noqa
     "planned_recipe_person_count": fields.Integer,
     "recipe": fields.Nested(u_recipe_planner_item_recipe_model)
 })
@@ -53,10 +66,25 @@ recipe_planner_item_model_send = api.model("RecipePlannerItemModelSend", {
     "recipe_id": fields.Integer,
     "date": fields.Date,
     "label": fields.String,
-    "order_number": fields.Integer,
+    "order_number": fields.Integer(description="position of the new item within the date"),  # noqa
     "planned_recipe_person_count": fields.Integer,
 })
 
+recipe_planner_item_order_model_send = api.model("RecipePlannerItemOrderModelSend", {   # noqa
+    "date": fields.Date,
+    "ids": fields.List(fields.Integer)
+})
+
+# ingredients of the planned recipes of a date range, summed up
+shopping_list_item_model = api.model("ShoppingListItemModel", {
+    "quantity": fields.Float(description="scaled to the planned person count"),  # noqa
+    "ingredient": fields.Nested(ingredient_model)
+})
+
+shopping_list_cart_model_send = api.model("ShoppingListCartModelSend", {
+    "cart_id": fields.Integer
+})
+
 recipe_planner_model_detail = api.model("RecipePlannerModel", {
     "id": fields.Integer,
     "name": fields.String,
@@ -72,6 +100,12 @@ recipe_planner_model = api.model("RecipePlannerModel", {
     "is_active": fields.Boolean
 })
 
+# list of the planners the user owns or which are shared with the user
+recipe_planner_model_list = api.model("RecipePlannerModelList", {
+    **recipe_planner_model,
+    "role": fields.String(description="owner, editor or viewer")
+})
+
 recipe_planner_model_send = api.model("RecipePlannerModelSend", {
     "name": fields.String,
     "is_active": fields.Boolean
@@ -86,3 +120,15 @@ user_shared_recipe_planner_model = api.model("UserSharedRecipePlannerModel", {
 user_shared_recipe_planner_model_send = api.model("UserSharedRecipePlannerModelSend", {  # noqa
     "can_edit": fields.Boolean
 })
+
+
+# INCLUDE FIELDS
+
+recipe_planner_item_include_fields = {
+    "recipe.tags": recipe_include_fields["tags"],
+    "recipe.images": recipe_include_fields["images"],
+    "recipe.rating": recipe_include_fields["rating"]
+}
+
+add_include_argument(
+    qpp_recipe_planner_item_model, recipe_planner_item_include_fields)
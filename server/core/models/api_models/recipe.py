@@ -3,7 +3,7 @@ from flask_restx import fields, reqparse
 from server.api import api
 from server.core.enums import difficulty
 from server.core.models.api_models.utils import (
-    reqparse_add_queryparams_doc
+    add_include_argument, reqparse_add_queryparams_doc
 )
 from server.core.models.api_models.ingredient import ingredient_model
 from server.core.models.api_models.category import category_model
@@ -40,6 +40,15 @@ qpp_recipe_rating_model = reqparse_add_queryparams_doc(
     ]
 )
 
+qpp_recipe_rating_batch_model = reqparse_add_queryparams_doc(
+    parser=reqparse.RequestParser(),
+    add_search_utils=False,
+    add_pagination=False,
+    query_params=[
+        ("ids", str)
+    ]
+)
+
 
 # API MODELS
 
@@ -73,6 +82,15 @@ recipe_ingredient_model_send = api.model("RecipeIngredientModelSend", {
     "quantity": fields.Float
 })
 
+recipe_ingredient_model_send_bulk = api.model("RecipeIngredientModelSendBulk", {  # noqa
+    "ingredient_id": fields.Integer,
+    "quantity": fields.Float
+})
+
+recipe_tag_model_send_bulk = api.model("RecipeTagModelSendBulk", {
+    "tag_id": fields.Integer
+})
+
 recipe_image_model = api.model("RecipeImageModel", {
     "id": fields.Integer
 })
@@ -120,6 +138,26 @@ recipe_rating_model_agg = api.model("RecipeRatingModelAggregation", {
     "rating_count": fields.Integer
 })
 
+recipe_rating_model_agg_batch = api.model("RecipeRatingModelAggregationBatch", {  # noqa
+    "recipe_id": fields.Integer,
+    "rating_avg": fields.Float,
+    "rating_count": fields.Integer
+})
+
 recipe_rating_model_send = api.model("RecipeDatingModelSend", {
     "rating": fields.Float,
 })
+
+
+# INCLUDE FIELDS
+
+# the relationships of the detail model and the rating aggregate
+recipe_include_fields = {
+    "category": recipe_model_detail["category"],
+    "tags": recipe_model_detail["tags"],
+    "images": recipe_model_detail["images"],
+    "ingredients": recipe_model_detail["ingredients"],
+    "rating": fields.Nested(recipe_rating_model_agg, attribute="rating_aggregate")  # noqa
+}
+
+add_include_argument(qpp_recipe_model, recipe_include_fields)
@@ -32,7 +32,7 @@ u_area_ingredient_model = api.model("utils", {
 u_supermarket_area_model = api.model("utils", {
     "id": fields.Integer,
     "name": fields.String,
-    "order_number": fields.Integer,
+    "order_number": fields.Integer(attribute="position", description="position within the supermarket"),  # noqa
     "ingredients": fields.List(
         fields.Nested(u_area_ingredient_model)
     )
@@ -41,7 +41,7 @@ u_supermarket_area_model = api.model("utils", {
 supermarket_area_model = api.model("SupermarketAreaModel", {
     "id": fields.Integer,
     "name": fields.String,
-    "order_number": fields.Integer,
+    "order_number": fields.Integer(attribute="position", description="position within the supermarket"),  # noqa
     "supermarket_id": fields.Integer,
     "ingredients": fields.List(
         fields.Nested(u_area_ingredient_model)
@@ -50,7 +50,7 @@ supermarket_area_model = api.model("SupermarketAreaModel", {
 
 supermarket_area_model_send = api.model("SupermarketAreaModelSend", {
     "name": fields.String,
-    "order_number": fields.Integer
+    "order_number": fields.Integer(description="position of the new area")
 })
 
 supermarket_area_ingredinet_model = api.model("SupermarketAreaIngredientModel", {  # noqa
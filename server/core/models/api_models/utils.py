@@ -22,6 +22,19 @@ def reqparse_add_queryparams_doc(
             type=int,
             location="args"
         )
+        parser.add_argument(
+            "cursor",
+            type=str,
+            location="args",
+            help="Cursor pagination: empty for the first page, then the value of the 'X-Next-Cursor' header"  # noqa
+        )
+        parser.add_argument(
+            "count",
+            type=bool,
+            location="args",
+            help="Return the count of all rows in the 'X-Total-Count' header"  # noqa
+        )
+        add_fields_argument(parser)
 
     if add_search_utils:
         parser.add_argument(
@@ -48,6 +61,47 @@ def reqparse_add_queryparams_doc(
     return parser
 
 
+def add_fields_argument(
+        parser: reqparse.RequestParser
+) -> reqparse.RequestParser:
+    parser.add_argument(
+        "fields",
+        type=str,
+        location="args",
+        help="Sparse fieldset: comma separated fields of the response, like 'id,name'"  # noqa
+    )
+
+    return parser
+
+
+def add_include_argument(
+        parser: reqparse.RequestParser,
+        include_fields: dict
+) -> reqparse.RequestParser:
+    parser.add_argument(
+        "include",
+        type=str,
+        location="args",
+        help=f"Relationship expansion: comma separated relationships embedded in the response, one of {list(include_fields)}"  # noqa
+    )
+
+    return parser
+
+
+# GET QUERY MODELS
+
+qpp_fields_model = add_fields_argument(reqparse.RequestParser())
+
+qpp_ids_model = reqparse_add_queryparams_doc(
+    parser=add_fields_argument(reqparse.RequestParser()),
+    add_search_utils=False,
+    add_pagination=False,
+    query_params=[
+        ("ids", str)
+    ]
+)
+
+
 base_name_model_fields = {
     "id": fields.Integer,
     "name": fields.String
@@ -68,3 +122,21 @@ acl_model = api.model("utils", {
     "user_id": fields.Integer,
     "can_edit": fields.Boolean
 })
+
+
+bulk_result_model = api.model("BulkResultModel", {
+    "index": fields.Integer,
+    "status": fields.Integer,
+    "message": fields.String,
+    "data": fields.Raw
+})
+
+
+order_model_send = api.model("OrderModelSend", {
+    "ids": fields.List(fields.Integer)
+})
+
+
+ids_model_send = api.model("IdsModelSend", {
+    "ids": fields.List(fields.Integer)
+})
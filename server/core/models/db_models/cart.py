@@ -11,7 +11,7 @@ Ein Item im Einkaufskorb entspricht einem Ingredient!
 from typing import Any
 
 from sqlalchemy import UniqueConstraint
-from sqlalchemy.orm import validates
+from sqlalchemy.orm import query_expression, validates
 
 from server.core.models.db_models.utils import strlen
 from server.db import db
@@ -31,10 +31,13 @@ class Cart(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(strlen.L50), nullable=False)
-    owner_user_id = db.Column(db.Integer, nullable=False)  # noqa
+    owner_user_id = db.Column(db.Integer, nullable=False, index=True)  # noqa
     is_active = db.Column(db.Boolean, nullable=False, default=True)
 
-    items = db.relationship("CartItem", cascade="all,delete", lazy="dynamic")
+    # role of the requesting user (access.ROLE_*), loaded by list queries
+    role = query_expression()
+
+    items = db.relationship("CartItem", cascade="all,delete", lazy="select")
 
     __table_args__ = (
         UniqueConstraint("name", "owner_user_id", name="uq_cart_name_user"),
@@ -74,7 +77,7 @@ class CartItem(db.Model):
     __tablename__ = "cart_item"
 
     id = db.Column(db.Integer, primary_key=True)
-    cart_id = db.Column(db.Integer, db.ForeignKey("cart.id"), nullable=False)
+    cart_id = db.Column(db.Integer, db.ForeignKey("cart.id"), nullable=False, index=True)  # noqa
     recipe_id = db.Column(db.Integer, db.ForeignKey("recipe.id"), nullable=True)  # noqa can be NULL!!!
     ingredient_id = db.Column(db.Integer, db.ForeignKey("ingredient.id"), nullable=False)  # noqa
     quantity = db.Column(db.Integer, nullable=False)
@@ -136,7 +139,7 @@ class UserSharedEditCart(db.Model):
     __tablename__ = "cart_user"
 
     cart_id = db.Column(db.Integer, db.ForeignKey("cart.id"), primary_key=True)  # noqa
-    user_id = db.Column(db.Integer, primary_key=True)  # noqa
+    user_id = db.Column(db.Integer, primary_key=True, index=True)  # noqa
 
     __table_args__ = (
         UniqueConstraint("cart_id", "user_id", name="uq_rplanner_user"),
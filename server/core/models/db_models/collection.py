@@ -1,7 +1,7 @@
 from typing import Any
 
 from sqlalchemy import UniqueConstraint
-from sqlalchemy.orm import validates
+from sqlalchemy.orm import query_expression, validates
 
 from server.db import db
 from server.core.models.db_models.utils import strlen
@@ -21,9 +21,12 @@ class Collection(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(strlen.L50), nullable=False)
-    owner_user_id = db.Column(db.Integer, nullable=False)  # noqa
+    owner_user_id = db.Column(db.Integer, nullable=False, index=True)  # noqa
     is_default = db.Column(db.Boolean, nullable=False)
 
+    # role of the requesting user (access.ROLE_*), loaded by list queries
+    role = query_expression()
+
     recipes_ = db.relationship(
         "CollectionRecipeComposite",
         cascade="all,delete",
@@ -105,7 +108,7 @@ class UserSharedCollection(db.Model):
     __tablename__ = "collection_user"
 
     collection_id = db.Column(db.Integer, db.ForeignKey("collection.id"), primary_key=True)  # noqa
-    user_id = db.Column(db.Integer, primary_key=True)  # noqa
+    user_id = db.Column(db.Integer, primary_key=True, index=True)  # noqa
     can_edit = db.Column(db.Boolean, nullable=False)
 
     __table_args__ = (
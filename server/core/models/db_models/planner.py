@@ -8,8 +8,8 @@ Man kann mehrere Planner erstellen und andere leute einladen
 from typing import Any
 from dateutil import parser
 
-from sqlalchemy import UniqueConstraint
-from sqlalchemy.orm import validates
+from sqlalchemy import Index, UniqueConstraint, and_, func, or_, select
+from sqlalchemy.orm import column_property, query_expression, validates
 
 from server.db import db
 from server.core.models.db_models.utils import strlen
@@ -29,9 +29,12 @@ class RecipePlanner(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(strlen.L25), unique=True, nullable=False)
-    owner_user_id = db.Column(db.Integer, nullable=False)  # noqa
+    owner_user_id = db.Column(db.Integer, nullable=False, index=True)  # noqa
     is_active = db.Column(db.Boolean, nullable=False, default=True)
 
+    # role of the requesting user (access.ROLE_*), loaded by list queries
+    role = query_expression()
+
     items_unsorted = db.relationship(
         "RecipePlannerItem",
         cascade="all,delete",
@@ -55,7 +58,7 @@ class RecipePlanner(db.Model):
     def items(self):
         return sorted(
             self.items_unsorted,
-            key=lambda x: (x.date, x.order_number)
+            key=lambda x: (x.date, x.order_number, x.id)
         )
 
     @validates("name")
@@ -103,12 +106,16 @@ class RecipePlannerItem(db.Model):
     recipe_id = db.Column(db.Integer, db.ForeignKey("recipe.id"), nullable=False)  # noqa
     date = db.Column(db.Date, nullable=False)
     label = db.Column(db.String(strlen.L25), nullable=False, default="")
+    # gapped rank within the date (see OrderRank), the api exposes the
+    # position instead
     order_number = db.Column(db.Integer, nullable=False)
     planned_recipe_person_count = db.Column(db.Integer, nullable=False)
 
     recipe = db.relationship("Recipe", lazy="select")
 
-    # Unique together: rplanner_id, date, order_number
+    __table_args__ = (
+        Index("ix_rplanner_item_rplanner_id_date", "rplanner_id", "date"),
+    )
 
     @validates("rplanner_id")
     def validate_rplanner_id(self, key: str, value: Any) -> str:
@@ -170,6 +177,29 @@ class RecipePlannerItem(db.Model):
         return value
 
 
+_other_items = RecipePlannerItem.__table__.alias()
+
+# 1-based position of the item within its date, deferred: a count per row,
+# lists set it with OrderRank.load_positions
+RecipePlannerItem.position = column_property(
+    select(func.count(_other_items.c.id))
+    .where(
+        _other_items.c.rplanner_id == RecipePlannerItem.rplanner_id,
+        _other_items.c.date == RecipePlannerItem.date,
+        or_(
+            _other_items.c.order_number < RecipePlannerItem.order_number,
+            and_(
+                _other_items.c.order_number == RecipePlannerItem.order_number,
+                _other_items.c.id <= RecipePlannerItem.id
+            )
+        )
+    )
+    .correlate_except(_other_items)
+    .scalar_subquery(),
+    deferred=True
+)
+
+
 @add_from_json_method
 @add_to_dict_method
 @add__str__method
@@ -180,7 +210,7 @@ class UserSharedRecipePlanner(db.Model):
     __tablename__ = "rplanner_user"
 
     rplanner_id = db.Column(db.Integer, db.ForeignKey("rplanner.id"), primary_key=True)  # noqa
-    user_id = db.Column(db.Integer, primary_key=True)  # noqa
+    user_id = db.Column(db.Integer, primary_key=True, index=True)  # noqa
     can_edit = db.Column(db.Boolean, nullable=False)
 
     __table_args__ = (
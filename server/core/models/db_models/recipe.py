@@ -1,7 +1,8 @@
 from typing import Any
 
-from sqlalchemy import UniqueConstraint
-from sqlalchemy.orm import validates
+from sqlalchemy import UniqueConstraint, event, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import validates, deferred, Mapper
 
 from server.db import db
 from server.core.models.db_models.utils import strlen
@@ -33,6 +34,10 @@ class Recipe(db.Model):
     creator_user_id = db.Column(db.Integer, nullable=False)  # noqa
     category_id = db.Column(db.Integer, db.ForeignKey("category.id"), nullable=False)  # noqa
 
+    # maintained by the RecipeRating events, only loaded on access
+    rating_sum = deferred(db.Column(db.Float, nullable=False, default=0, server_default="0"))  # noqa
+    rating_count = deferred(db.Column(db.Integer, nullable=False, default=0, server_default="0"))  # noqa
+
     category = db.relationship("Category", backref="recipe", lazy="select")
     ingredients = db.relationship(
         "RecipeIngredient",
@@ -51,6 +56,12 @@ class Recipe(db.Model):
         secondary="recipe_image",
         backref=db.backref("recipe", lazy="dynamic")
     )
+    # only read through the rating aggregate (cache dependency)
+    ratings = db.relationship("RecipeRating", viewonly=True, lazy="select")
+
+    @property
+    def rating_aggregate(self) -> dict:
+        return to_rating_aggregate(self.rating_sum, self.rating_count)
 
     @validates("name")
     def validate_name(self, key: str, value: Any) -> str:
@@ -252,6 +263,69 @@ class RecipeRating(db.Model):
         return value
 
 
+def to_rating_aggregate(rating_sum: float, rating_count: int) -> dict:
+    rating_avg = 0.
+    if rating_count > 0:
+        rating_avg = round(rating_sum / rating_count, 1)
+
+    return {
+        "rating_avg": rating_avg,
+        "rating_count": rating_count
+    }
+
+
+def update_recipe_rating(
+        connection: Connection,
+        recipe_id: int,
+        rating_delta: float,
+        count_delta: int
+) -> None:
+    """
+    Increments the rating aggregate of the recipe in the flushing
+    transaction, so concurrent ratings can't overwrite each other.
+    """
+    connection.execute(
+        Recipe.__table__.update()
+        .where(Recipe.__table__.c.id == recipe_id)
+        .values(
+            rating_sum=Recipe.__table__.c.rating_sum + rating_delta,
+            rating_count=Recipe.__table__.c.rating_count + count_delta
+        )
+    )
+
+
+@event.listens_for(RecipeRating, "after_insert")
+def add_recipe_rating(
+        mapper: Mapper,
+        connection: Connection,
+        target: RecipeRating
+) -> None:
+    update_recipe_rating(connection, target.recipe_id, target.rating, 1)
+
+
+@event.listens_for(RecipeRating, "after_update")
+def change_recipe_rating(
+        mapper: Mapper,
+        connection: Connection,
+        target: RecipeRating
+) -> None:
+    history = inspect(target).attrs.rating.history
+    if not history.has_changes() or not history.deleted:
+        return
+
+    rating_delta = target.rating - history.deleted[0]
+    update_recipe_rating(connection, target.recipe_id, rating_delta, 0)
+
+
+@event.listens_for(RecipeRating, "after_delete")
+def remove_recipe_rating(
+        mapper: Mapper,
+        connection: Connection,
+        target: RecipeRating
+) -> None:
+    update_recipe_rating(connection, target.recipe_id, -target.rating, -1)
+
+
 @add_from_json_method
 @add_to_dict_method
 @add__str__method
@@ -1,7 +1,8 @@
 from typing import Any
 
-from sqlalchemy import UniqueConstraint
-from sqlalchemy.orm import validates
+from sqlalchemy import UniqueConstraint, and_, func, or_, select
+from sqlalchemy.orm import column_property, validates
+from sqlalchemy.orm.attributes import set_committed_value
 
 from server.db import db
 from server.core.models.db_models.utils import strlen
@@ -24,13 +25,13 @@ class Supermarket(db.Model):
     street = db.Column(db.String(strlen.L100), nullable=False)
     postcode = db.Column(db.String(strlen.L25), nullable=False)
     district = db.Column(db.String(strlen.L50), nullable=False)
-    owner_user_id = db.Column(db.Integer, nullable=False)  # noqa
+    owner_user_id = db.Column(db.Integer, nullable=False, index=True)  # noqa
 
     areas_unsorted = db.relationship(
         "SupermarketArea",
         cascade="all,delete",
         backref="supermarket",
-        lazy="dynamic"
+        lazy="select"
     )
 
     __table_args__ = (
@@ -43,10 +44,15 @@ class Supermarket(db.Model):
 
     @property
     def areas(self):
-        return sorted(
+        areas = sorted(
             self.areas_unsorted,
-            key=lambda x: (x.order_number)
+            key=lambda x: (x.order_number, x.id)
         )
+        # the collection holds every area, so its order is the position
+        for position, area in enumerate(areas, start=1):
+            set_committed_value(area, "position", position)
+
+        return areas
 
     @validates("name")
     def validate_name(self, key: str, value: Any) -> str:
@@ -105,6 +111,8 @@ class SupermarketArea(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(strlen.L25), unique=True, nullable=False)
+    # gapped rank within the supermarket (see OrderRank), the api exposes
+    # the position instead
     order_number = db.Column(db.Integer, nullable=False)
     supermarket_id = db.Column(db.Integer, db.ForeignKey("supermarket.id"), nullable=False)  # noqa
 
@@ -151,6 +159,28 @@ class SupermarketArea(db.Model):
         return value
 
 
+_other_areas = SupermarketArea.__table__.alias()
+
+# 1-based position of the area within its supermarket, deferred: a count
+# per row, lists set it with OrderRank.load_positions
+SupermarketArea.position = column_property(
+    select(func.count(_other_areas.c.id))
+    .where(
+        _other_areas.c.supermarket_id == SupermarketArea.supermarket_id,
+        or_(
+            _other_areas.c.order_number < SupermarketArea.order_number,
+            and_(
+                _other_areas.c.order_number == SupermarketArea.order_number,
+                _other_areas.c.id <= SupermarketArea.id
+            )
+        )
+    )
+    .correlate_except(_other_areas)
+    .scalar_subquery(),
+    deferred=True
+)
+
+
 @add_from_json_method
 @add_to_dict_method
 @add__str__method
@@ -204,7 +234,7 @@ class UserSharedEditSupermarket(db.Model):
     __tablename__ = "supermarket_edit_user"
 
     supermarket_id = db.Column(db.Integer, db.ForeignKey("supermarket.id"), primary_key=True)  # noqa
-    user_id = db.Column(db.Integer, primary_key=True)  # noqa
+    user_id = db.Column(db.Integer, primary_key=True, index=True)  # noqa
 
     __table_args__ = (
         UniqueConstraint(
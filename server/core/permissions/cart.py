@@ -1,73 +1,14 @@
-from functools import wraps
-
-from flask import request
-
-from sqlalchemy import and_
-
-from server.errors import errors
-from server.utils import jwt
-from server.errors import http_errors
+from server.core.enums import access
+from server.core.permissions.resource import ResourcePermission
 from server.core.models.db_models.cart import Cart, UserSharedEditCart
 
 
-def IsCartOwnerOrCanEdit(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        user_id = jwt.get_user_id()
-        cart_id = request.view_args.get("id")
-
-        if Cart.query.get(cart_id) is None:
-            e = errors.DbModelNotFoundException(
-                model=Cart,
-                id=cart_id
-            )
-            return http_errors.not_found(e)
-
-        is_user_owner = Cart.query.filter(
-            and_(
-                Cart.id == cart_id,
-                Cart.owner_user_id == user_id
-            )
-        ).count() == 1
-
-        can_user_edit = UserSharedEditCart.query.filter(
-            and_(
-                UserSharedEditCart.cart_id == cart_id,
-                UserSharedEditCart.user_id == user_id
-            )
-        ).count() == 1
-
-        if is_user_owner or can_user_edit:
-            return func(*args, **kwargs)
-
-        return http_errors.unauthorized()
-
-    return wrapper
-
-
-def IsCartOwner(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        user_id = jwt.get_user_id()
-        cart_id = request.view_args.get("id")
-
-        if Cart.query.get(cart_id) is None:
-            e = errors.DbModelNotFoundException(
-                model=Cart,
-                id=cart_id
-            )
-            return http_errors.not_found(e)
-
-        is_user_owner = Cart.query.filter(
-            and_(
-                Cart.id == cart_id,
-                Cart.owner_user_id == user_id
-            )
-        ).count() == 1
-
-        if is_user_owner:
-            return func(*args, **kwargs)
-
-        return http_errors.unauthorized()
+cart_permission = ResourcePermission(
+    model=Cart,
+    owner_column=Cart.owner_user_id,
+    acl_model=UserSharedEditCart,
+    acl_resource_column=UserSharedEditCart.cart_id
+)
 
-    return wrapper
+IsCartOwnerOrCanEdit = cart_permission.require(access.EDIT)
+IsCartOwner = cart_permission.require(access.OWNER)
@@ -1,48 +1,12 @@
-from functools import wraps
-
-from flask import request
-from flask_jwt_extended import get_jwt_identity
-from sqlalchemy import and_
-
-from server.errors import errors
+from server.core.enums import access, roles
+from server.core.permissions.resource import ResourcePermission
 from server.core.models.db_models.recipe import Recipe
-from server.errors import http_errors
-from server.core.enums import roles
-from server.core.permissions.general import unauthorized_error
-
-
-def IsRecipeCreatorOrAdminOrStaff(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        jwt_identity = get_jwt_identity()
-        recipe_id = request.view_args.get("id")
-        user_id = jwt_identity["id"]
-        user_roles = jwt_identity["roles"]
-
-        if Recipe.query.get(recipe_id) is None:
-            e = errors.DbModelNotFoundException(
-                model=Recipe,
-                id=recipe_id
-            )
-            return http_errors.not_found(e)
-
-        if roles.ADMIN in user_roles or roles.STAFF in user_roles:
-            return func(*args, **kwargs)
-
-        is_creator_user_count = Recipe.query.filter(
-            and_(
-                Recipe.id == recipe_id,
-                Recipe.creator_user_id == user_id
-            )
-        ).count()
 
-        if is_creator_user_count == 1:
-            return func(*args, **kwargs)
 
-        return http_errors.unauthorized(
-            unauthorized_error(
-                authorized_roles=[roles.ADMIN]
-            )
-        )
+recipe_permission = ResourcePermission(
+    model=Recipe,
+    owner_column=Recipe.creator_user_id,
+    privileged_roles=[roles.ADMIN, roles.STAFF]
+)
 
-    return wrapper
+IsRecipeCreatorOrAdminOrStaff = recipe_permission.require(access.OWNER)
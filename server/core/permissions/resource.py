@@ -0,0 +1,209 @@
+from typing import Any, Callable
+from functools import wraps
+
+from flask import request, g
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.model import Model
+from sqlalchemy import ColumnElement, and_, case, exists, inspect, or_, true
+from sqlalchemy.orm import InstrumentedAttribute
+
+from server.db import db
+from server.errors import errors
+from server.errors import http_errors
+from server.core.enums import access
+from server.caching.redis import api_access_cache
+from server.core.permissions.general import unauthorized_error
+
+
+class ResourcePermission:
+    """
+    Permission checks of a resource with an owner and optional ACL table.
+
+    The resource, its owner and the ACL entry of the user are resolved with
+    one LEFT JOIN query. The loaded resource is handed to the controller
+    (see get_permission_object), so it isn't queried again.
+
+    levels (server.core.enums.access):
+        OWNER:  owner of the resource
+        ACCESS: owner or shared with the user
+        EDIT:   owner or shared with the user with edit rights
+    """
+
+    def __init__(
+            self,
+            *,
+            model: Model,
+            owner_column: InstrumentedAttribute,
+            acl_model: Model = None,
+            acl_resource_column: InstrumentedAttribute = None,
+            acl_user_column: InstrumentedAttribute = None,
+            acl_can_edit_column: InstrumentedAttribute = None,
+            privileged_roles: list[str] = None
+    ) -> None:
+        """
+        acl_can_edit_column: None, if every ACL entry grants edit rights
+        privileged_roles: users with one of these roles pass every level
+        """
+        self._model = model
+        self._primary_key = inspect(model).primary_key[0]
+        self._owner_column = owner_column
+        self._acl_model = acl_model
+        self._acl_resource_column = acl_resource_column
+        self._acl_user_column = acl_user_column
+        self._acl_can_edit_column = acl_can_edit_column
+        self._privileged_roles = privileged_roles or []
+
+        if acl_model is not None and acl_user_column is None:
+            self._acl_user_column = acl_model.user_id
+
+    def require(self, level: str) -> Callable:
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                error_response = self.check(
+                    request.view_args.get("id"), level)
+                if error_response is not None:
+                    return error_response
+
+                return func(*args, **kwargs)
+
+            return wrapper
+        return decorator
+
+    def check(
+            self,
+            resource_id: Any,
+            level: str
+    ) -> tuple[dict, int] | None:
+        """
+        Permission check of the requesting user like require, for resource
+        ids, which are not the id of the route (like a field of the body).
+        Returns the error response, None if the user has the level.
+        """
+        jwt_identity = get_jwt_identity()
+        user_id = jwt_identity.get("id")
+
+        if api_access_cache.has_access(
+                self._model, resource_id, user_id, level):
+            return None
+
+        row = self._load(resource_id, user_id)
+        if row is None:
+            e = errors.DbModelNotFoundException(
+                model=self._model,
+                id=resource_id
+            )
+            return http_errors.not_found(e)
+
+        obj, acl_obj = row
+        set_permission_object(self._model, resource_id, obj)
+
+        if self._has_privileged_role(jwt_identity.get("roles", [])):
+            return None
+
+        if self._has_level(obj, acl_obj, user_id, level):
+            api_access_cache.set(self._model, resource_id, user_id, level)
+            return None
+
+        if self._privileged_roles:
+            return http_errors.unauthorized(
+                unauthorized_error(
+                    authorized_roles=self._privileged_roles
+                )
+            )
+
+        return http_errors.unauthorized()
+
+    def create_access_filter(self, user_id: int) -> ColumnElement:
+        """
+        Filter of the resources the user owns or which are shared with the
+        user, one EXISTS subquery instead of a UNION of two queries (so the
+        list can be paginated like any other query).
+        """
+        owner_filter = self._owner_column == user_id
+
+        if self._acl_model is None:
+            return owner_filter
+
+        return or_(owner_filter, self._create_acl_exists(user_id))
+
+    def create_role_expression(self, user_id: int) -> ColumnElement:
+        """
+        Role of the user (access.ROLE_*) for the resources of the
+        access filter.
+        """
+        if self._acl_model is None:
+            return case(
+                (self._owner_column == user_id, access.ROLE_OWNER),
+                else_=access.ROLE_VIEWER
+            )
+
+        can_edit_filter = true()
+        if self._acl_can_edit_column is not None:
+            can_edit_filter = self._acl_can_edit_column.is_(True)
+
+        return case(
+            (self._owner_column == user_id, access.ROLE_OWNER),
+            (self._create_acl_exists(user_id, can_edit_filter), access.ROLE_EDITOR),  # noqa
+            else_=access.ROLE_VIEWER
+        )
+
+    def _create_acl_exists(self, user_id: int, *filters) -> ColumnElement:
+        return exists().where(
+            self._acl_resource_column == self._primary_key,
+            self._acl_user_column == user_id,
+            *filters
+        )
+
+    def _load(self, resource_id: Any, user_id: int) -> tuple | None:
+        if self._acl_model is None:
+            obj = self._model.query \
+                .filter(self._primary_key == resource_id) \
+                .first()
+            return None if obj is None else (obj, None)
+
+        return db.session.query(self._model, self._acl_model) \
+            .outerjoin(
+                self._acl_model,
+                and_(
+                    self._acl_resource_column == self._primary_key,
+                    self._acl_user_column == user_id
+                )
+            ) \
+            .filter(self._primary_key == resource_id) \
+            .first()
+
+    def _has_level(
+            self,
+            obj: Model,
+            acl_obj: Model | None,
+            user_id: int,
+            level: str
+    ) -> bool:
+        if getattr(obj, self._owner_column.key) == user_id:
+            return True
+
+        if level == access.OWNER or acl_obj is None:
+            return False
+
+        if level == access.EDIT and self._acl_can_edit_column is not None:
+            return bool(getattr(acl_obj, self._acl_can_edit_column.key))
+
+        return True
+
+    def _has_privileged_role(self, user_roles: list[str]) -> bool:
+        return any(role in user_roles for role in self._privileged_roles)
+
+
+def set_permission_object(model: Model, id: Any, obj: Model) -> None:
+    if "permission_objects" not in g:
+        g.permission_objects = {}
+
+    g.permission_objects[(model, id)] = obj
+
+
+def get_permission_object(model: Model, id: Any) -> Model | None:
+    """
+    Object loaded by the permission check of the current request.
+    """
+    return g.get("permission_objects", {}).get((model, id))
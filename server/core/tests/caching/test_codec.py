@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from server.caching.codec import HEADER_FLAG, CacheCodec
+from server.caching.redis import api_cache
+
+
+def test_codec_roundtrip_uncompressed():
+    # given
+    codec = CacheCodec("orjson", "zlib", compression_threshold=1_024)
+    value = {"id": 1, "name": "RecipeName", "tags": [{"id": 2}]}
+
+    # when
+    encoded = codec.encode(value)
+    result_data = codec.decode(encoded)
+
+    # then
+    assert result_data == value
+    assert encoded[0] == HEADER_FLAG | (2 << 4) | 0
+
+
+def test_codec_roundtrip_compressed():
+    # given
+    codec = CacheCodec("json", "zlib", compression_threshold=1_024)
+    value = [{"name": "RecipeName", "description": "x" * 2_000}]
+
+    # when
+    encoded = codec.encode(value)
+    result_data = codec.decode(encoded)
+
+    # then
+    assert result_data == value
+    assert encoded[0] == HEADER_FLAG | (1 << 4) | 1
+    assert len(encoded) < len(json.dumps(value))
+
+
+def test_codec_decode_legacy_json():
+    # given
+    codec = CacheCodec()
+    value = {"id": 1, "name": "RecipeName"}
+
+    # when
+    result_data = codec.decode(json.dumps(value))
+
+    # then
+    assert result_data == value
+
+
+def test_codec_decode_legacy_json_with_whitespace():
+    # given
+    codec = CacheCodec()
+    value = {"id": 1, "name": "RecipeName"}
+
+    # when
+    result_data = codec.decode(" " + json.dumps(value))
+
+    # then
+    assert result_data == value
+
+
+def test_codec_decode_unknown_header():
+    # given
+    codec = CacheCodec()
+
+    # when
+    with pytest.raises(ValueError):
+        codec.decode(bytes([0xF0]) + b"{}")
+
+
+def test_codec_corrupt_value_is_a_miss(fake_redis):
+    # given
+    fake_redis.set("key-1", bytes([0xF0]) + b"{}")
+    fake_redis.set("key-2", b"{corrupt")
+    api_cache.set("key-3", {"id": 3})
+
+    # when
+    result_data = api_cache.get("key-1")
+    result_data_many = api_cache.get_many(["key-2", "key-3"])
+
+    # then
+    assert result_data is None
+    assert result_data_many == [None, {"id": 3}]
+    assert fake_redis.get("key-1") is None
+    assert fake_redis.get("key-2") is None
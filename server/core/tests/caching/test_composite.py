@@ -0,0 +1,165 @@
+from flask import Flask
+
+from server.db import db
+from server.caching.composite import caching_model_graph
+from server.core.models.db_models.unit import Unit
+from server.core.models.db_models.tag import Tag
+from server.core.models.db_models.category import Category
+from server.core.models.db_models.ingredient import Ingredient
+from server.core.models.db_models.recipe import (
+    Recipe, RecipeIngredient, RecipeTagComposite
+)
+from server.core.models.db_models.planner import (
+    RecipePlanner, RecipePlannerItem
+)
+from server.core.models.db_models.cart import Cart, UserSharedEditCart
+
+
+def create_recipes_with_tag() -> tuple[list[Recipe], Tag]:
+    category = Category(name="CategoryName")
+    tag = Tag(name="TagName")
+    db.session.add_all([category, tag])
+    db.session.flush()
+
+    recipes = [
+        Recipe(
+            name=f"RecipeName{i}",
+            person_count=4,
+            preperation_description="Description",
+            preperation_time_minutes=30,
+            difficulty="normal",
+            search_description="Search",
+            creator_user_id=1,
+            category_id=category.id
+        )
+        for i in range(3)
+    ]
+    recipes[0].tags = [tag]
+    recipes[2].tags = [tag]
+    db.session.add_all(recipes)
+    db.session.commit()
+
+    return recipes, tag
+
+
+def test_dependents_from_api_models(app: Flask):
+    with app.app_context():
+        # when
+        result_data = {
+            (dependency.root, ".".join(r.key for r in dependency.path or []))
+            for dependency in caching_model_graph.get_dependents(Unit)
+        }
+
+        # then
+        assert (Recipe, "ingredients.ingredient.unit") in result_data
+        assert all(root is not RecipePlanner for root, _ in result_data)
+        assert any(
+            dependency.root is Cart and dependency.path is None
+            for dependency in caching_model_graph.get_dependents(UserSharedEditCart)  # noqa
+        )
+
+
+def test_invalidation_tags_of_embedded_model(app: Flask):
+    with app.app_context():
+        # given
+        recipes, tag = create_recipes_with_tag()
+
+        # when
+        result_data = caching_model_graph.get_invalidation_tags(
+            Tag, (tag.id,), ["name"])
+
+        # then
+        # the planner items embed the tags with ?include=recipe.tags
+        assert result_data == {
+            "Tag",
+            "Collection",
+            "RecipePlannerItem",
+            "Recipe:ids",
+            "Recipe:responses",
+            f"Recipe:id={recipes[0].id}",
+            f"Recipe:id={recipes[2].id}",
+        }
+
+
+def test_invalidation_tags_of_association_model(app: Flask):
+    with app.app_context():
+        # given
+        recipes, tag = create_recipes_with_tag()
+
+        # when
+        result_data = caching_model_graph.get_invalidation_tags(
+            RecipeTagComposite, (recipes[2].id, tag.id))
+
+        # then
+        assert f"Recipe:id={recipes[2].id}" in result_data
+        assert f"Recipe:id={recipes[0].id}" not in result_data
+        assert "Recipe" not in result_data
+
+
+def test_invalidation_tags_of_normalized_model(app: Flask):
+    with app.app_context():
+        # given
+        recipes, _ = create_recipes_with_tag()
+        recipe_id = recipes[0].id
+
+        # when
+        result_data = caching_model_graph.get_invalidation_tags(
+            Recipe, (recipe_id,), ["person_count"])
+        result_data_list_field = caching_model_graph.get_invalidation_tags(
+            Recipe, (recipe_id,), ["name"])
+
+        # then
+        assert f"Recipe:id={recipe_id}" in result_data
+        assert "Recipe:ids" not in result_data
+        assert "Recipe:ids" in result_data_list_field
+        assert "Cart" in result_data
+
+
+def test_invalidation_tags_of_scoped_dependency(app: Flask):
+    with app.app_context():
+        # given
+        recipes, _ = create_recipes_with_tag()
+        unit = Unit(name="UnitName")
+        db.session.add(unit)
+        db.session.flush()
+        ingredient = Ingredient(
+            name="IngredientName",
+            displayname="Ingredient",
+            default_price=1.,
+            quantity_per_unit=1.,
+            is_spices=False,
+            search_description="Search",
+            unit_id=unit.id
+        )
+        planner = RecipePlanner(
+            name="RecipePlannerName", owner_user_id=1, is_active=True)
+        db.session.add_all([ingredient, planner])
+        db.session.flush()
+        db.session.add_all([
+            RecipeIngredient(
+                recipe_id=recipe.id, ingredient_id=ingredient.id, quantity=1)
+            for recipe in recipes[:2]
+        ] + [
+            RecipePlannerItem(
+                rplanner_id=planner.id,
+                recipe_id=recipes[0].id,
+                date="2024-01-01",
+                order_number=1,
+                planned_recipe_person_count=2
+            )
+        ])
+        db.session.commit()
+
+        # when
+        result_data_planned = caching_model_graph.get_invalidation_tags(
+            RecipeIngredient, (recipes[0].id, ingredient.id), ["quantity"])
+        result_data_unplanned = caching_model_graph.get_invalidation_tags(
+            RecipeIngredient, (recipes[1].id, ingredient.id), ["quantity"])
+
+        # then
+        # only the shopping lists of the planner with the recipe are dropped
+        assert f"RecipePlannerItem:RecipePlanner={planner.id}" in result_data_planned  # noqa
+        assert not any(
+            tag.startswith("RecipePlannerItem")
+            for tag in result_data_unplanned
+        )
@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+from server.caching import local
+from server.caching.local import LocalLRUCache
+
+
+def test_local_cache_evicts_least_recently_used():
+    # given
+    cache = LocalLRUCache(max_size=2, expiring_time=60)
+    cache.set("key-1", 1)
+    cache.set("key-2", 2)
+
+    # when
+    cache.get("key-1")
+    cache.set("key-3", 3)
+
+    # then
+    assert len(cache) == 2
+    assert cache.get("key-2") is None
+    assert cache.get("key-1") == 1
+    assert cache.get("key-3") == 3
+
+
+def test_local_cache_expires_entries(monkeypatch: pytest.MonkeyPatch):
+    # given
+    cache = LocalLRUCache(max_size=10, expiring_time=30)
+    cache.set("key", "value", tags=["tag"])
+    now = time.monotonic()
+
+    # when
+    monkeypatch.setattr(local.time, "monotonic", lambda: now + 29)
+    value_alive = cache.get("key")
+    monkeypatch.setattr(local.time, "monotonic", lambda: now + 31)
+    value_expired = cache.get("key")
+
+    # then
+    assert value_alive == "value"
+    assert value_expired is None
+    assert len(cache) == 0
+
+
+def test_local_cache_clear_tags():
+    # given
+    cache = LocalLRUCache(max_size=10, expiring_time=60)
+    cache.set("key-1", 1, tags=["tag-a"])
+    cache.set("key-2", 2, tags=["tag-a", "tag-b"])
+    cache.set("key-3", 3, tags=["tag-b"])
+
+    # when
+    cache.clear_tags(["tag-a"])
+
+    # then
+    assert cache.get("key-1") is None
+    assert cache.get("key-2") is None
+    assert cache.get("key-3") == 3
+
+
+def test_local_cache_rejects_value_read_before_invalidation():
+    # given
+    cache = LocalLRUCache(max_size=10, expiring_time=60)
+    generation = cache.generation
+
+    # when (the invalidation arrives, while the values are read from Redis)
+    cache.clear_tags(["tag-a"])
+    cache.set("key-1", "stale", tags=["tag-a"], generation=generation)
+    cache.set("key-2", "other", tags=["tag-b"], generation=generation)
+    cache.set("key-3", "fresh", tags=["tag-a"], generation=cache.generation)
+
+    # then
+    assert cache.get("key-1") is None
+    assert cache.get("key-2") == "other"
+    assert cache.get("key-3") == "fresh"
+
+
+def test_local_cache_rejects_value_read_before_clear():
+    # given
+    cache = LocalLRUCache(max_size=10, expiring_time=60)
+    generation = cache.generation
+
+    # when (the connection of the subscriber was lost)
+    cache.clear()
+    cache.set("key", "stale", tags=["tag"], generation=generation)
+
+    # then
+    assert cache.get("key") is None
@@ -0,0 +1,133 @@
+import time
+import socket
+
+from threading import Thread
+
+import pytest
+from redis import Redis
+
+import server.caching.redis as redis_caching
+from server.caching.redis import api_cache
+from server.caching.circuit_breaker import (
+    CircuitBreaker,
+    CLOSED,
+    OPEN,
+    HALF_OPEN
+)
+
+
+class DroppingServer:
+    """
+    Stand-in for Redis, which accepts connections and drops them at once.
+    """
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.bind(("127.0.0.1", 0))
+        self._socket.listen(16)
+        self.port = self._socket.getsockname()[1]
+        self._thread = Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:
+                return
+
+            self.connections += 1
+            connection.close()
+
+    def close(self) -> None:
+        self._socket.close()
+
+
+@pytest.fixture
+def dropping_server(monkeypatch: pytest.MonkeyPatch):
+    server = DroppingServer()
+    client = Redis(
+        host="127.0.0.1",
+        port=server.port,
+        socket_connect_timeout=0.1,
+        socket_timeout=0.1
+    )
+    monkeypatch.setattr(redis_caching, "redis", client)
+    monkeypatch.setattr(
+        redis_caching,
+        "redis_circuit_breaker",
+        CircuitBreaker(failure_threshold=3, reset_timeout=0.3)
+    )
+
+    yield server
+
+    server.close()
+
+
+def test_circuit_breaker_states():
+    # given
+    circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+
+    # when
+    circuit_breaker.record_failure()
+    state_below_threshold = circuit_breaker.state
+    circuit_breaker.record_failure()
+    state_open = circuit_breaker.state
+    is_allowed_open = circuit_breaker.allow_request()
+    time.sleep(0.15)
+    is_trial_allowed = circuit_breaker.allow_request()
+    is_second_trial_allowed = circuit_breaker.allow_request()
+    circuit_breaker.record_success()
+
+    # then
+    assert state_below_threshold == CLOSED
+    assert state_open == OPEN
+    assert not is_allowed_open
+    assert is_trial_allowed
+    assert not is_second_trial_allowed
+    assert circuit_breaker.state == CLOSED
+
+
+def test_redis_dropping_connections_opens_circuit(dropping_server: DroppingServer):  # noqa
+    # given
+    circuit_breaker = redis_caching.redis_circuit_breaker
+
+    # when
+    start = time.monotonic()
+    result_data = [api_cache.get(f"key{i}") for i in range(3)]
+    state = circuit_breaker.state
+    connections = dropping_server.connections
+
+    skipped_start = time.monotonic()
+    for i in range(100):
+        api_cache.get(f"key{i}")
+        api_cache.set(f"key{i}", {"id": i})
+    skipped_time = time.monotonic() - skipped_start
+
+    # then
+    assert result_data == [None, None, None]
+    assert time.monotonic() - start < 5
+    assert state == OPEN
+    assert dropping_server.connections == connections
+    assert skipped_time < 0.1
+    assert circuit_breaker.to_dict()["rejected_calls"] == 200
+
+
+def test_redis_circuit_half_open_trial(dropping_server: DroppingServer):
+    # given
+    circuit_breaker = redis_caching.redis_circuit_breaker
+    for i in range(3):
+        api_cache.get(f"key{i}")
+    connections = dropping_server.connections
+
+    # when
+    time.sleep(0.35)
+    state_after_cool_down = circuit_breaker.state
+    result_data = api_cache.get("key")
+
+    # then
+    assert state_after_cool_down == HALF_OPEN
+    assert result_data is None
+    assert dropping_server.connections > connections
+    assert circuit_breaker.state == OPEN
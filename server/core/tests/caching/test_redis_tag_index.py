@@ -0,0 +1,50 @@
+import time
+
+import server.caching.redis as redis_caching
+from server.caching.redis import api_cache
+
+
+def test_tag_index_prunes_expired_members(fake_redis, monkeypatch):
+    # given
+    index_key = api_cache.gen_tag_index_key("hot-tag")
+    api_cache.set("key-1", {"id": 1}, tags=["hot-tag"], ex=10)
+
+    # when (the first key is expired, the tag stays hot)
+    now = time.time()
+    monkeypatch.setattr(redis_caching.time, "time", lambda: now + 20)
+    api_cache.set("key-2", {"id": 2}, tags=["hot-tag"], ex=10)
+
+    # then
+    assert fake_redis.zrange(index_key, 0, -1) == [b"key-2"]
+
+
+def test_tag_index_expires_with_longest_member(fake_redis):
+    # given
+    index_key = api_cache.gen_tag_index_key("tag")
+
+    # when
+    api_cache.set("key-1", {"id": 1}, tags=["tag"], ex=100)
+    api_cache.set("key-2", {"id": 2}, tags=["tag"], ex=10)
+
+    # then (a shorter member does not shorten the index)
+    assert 90 < fake_redis.ttl(index_key) <= 100
+
+
+def test_clear_cache_tags(fake_redis, monkeypatch):
+    # given
+    index_key = api_cache.gen_tag_index_key("tag")
+    api_cache.set_many(
+        {"key-1": {"id": 1}, "key-2": {"id": 2}},
+        ex=10,
+        tags_by_key={"key-1": ["tag"], "key-2": ["tag"]}
+    )
+    api_cache.set("key-3", {"id": 3}, tags=["tag"], ex=100)
+
+    # when (key-1 and key-2 are expired)
+    now = time.time()
+    monkeypatch.setattr(redis_caching.time, "time", lambda: now + 20)
+    api_cache.clear_cache_tags(["tag"])
+
+    # then
+    assert fake_redis.get("key-3") is None
+    assert fake_redis.zcard(index_key) == 0
@@ -1,11 +1,14 @@
 # type: ignore
 import pytest
+import fakeredis
 
 from flask import Flask
 from flask.testing import FlaskClient
 from flask_jwt_extended import create_access_token
 
+import server.caching.redis as redis_caching
 from server.monolith import create_app
+from server.caching.circuit_breaker import CircuitBreaker
 from server.db import db
 from server.core.models.db_models.user import Role, User
 from server.core.enums import roles
@@ -95,3 +98,21 @@ def std_headers(app: Flask):
         headers = {"Authorization": f"Bearer {access_token}"}
 
     return headers
+
+
+@pytest.fixture()
+def fake_redis(monkeypatch: pytest.MonkeyPatch):
+    """
+    In-memory Redis (fakeredis) with a closed circuit breaker.
+    """
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(redis_caching, "redis", client)
+    monkeypatch.setattr(
+        redis_caching,
+        "redis_circuit_breaker",
+        CircuitBreaker(
+            failure_threshold=redis_caching.REDIS_FAILURE_THRESHOLD,
+            reset_timeout=redis_caching.REDIS_RESET_TIMEOUT
+        )
+    )
+    return client
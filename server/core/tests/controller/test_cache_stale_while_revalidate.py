@@ -0,0 +1,121 @@
+import time
+
+from threading import Event, current_thread
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import Flask
+
+import server.core.controller.crud_controller as crud_controller
+from server.caching.redis import api_cache
+from server.core.controller.crud_controller import AbstractRedisCache
+from server.core.models.db_models.unit import Unit
+
+
+REDIS_KEY = "swr-test-key"
+TAGS = ["swr-test-tag"]
+
+
+@pytest.fixture()
+def refresh_executor(monkeypatch: pytest.MonkeyPatch):
+    executor = ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(crud_controller, "cache_refresh_executor", executor)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def create_cache() -> AbstractRedisCache:
+    return AbstractRedisCache(
+        model=Unit,
+        use_caching=True,
+        cache_soft_ttl=10,
+        cache_hard_ttl=60
+    )
+
+
+def write_entry(data: str, stale_at: float) -> None:
+    api_cache.set(
+        REDIS_KEY, {"data": data, "stale_at": stale_at}, tags=TAGS, ex=60)
+
+
+def test_soft_expired_entry_is_served_stale_and_refreshed_once(
+        app: Flask,
+        fake_redis,
+        refresh_executor: ThreadPoolExecutor
+):
+    with app.test_request_context():
+        # given
+        cache = create_cache()
+        write_entry("stale", stale_at=time.time() - 1)
+
+        loads = []
+        is_refresh_released = Event()
+
+        def load_fn() -> str:
+            loads.append(1)
+            is_refresh_released.wait(timeout=5)
+            return "fresh"
+
+        # when
+        results = [
+            cache._get_or_load_key(load_fn, REDIS_KEY, TAGS)
+            for _ in range(5)
+        ]
+        is_refresh_released.set()
+        refresh_executor.shutdown(wait=True)
+
+        result_refreshed = cache._get_or_load_key(load_fn, REDIS_KEY, TAGS)
+
+        # then
+        assert results == ["stale"] * 5
+        assert len(loads) == 1
+        assert result_refreshed == "fresh"
+
+
+def test_fresh_entry_is_not_refreshed(
+        app: Flask,
+        fake_redis,
+        refresh_executor: ThreadPoolExecutor
+):
+    with app.test_request_context():
+        # given
+        cache = create_cache()
+        write_entry("cached", stale_at=time.time() + 10)
+        loads = []
+
+        # when
+        result = cache._get_or_load_key(
+            lambda: loads.append(1) or "loaded", REDIS_KEY, TAGS)
+        refresh_executor.shutdown(wait=True)
+
+        # then
+        assert result == "cached"
+        assert loads == []
+
+
+def test_hard_expired_entry_is_reloaded_inline(
+        app: Flask,
+        fake_redis,
+        refresh_executor: ThreadPoolExecutor
+):
+    with app.test_request_context():
+        # given
+        cache = create_cache()
+        write_entry("expired", stale_at=time.time() - 1)
+        fake_redis.pexpire(REDIS_KEY, 1)
+        time.sleep(0.01)
+
+        load_thread_names = []
+
+        def load_fn() -> str:
+            load_thread_names.append(current_thread().name)
+            return "loaded"
+
+        # when
+        result = cache._get_or_load_key(load_fn, REDIS_KEY, TAGS)
+        refresh_executor.shutdown(wait=True)
+
+        # then
+        assert result == "loaded"
+        assert load_thread_names == [current_thread().name]
+        assert api_cache.get(REDIS_KEY)["data"] == "loaded"
@@ -0,0 +1,122 @@
+from flask import Flask
+
+from server.db import db
+from server.core.controller.order_rank import ORDER_RANK_GAP, OrderRank
+from server.core.models.db_models.supermarket import (
+    Supermarket, SupermarketArea
+)
+
+
+order_rank = OrderRank(
+    model=SupermarketArea,
+    rank_column=SupermarketArea.order_number,
+    group_columns=[SupermarketArea.supermarket_id]
+)
+
+
+def create_areas(
+        order_numbers: list[int],
+        supermarket_name: str = "SupermarketName"
+) -> list[SupermarketArea]:
+    supermarket = Supermarket(
+        name=supermarket_name,
+        street="Street",
+        postcode="182923",
+        district="Berlin",
+        owner_user_id=1
+    )
+    db.session.add(supermarket)
+    db.session.flush()
+
+    areas = [
+        SupermarketArea(
+            name=f"AreaName{order_number}",
+            order_number=order_number,
+            supermarket_id=supermarket.id
+        )
+        for order_number in order_numbers
+    ]
+    db.session.add_all(areas)
+    db.session.commit()
+
+    return areas
+
+
+def get_ordered_ids() -> list[int]:
+    areas = SupermarketArea.query.order_by(SupermarketArea.order_number)
+    return [area.id for area in areas]
+
+
+def test_order_rank_move_takes_middle_of_neighbours(app: Flask):
+    with app.app_context():
+        # given
+        areas = create_areas(
+            [ORDER_RANK_GAP, 2 * ORDER_RANK_GAP, 3 * ORDER_RANK_GAP])
+
+        # when
+        order_rank.move(areas[0], 3)
+        db.session.commit()
+        rank_end = areas[0].order_number
+
+        order_rank.move(areas[0], 2)
+        db.session.commit()
+        rank_middle = areas[0].order_number
+
+        # then
+        assert rank_end == 4 * ORDER_RANK_GAP
+        assert rank_middle == (5 * ORDER_RANK_GAP) // 2
+        assert get_ordered_ids() == [areas[1].id, areas[0].id, areas[2].id]
+
+
+def test_order_rank_move_rebalances_without_gap(app: Flask):
+    with app.app_context():
+        # given
+        areas = create_areas([1, 2, 3])
+
+        # when
+        order_rank.move(areas[2], 2)
+        db.session.commit()
+
+        # then
+        assert get_ordered_ids() == [areas[0].id, areas[2].id, areas[1].id]
+        assert areas[0].order_number == ORDER_RANK_GAP
+        assert areas[1].order_number == 2 * ORDER_RANK_GAP
+        assert areas[2].order_number == (3 * ORDER_RANK_GAP) // 2
+
+
+def test_order_rank_rank_for_insert(app: Flask):
+    with app.app_context():
+        # given
+        areas = create_areas([ORDER_RANK_GAP, 2 * ORDER_RANK_GAP])
+        group_values = {"supermarket_id": areas[0].supermarket_id}
+
+        # when
+        rank_first = order_rank.rank_for_insert(group_values, 1)
+        rank_middle = order_rank.rank_for_insert(group_values, 2)
+        rank_end = order_rank.rank_for_insert(group_values, 5)
+
+        # then
+        assert rank_first == ORDER_RANK_GAP // 2
+        assert rank_middle == (3 * ORDER_RANK_GAP) // 2
+        assert rank_end == 3 * ORDER_RANK_GAP
+        assert [area.position for area in areas] == [1, 2]
+
+
+def test_order_rank_load_positions(app: Flask):
+    with app.app_context():
+        # given
+        areas = create_areas(
+            [3 * ORDER_RANK_GAP, ORDER_RANK_GAP, 2 * ORDER_RANK_GAP])
+        other_areas = create_areas([4 * ORDER_RANK_GAP], "OtherName")
+        page_ids = [areas[0].id, other_areas[0].id]
+        db.session.expunge_all()
+
+        # when
+        page = SupermarketArea.query \
+            .filter(SupermarketArea.id.in_(page_ids)) \
+            .order_by(SupermarketArea.id) \
+            .all()
+        order_rank.load_positions(page)
+
+        # then
+        assert [area.position for area in page] == [3, 1]
@@ -0,0 +1,103 @@
+import json
+import pytest
+
+from pathlib import Path
+from flask import Flask
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert
+
+from server.db import get_replica_engine
+from server.db_routing import replica_router
+from server.monolith import create_app
+from server.migrations.migrator import schema_migrator
+from server.core.enums import roles
+from server.core.models.db_models.unit import Unit
+
+
+ROUTE = "/api/v1/unit/"
+
+
+@pytest.fixture()
+def replica_app(tmp_path: Path):
+    app = create_app(
+        database_uri=f"sqlite:///{tmp_path / 'primary.db'}",
+        replica_database_uri=f"sqlite:///{tmp_path / 'replica.db'}"
+    )
+    with app.app_context():
+        schema_migrator.upgrade(get_replica_engine())
+
+        # only in the replica, so reads from the replica can be told apart
+        with get_replica_engine().begin() as connection:
+            connection.execute(insert(Unit), [{"name": "replica"}])
+
+    yield app
+
+
+@pytest.fixture()
+def staff_headers(replica_app: Flask):
+    with replica_app.app_context():
+        identity = {"id": 1, "username": "StaffUser", "roles": [roles.STAFF]}
+        access_token = create_access_token(identity=identity)
+
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+def get_unit_names(client, headers: dict) -> list[str]:
+    response = client.get(ROUTE, headers=headers)
+    assert response.status_code == 200
+    return [unit["name"] for unit in json.loads(response.data)]
+
+
+def test_db_routing_reads_from_replica(
+        replica_app: Flask,
+        staff_headers: dict
+):
+    # given
+    client = replica_app.test_client()
+
+    # when
+    unit_names = get_unit_names(client, staff_headers)
+
+    # then
+    assert unit_names == ["replica"]
+
+
+def test_db_routing_reads_after_write_stay_on_primary(
+        replica_app: Flask,
+        staff_headers: dict,
+        monkeypatch: pytest.MonkeyPatch
+):
+    # given
+    client = replica_app.test_client()
+    monkeypatch.setattr(replica_router, "_local_sticky", {})
+
+    # when
+    response = client.post(ROUTE, headers=staff_headers, json={"name": "primary"})  # noqa
+    unit_names_sticky = get_unit_names(client, staff_headers)
+
+    monkeypatch.setattr(replica_router, "_local_sticky", {})
+    unit_names_after_sticky = get_unit_names(client, staff_headers)
+
+    # then
+    assert response.status_code == 201
+    assert unit_names_sticky == ["primary"]
+    assert unit_names_after_sticky == ["replica"]
+
+
+def test_db_routing_write_makes_embedding_tables_sticky(
+        replica_app: Flask,
+        staff_headers: dict,
+        monkeypatch: pytest.MonkeyPatch
+):
+    # given
+    client = replica_app.test_client()
+    monkeypatch.setattr(replica_router, "_local_sticky", {})
+
+    # when
+    response = client.post(ROUTE, headers=staff_headers, json={"name": "primary"})  # noqa
+
+    # then
+    assert response.status_code == 201
+    # the ingredients embed their unit
+    assert "table:unit" in replica_router._local_sticky
+    assert "table:ingredient" in replica_router._local_sticky
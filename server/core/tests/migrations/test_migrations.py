@@ -0,0 +1,168 @@
+from datetime import datetime
+
+from sqlalchemy import Engine, create_engine, inspect, select
+
+from server.db import db
+from server.errors import errors
+from server.migrations.migrator import schema_migrator, schema_version
+from server.migrations.revisions import r0001_baseline
+from server.core.models.db_models.planner import (
+    RecipePlanner, UserSharedRecipePlanner
+)
+
+
+def create_legacy_engine() -> Engine:
+    """
+    Database created by db.create_all() before the migrations, without the
+    indexes of the hot query paths.
+    """
+    engine = create_engine("sqlite://")
+    db.metadata.create_all(engine)
+
+    with engine.begin() as connection:
+        schema_version.drop(connection)
+        for table_name in inspect(connection).get_table_names():
+            for index in inspect(connection).get_indexes(table_name):
+                if index["name"].startswith("ix_"):
+                    connection.exec_driver_sql(f"DROP INDEX {index['name']}")
+
+    return engine
+
+
+def create_baseline_engine() -> Engine:
+    """
+    Database with the tables of the baseline revision only.
+    """
+    engine = create_engine("sqlite://")
+
+    with engine.begin() as connection:
+        schema_version.create(connection)
+        r0001_baseline.upgrade(connection)
+        connection.execute(schema_version.insert().values(
+            revision=r0001_baseline.revision,
+            applied_at=datetime.utcnow()
+        ))
+
+    return engine
+
+
+def explain(engine: Engine, query) -> str:
+    sql = str(query.compile(
+        dialect=engine.dialect,
+        compile_kwargs={"literal_binds": True}
+    ))
+
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()
+
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_migrations_upgrade_empty_database():
+    # given
+    engine = create_engine("sqlite://")
+
+    # when
+    applied_revisions = schema_migrator.upgrade(engine)
+    applied_revisions_again = schema_migrator.upgrade(engine)
+
+    with engine.connect() as connection:
+        is_current = schema_migrator.is_current(connection)
+        index_names = {
+            index["name"]
+            for index in inspect(connection).get_indexes("rplanner_item")
+        }
+        recipe_column_names = {
+            column["name"]
+            for column in inspect(connection).get_columns("recipe")
+        }
+        table_names = inspect(connection).get_table_names()
+
+    # then
+    assert applied_revisions == ["0001", "0002", "0003", "0004"]
+    assert applied_revisions_again == []
+    assert is_current
+    assert "ix_rplanner_item_rplanner_id_date" in index_names
+    assert {"rating_sum", "rating_count"} <= recipe_column_names
+    assert "recipe_search" in table_names
+
+
+def test_migrations_check_schema_without_migrate():
+    # given
+    engine = create_legacy_engine()
+
+    # when
+    try:
+        schema_migrator.check_schema(engine, migrate=False)
+        raised = False
+    except errors.DbSchemaOutdatedException:
+        raised = True
+
+    # then
+    assert raised
+
+
+def test_migrations_owner_and_shared_list_query_plans():
+    # given
+    engine = create_legacy_engine()
+    query_owner = select(RecipePlanner) \
+        .where(RecipePlanner.owner_user_id == 1)
+    query_shared = select(RecipePlanner) \
+        .join(UserSharedRecipePlanner) \
+        .where(UserSharedRecipePlanner.user_id == 1)
+
+    plan_owner_before = explain(engine, query_owner)
+    plan_shared_before = explain(engine, query_shared)
+
+    # when
+    schema_migrator.check_schema(engine, migrate=True)
+
+    plan_owner_after = explain(engine, query_owner)
+    plan_shared_after = explain(engine, query_shared)
+
+    # then
+    assert "SCAN rplanner" in plan_owner_before
+    assert "ix_rplanner_user_user_id" not in plan_shared_before
+
+    assert "SEARCH rplanner USING INDEX ix_rplanner_owner_user_id" in plan_owner_after  # noqa
+    assert "SEARCH rplanner_user USING INDEX ix_rplanner_user_user_id" in plan_shared_after  # noqa
+
+
+def test_migrations_backfill_recipe_rating_aggregate():
+    # given
+    engine = create_baseline_engine()
+    tables = r0001_baseline.metadata.tables
+
+    with engine.begin() as connection:
+        connection.execute(tables["category"].insert(), [{"id": 1, "name": "Dessert"}])  # noqa
+        connection.execute(tables["recipe"].insert(), [
+            {
+                "id": id,
+                "name": f"Recipe {id}",
+                "person_count": 2,
+                "preperation_description": "Description",
+                "preperation_time_minutes": 30,
+                "difficulty": "normal",
+                "search_description": "Search",
+                "creator_user_id": 1,
+                "category_id": 1
+            }
+            for id in [1, 2]
+        ])
+        connection.execute(tables["recipe_rating"].insert(), [
+            {"user_id": 1, "recipe_id": 1, "rating": 4.},
+            {"user_id": 2, "recipe_id": 1, "rating": 3.},
+            {"user_id": 3, "recipe_id": 1, "rating": 2.5},
+        ])
+
+    # when
+    applied_revisions = schema_migrator.upgrade(engine)
+
+    with engine.connect() as connection:
+        rating_aggregates = connection.exec_driver_sql(
+            "SELECT id, rating_sum, rating_count FROM recipe ORDER BY id"
+        ).all()
+
+    # then
+    assert applied_revisions == ["0002", "0003", "0004"]
+    assert rating_aggregates == [(1, 9.5, 3), (2, 0., 0)]
@@ -0,0 +1,157 @@
+from flask import Flask
+
+from server.db import db
+from server.search.recipe_search import recipe_search
+from server.search.backends import InMemorySearchBackend
+from server.core.models.db_models.tag import Tag
+from server.core.models.db_models.category import Category
+from server.core.models.db_models.recipe import Recipe
+
+
+def create_document(name: str, tags: str = "", description: str = "") -> dict:
+    return {
+        "name": name,
+        "tags": tags,
+        "ingredients": "",
+        "category": "",
+        "search_description": description,
+        "preperation_description": "",
+    }
+
+
+def create_recipes() -> tuple[list[Recipe], Tag]:
+    category = Category(name="Hauptgericht")
+    tag = Tag(name="Vegetarisch")
+    db.session.add_all([category, tag])
+    db.session.flush()
+
+    recipes = [
+        Recipe(
+            name=name,
+            person_count=4,
+            preperation_description="Description",
+            preperation_time_minutes=30,
+            difficulty="normal",
+            search_description=search_description,
+            creator_user_id=1,
+            category_id=category.id
+        )
+        for name, search_description in [
+            ("Spaghetti Bolognese", "Nudeln mit Tomatensauce"),
+            ("Tomatensuppe", "Suppe mit Spaghetti"),
+            ("Crème brûlée", "Dessert"),
+        ]
+    ]
+    recipes[1].tags = [tag]
+    db.session.add_all(recipes)
+    db.session.commit()
+
+    return recipes, tag
+
+
+def test_recipe_search_prefix_multi_word_relevance(app: Flask):
+    with app.app_context():
+        # given
+        recipes, _ = create_recipes()
+
+        # when
+        result_prefix = recipe_search.search("spag")
+        result_multi_word = recipe_search.search("SPAG tomat")
+        result_tag = recipe_search.search("vegetar hauptgericht")
+        result_diacritics = recipe_search.search("creme")
+        result_no_match = recipe_search.search("spag dessert")
+        result_no_words = recipe_search.search(" %- ")
+
+        # then
+        assert result_prefix == [recipes[0].id, recipes[1].id]
+        assert result_multi_word == [recipes[0].id, recipes[1].id]
+        assert result_tag == [recipes[1].id]
+        assert result_diacritics == [recipes[2].id]
+        assert result_no_match == []
+        assert result_no_words is None
+
+
+def test_recipe_search_synced_on_writes(app: Flask):
+    with app.app_context():
+        # given
+        recipes, tag = create_recipes()
+        recipe_ids = [recipe.id for recipe in recipes]
+
+        # when
+        tag.name = "Veggie"
+        recipes[2].name = "Pannacotta"
+        db.session.delete(recipes[0])
+        db.session.commit()
+
+        # then
+        assert recipe_search.search("vegetarisch") == []
+        assert recipe_search.search("veggie") == [recipe_ids[1]]
+        assert recipe_search.search("panna") == [recipe_ids[2]]
+        assert recipe_search.search("bolognese") == []
+
+
+def test_recipe_search_rollback_keeps_index(app: Flask):
+    with app.app_context():
+        # given
+        recipes, _ = create_recipes()
+
+        # when
+        recipes[1].name = "Kartoffelsuppe"
+        db.session.flush()
+        db.session.rollback()
+
+        # then
+        assert recipe_search.search("kartoffel") == []
+        assert recipe_search.search("tomatensuppe") == [recipes[1].id]
+
+
+def test_in_memory_search_backend():
+    # given
+    backend = InMemorySearchBackend(max_age=60)
+    backend._built_at = float("inf")
+    backend.upsert(None, {
+        1: create_document("Tomatensuppe", description="Suppe"),
+        2: create_document("Nudeln", tags="Tomate"),
+        3: create_document("Tomate Mozzarella", description="Salat"),
+    })
+
+    # when
+    result_exact_first = backend.search(None, ["tomate"], limit=10)
+    result_multi_word = backend.search(None, ["tomat", "sal"], limit=10)
+    result_limit = backend.search(None, ["tomate"], limit=1)
+    backend.remove(None, [3])
+    result_removed = backend.search(None, ["mozz"], limit=10)
+
+    # then
+    assert result_exact_first == [3, 1, 2]
+    assert result_multi_word == [3]
+    assert result_limit == [3]
+    assert result_removed == []
+
+
+def test_in_memory_search_backend_rebuilds_in_background(app: Flask):
+    with app.app_context():
+        # given
+        recipes, _ = create_recipes()
+        backend = InMemorySearchBackend(max_age=60)
+        with db.engine.connect() as connection:
+            backend.rebuild(connection)
+
+        # changes of another process, only picked up by the rebuild
+        with db.engine.begin() as connection:
+            connection.execute(
+                Recipe.__table__.update()
+                .where(Recipe.id == recipes[2].id)
+                .values(name="Pannacotta")
+            )
+        backend._built_at -= 60
+
+        # when
+        with db.engine.connect() as connection:
+            result_stale = backend.search(connection, ["panna"], limit=10)
+            backend._rebuild_thread.join()
+            result_rebuilt = backend.search(connection, ["panna"], limit=10)
+
+        # then
+        assert result_stale == []
+        assert result_rebuilt == [recipes[2].id]
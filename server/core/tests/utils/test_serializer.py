@@ -0,0 +1,166 @@
+import json
+from datetime import date
+
+import pytest
+from flask import Flask
+from flask_restx import Model, fields, marshal
+from flask_restx.fields import MarshallingError
+
+from server.db import db
+from server.utils.serializer import compile_serializer, serialize
+from server.core.models.db_models.unit import Unit
+from server.core.models.db_models.tag import Tag
+from server.core.models.db_models.category import Category
+from server.core.models.db_models.ingredient import Ingredient
+from server.core.models.db_models.recipe import (
+    Recipe, RecipeImage, RecipeIngredient
+)
+from server.core.models.db_models.planner import (
+    RecipePlanner, RecipePlannerItem
+)
+from server.core.models.api_models.recipe import (
+    recipe_model, recipe_model_detail
+)
+from server.core.models.api_models.planner import recipe_planner_item_model
+
+
+def create_recipe() -> Recipe:
+    unit = Unit(name="gramm")
+    category = Category(name="Hauptgericht")
+    db.session.add_all([unit, category])
+    db.session.flush()
+
+    ingredient = Ingredient(
+        name="IngredientName",
+        displayname="Ingredient",
+        default_price=1.99,
+        quantity_per_unit=500.,
+        is_spices=False,
+        search_description="Ingredient search description",
+        unit_id=unit.id
+    )
+    recipe = Recipe(
+        name="RecipeName",
+        person_count=4,
+        preperation_description="Preparation",
+        preperation_time_minutes=45,
+        difficulty="normal",
+        search_description="Pasta tomato",
+        creator_user_id=1,
+        category_id=category.id
+    )
+    recipe.tags = [Tag(name="TagName1"), Tag(name="TagName2")]
+    recipe.images = [RecipeImage(path="/images/recipe.png")]
+    db.session.add_all([ingredient, recipe])
+    db.session.flush()
+
+    db.session.add(
+        RecipeIngredient(
+            recipe_id=recipe.id,
+            ingredient_id=ingredient.id,
+            quantity=100
+        )
+    )
+    db.session.commit()
+
+    return recipe
+
+
+def assert_same_output(data, api_model):
+    expected_data = json.dumps(marshal(data, api_model))
+    result_data = json.dumps(serialize(data, api_model))
+
+    assert result_data == expected_data
+
+
+def test_serialize_recipe(app: Flask):
+    with app.app_context():
+        # given
+        recipe = create_recipe()
+
+        # then
+        assert_same_output(recipe, recipe_model_detail)
+        assert_same_output([recipe, recipe], recipe_model)
+        assert_same_output(None, recipe_model_detail)
+        assert_same_output({"id": "1", "tags": None}, recipe_model_detail)
+
+
+def test_serialize_planner_items(app: Flask):
+    with app.app_context():
+        # given
+        recipe = create_recipe()
+        planner = RecipePlanner(
+            name="PlannerName",
+            owner_user_id=1,
+            is_active=True
+        )
+        db.session.add(planner)
+        db.session.flush()
+
+        db.session.add_all([
+            RecipePlannerItem(
+                rplanner_id=planner.id,
+                recipe_id=recipe.id,
+                date=str(date(2024, 1, day)),
+                label="Abendessen",
+                order_number=1,
+                planned_recipe_person_count=2
+            )
+            for day in range(1, 8)
+        ])
+        db.session.commit()
+
+        # then
+        assert_same_output(RecipePlannerItem.query.all(), recipe_planner_item_model)  # noqa
+
+
+def test_serialize_field_options():
+    # given
+    child_model = Model("SerializerChildModel", {
+        "id": fields.Integer(default=0),
+        "name": fields.String(attribute="title")
+    })
+    api_model = Model("SerializerModel", {
+        "count": fields.Integer(default=5),
+        "price": fields.Float,
+        "active": fields.Boolean,
+        "day": fields.Date,
+        "title": fields.String(attribute="child.title"),
+        "child": fields.Nested(child_model, allow_null=True),
+        "fallback": fields.Nested(child_model, default={"id": -1}),
+        "children": fields.List(fields.Nested(child_model)),
+        "ids": fields.List(fields.Integer),
+        "group": {"raw": fields.Raw, "url": fields.Raw(default="none")}
+    })
+    data = [
+        {
+            "count": None,
+            "price": "1.5",
+            "active": "true",
+            "day": date(2024, 1, 1),
+            "child": {"id": 1, "title": "ChildName"},
+            "children": ({"title": "A"}, None),
+            "ids": [1, "2"],
+            "raw": {"any": "value"}
+        },
+        {"children": {"id": 3}}
+    ]
+
+    # then
+    assert_same_output(data, api_model)
+
+
+def test_serialize_format_error():
+    # given
+    api_model = Model("SerializerErrorModel", {"id": fields.Integer})
+
+    # when
+    with pytest.raises(MarshallingError) as expected_error:
+        marshal({"id": "id"}, api_model)
+
+    with pytest.raises(MarshallingError) as error:
+        serialize({"id": "id"}, api_model)
+
+    # then
+    assert str(error.value) == str(expected_error.value)
+    assert compile_serializer(api_model) is compile_serializer(api_model)
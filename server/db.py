@@ -1,4 +1,31 @@
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Engine
 
 
-db = SQLAlchemy()
+# engine of the optional read replica (see server.db_routing)
+REPLICA_ENGINE_KEY = "sqlalchemy_replica_engine"
+USE_REPLICA_KEY = "use_replica"
+
+
+def get_replica_engine() -> Engine | None:
+    return current_app.extensions.get(REPLICA_ENGINE_KEY)
+
+
+class RoutingSession(Session):
+    """
+    Sends the queries of the session to the replica engine, while the
+    session is flagged for replica reads. Flushes always use the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.info.get(USE_REPLICA_KEY) and not self._flushing:  # noqa
+            replica_engine = get_replica_engine()
+            if replica_engine is not None:
+                return replica_engine
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)  # noqa
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
@@ -0,0 +1,179 @@
+import os
+import time
+
+from contextlib import contextmanager
+from threading import Lock
+
+from flask import Flask, has_app_context, has_request_context
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.model import Model
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from server.db import (
+    db, get_replica_engine, REPLICA_ENGINE_KEY, USE_REPLICA_KEY, RoutingSession
+)
+from server.caching.composite import caching_model_graph
+from server.caching.redis import DbPrimaryStickyCache, db_primary_sticky_cache
+
+
+SQLALCHEMY_REPLICA_DATABASE_URI = os.environ.get("SQLALCHEMY_REPLICA_DATABASE_URI")  # noqa
+# reads of the user and the written tables stay on the primary after a write
+DB_REPLICA_STICKY_SECONDS = float(os.environ.get("DB_REPLICA_STICKY_SECONDS", 5))  # noqa
+
+WRITTEN_TABLES_KEY = "replica_router_written_tables"
+
+
+class ReplicaRouter:
+    """
+    Read/write splitting: the GET handlers of BaseCrudController read from
+    the optional replica, everything else uses the primary.
+
+    Read-your-writes: after a commit with writes, the user, the written
+    tables and the tables of the cached models embedding them (see
+    caching_model_graph) are sticky for sticky_seconds, their reads stay on
+    the primary (marked in this process and in Redis for the other
+    workers). So a cached response is never rebuilt from a replica lagging
+    behind the write, which invalidated the cache.
+    """
+
+    def __init__(
+            self,
+            sticky_seconds: float,
+            sticky_cache: DbPrimaryStickyCache
+    ) -> None:
+        self._sticky_seconds = sticky_seconds
+        self._sticky_cache = sticky_cache
+        self._local_sticky: dict[str, float] = {}
+        self._lock = Lock()
+
+    def init_app(self, app: Flask, replica_database_uri: str = None) -> None:
+        """
+        Creates the engine of the replica, if an uri is configured. It isn't
+        a bind of db, so create_all / drop_all never touch the replica.
+        """
+        replica_database_uri = replica_database_uri or SQLALCHEMY_REPLICA_DATABASE_URI  # noqa
+        if replica_database_uri is None:
+            return
+
+        app.extensions[REPLICA_ENGINE_KEY] = create_engine(
+            replica_database_uri, pool_pre_ping=True)
+
+    def register(self) -> None:
+        event.listen(RoutingSession, "after_flush", self._after_flush)
+        event.listen(RoutingSession, "do_orm_execute", self._do_orm_execute)
+        event.listen(RoutingSession, "after_commit", self._after_commit)
+        event.listen(RoutingSession, "after_rollback", self._after_rollback)
+
+    @contextmanager
+    def reads(self, model: Model):
+        """
+        Queries of the block read from the replica, if there is one and
+        neither the user nor the table of the model are sticky.
+        """
+        session = db.session()
+        previous_use_replica = session.info.get(USE_REPLICA_KEY, False)
+
+        session.info[USE_REPLICA_KEY] = (
+            _has_replica() and
+            not self.is_sticky(self._create_sticky_keys([model.__table__.name]))  # noqa
+        )
+        try:
+            yield
+        finally:
+            session.info[USE_REPLICA_KEY] = previous_use_replica
+
+    def is_sticky(self, keys: list[str]) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if any(self._local_sticky.get(key, 0) > now for key in keys):
+                return True
+
+        return self._sticky_cache.is_marked(keys)
+
+    def mark_sticky(self, keys: list[str]) -> None:
+        expires_at = time.monotonic() + self._sticky_seconds
+        with self._lock:
+            self._local_sticky = {
+                key: key_expires_at
+                for key, key_expires_at in self._local_sticky.items()
+                if key_expires_at > time.monotonic()
+            }
+            self._local_sticky.update({key: expires_at for key in keys})
+
+        self._sticky_cache.mark(keys, self._sticky_seconds)
+
+    # protected
+    def _after_flush(self, session: Session, flush_context) -> None:
+        tables = session.info.setdefault(WRITTEN_TABLES_KEY, set())
+        for obj in [*session.new, *session.dirty, *session.deleted]:
+            tables.add(inspect(obj).mapper.local_table.name)
+
+    # protected
+    def _do_orm_execute(self, orm_execute_state: ORMExecuteState) -> None:
+        if not (orm_execute_state.is_insert or
+                orm_execute_state.is_update or
+                orm_execute_state.is_delete):
+            return
+
+        tables = orm_execute_state.session.info.setdefault(
+            WRITTEN_TABLES_KEY, set())
+        tables.add(orm_execute_state.statement.table.name)
+
+    # protected
+    def _after_commit(self, session: Session) -> None:
+        tables = session.info.pop(WRITTEN_TABLES_KEY, set())
+        if tables and _has_replica():
+            self.mark_sticky(self._create_sticky_keys(
+                tables | self._get_dependent_tables(tables)))
+
+    # protected
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop(WRITTEN_TABLES_KEY, None)
+
+    # protected
+    def _get_dependent_tables(self, tables: set[str]) -> set[str]:
+        """
+        Tables of the cached models, which embed rows of the written tables
+        (like the ingredients embedding their unit).
+        """
+        return {
+            dependency.root.__table__.name
+            for mapper in db.Model.registry.mappers
+            if mapper.local_table.name in tables
+            for dependency in caching_model_graph.get_dependents(mapper.class_)  # noqa
+        }
+
+    # protected
+    def _create_sticky_keys(self, tables: list[str]) -> list[str]:
+        keys = [f"table:{table}" for table in tables]
+
+        user_id = _get_request_user_id()
+        if user_id is not None:
+            keys.append(f"uid:{user_id}")
+
+        return keys
+
+
+def _has_replica() -> bool:
+    return has_app_context() and get_replica_engine() is not None
+
+
+def _get_request_user_id() -> int | None:
+    if not has_request_context():
+        return None
+
+    try:
+        jwt_identity = get_jwt_identity()
+    except RuntimeError:
+        # no verified token in this request
+        return None
+
+    return jwt_identity.get("id") if isinstance(jwt_identity, dict) else None
+
+
+replica_router = ReplicaRouter(
+    sticky_seconds=DB_REPLICA_STICKY_SECONDS,
+    sticky_cache=db_primary_sticky_cache
+)
+replica_router.register()
@@ -211,3 +211,13 @@ class ReadOnlyFieldInPayloadException(Exception):
     def __init__(self, fieldname) -> None:
         err_msg = f"The field '{fieldname}' is read only. Please remove this field from payload."  # noqa
         super().__init__(err_msg)
+
+
+class DbSchemaOutdatedException(Exception):
+    """
+    When the database schema misses revisions of server.migrations.
+    """
+
+    def __init__(self, pending_revisions: list[str]) -> None:
+        err_msg = f"The database schema is outdated, pending revisions: {pending_revisions}. Run 'python -m server.migrations upgrade'."  # noqa
+        super().__init__(err_msg)
@@ -0,0 +1,59 @@
+"""
+Database migrations of a service, e.g. before a deployment with
+DB_MIGRATE_ON_STARTUP=false.
+
+    python -m server.migrations check --service recipe
+    python -m server.migrations upgrade --service recipe
+"""
+import os
+import sys
+import argparse
+import importlib
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+
+from server.migrations.migrator import schema_migrator
+
+
+load_dotenv()
+
+# the service module imports the models (tables) of the service
+SERVICE_MODULES = {
+    "monolith": "server.monolith",
+    "auth": "server.services.auth.service",
+    "recipe": "server.services.recipe.service",
+}
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description="Database migrations.")
+    parser.add_argument("command", choices=["check", "upgrade"])
+    parser.add_argument(
+        "--service", choices=list(SERVICE_MODULES), default="monolith")
+    parser.add_argument(
+        "--database-uri",
+        default=os.environ.get("SQLALCHEMY_DATABASE_URI")
+    )
+    return parser.parse_args()
+
+
+def run_migrations():
+    args = get_args()
+    importlib.import_module(SERVICE_MODULES[args.service])
+    engine = create_engine(args.database_uri)
+
+    if args.command == "upgrade":
+        applied_revisions = schema_migrator.upgrade(engine)
+        print(f"Applied revisions: {applied_revisions}")
+        return
+
+    with engine.connect() as connection:
+        pending_revisions = schema_migrator.get_pending_revisions(connection)
+
+    print(f"Pending revisions: {pending_revisions}")
+    sys.exit(1 if len(pending_revisions) > 0 else 0)
+
+
+if __name__ == "__main__":
+    run_migrations()
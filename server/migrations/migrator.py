@@ -0,0 +1,109 @@
+import os
+
+from datetime import datetime
+from types import ModuleType
+
+from sqlalchemy import Connection, Engine, inspect, select
+
+from server.db import db
+from server.errors import errors
+from server.logger import logger
+from server.migrations.revisions import (
+    r0001_baseline, r0002_hot_path_indexes, r0003_recipe_rating_aggregate,
+    r0004_recipe_search_index
+)
+
+
+# upgrade pending revisions at startup, otherwise the startup fails
+DB_MIGRATE_ON_STARTUP = os.environ.get("DB_MIGRATE_ON_STARTUP", "true").lower() == "true"  # noqa
+
+SCHEMA_VERSION_TABLE = "schema_version"
+
+# ordered, a revision is applied once
+REVISIONS = [
+    r0001_baseline,
+    r0002_hot_path_indexes,
+    r0003_recipe_rating_aggregate,
+    r0004_recipe_search_index,
+]
+
+
+schema_version = db.Table(
+    SCHEMA_VERSION_TABLE,
+    db.Column("revision", db.String(32), primary_key=True),
+    db.Column("applied_at", db.DateTime, nullable=False)
+)
+
+
+class SchemaMigrator:
+    """
+    Applies the revisions of server.migrations.revisions in order and keeps
+    the applied ones in the schema_version table.
+    """
+
+    def __init__(self, revisions: list[ModuleType]) -> None:
+        self._revisions = revisions
+
+    def get_pending_revisions(self, connection: Connection) -> list[str]:
+        applied_revisions = self._get_applied_revisions(connection)
+
+        return [
+            revision.revision
+            for revision in self._revisions
+            if revision.revision not in applied_revisions
+        ]
+
+    def is_current(self, connection: Connection) -> bool:
+        return len(self.get_pending_revisions(connection)) == 0
+
+    def upgrade(self, engine: Engine) -> list[str]:
+        """
+        Applies the pending revisions, each in its own transaction.
+        """
+        with engine.begin() as connection:
+            schema_version.create(connection, checkfirst=True)
+            pending_revisions = self.get_pending_revisions(connection)
+
+        for revision in self._revisions:
+            if revision.revision not in pending_revisions:
+                continue
+
+            logger.info(f"Apply database revision {revision.revision}: {revision.__name__}")  # noqa
+            with engine.begin() as connection:
+                revision.upgrade(connection)
+                connection.execute(schema_version.insert().values(
+                    revision=revision.revision,
+                    applied_at=datetime.utcnow()
+                ))
+
+        return pending_revisions
+
+    def check_schema(
+            self,
+            engine: Engine,
+            migrate: bool = DB_MIGRATE_ON_STARTUP
+    ) -> None:
+        """
+        Startup check of the schema, instead of rebuilding the tables.
+        """
+        with engine.connect() as connection:
+            pending_revisions = self.get_pending_revisions(connection)
+
+        if len(pending_revisions) == 0:
+            return
+
+        if not migrate:
+            raise errors.DbSchemaOutdatedException(pending_revisions)
+
+        self.upgrade(engine)
+
+    # protected
+    def _get_applied_revisions(self, connection: Connection) -> set[str]:
+        if not inspect(connection).has_table(SCHEMA_VERSION_TABLE):
+            return set()
+
+        return set(connection.execute(
+            select(schema_version.c.revision)).scalars())
+
+
+schema_migrator = SchemaMigrator(REVISIONS)
@@ -0,0 +1,54 @@
+from sqlalchemy import Column, Connection, Index, MetaData, Table, inspect
+from sqlalchemy.schema import CreateColumn
+
+
+def create_index(
+        connection: Connection,
+        name: str,
+        table_name: str,
+        column_names: list[str]
+) -> None:
+    """
+    Creates the index, if it doesn't exist yet (databases initialized with
+    the baseline revision already contain the indexes of the models). Tables
+    of other services (e.g. the recipe tables in the auth database) are
+    skipped.
+    """
+    if not inspect(connection).has_table(table_name):
+        return
+
+    existing_names = {
+        index["name"]
+        for index in inspect(connection).get_indexes(table_name)
+    }
+    if name in existing_names:
+        return
+
+    table = Table(table_name, MetaData(), autoload_with=connection)
+    Index(name, *[table.c[column] for column in column_names]) \
+        .create(connection)
+
+
+def add_column(
+        connection: Connection,
+        table_name: str,
+        column: Column
+) -> None:
+    """
+    Adds the column to the table, if it doesn't exist yet (tables created by
+    db.create_all() after the model change already contain it). Tables of
+    other services are skipped.
+    """
+    if not inspect(connection).has_table(table_name):
+        return
+
+    existing_names = {
+        existing_column["name"]
+        for existing_column in inspect(connection).get_columns(table_name)
+    }
+    if column.name in existing_names:
+        return
+
+    column_ddl = CreateColumn(column).compile(dialect=connection.dialect)
+    connection.exec_driver_sql(
+        f"ALTER TABLE {table_name} ADD COLUMN {column_ddl}")
@@ -0,0 +1,267 @@
+"""
+Baseline: the tables of the models, as they were before the migrations.
+
+The schema is frozen here, changes of the models need a new revision.
+Databases, which were created by db.create_all() before the migrations,
+already contain the tables, so only missing tables are created. A service
+only creates the tables of its own models (e.g. no recipe tables in the
+auth database).
+"""
+from sqlalchemy import (
+    Boolean, Column, Connection, Date, Float, ForeignKey, Integer, MetaData,
+    String, Table, UniqueConstraint
+)
+
+from server.db import db
+
+
+revision = "0001"
+
+metadata = MetaData()
+
+cart = Table(
+    "cart",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(50), nullable=False),
+    Column("owner_user_id", Integer, nullable=False),
+    Column("is_active", Boolean, nullable=False),
+    UniqueConstraint("name", "owner_user_id", name="uq_cart_name_user"),
+)
+
+category = Table(
+    "category",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(50), nullable=False, unique=True),
+)
+
+collection = Table(
+    "collection",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(50), nullable=False),
+    Column("owner_user_id", Integer, nullable=False),
+    Column("is_default", Boolean, nullable=False),
+)
+
+rimage = Table(
+    "rimage",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("path", String(500), nullable=False, unique=True),
+)
+
+role = Table(
+    "role",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(50), nullable=False, unique=True),
+)
+
+rplanner = Table(
+    "rplanner",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(25), nullable=False, unique=True),
+    Column("owner_user_id", Integer, nullable=False),
+    Column("is_active", Boolean, nullable=False),
+    UniqueConstraint("name", "owner_user_id", name="qu_rplanner_name_user_id"),
+)
+
+supermarket = Table(
+    "supermarket",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(25), nullable=False),
+    Column("street", String(100), nullable=False),
+    Column("postcode", String(25), nullable=False),
+    Column("district", String(50), nullable=False),
+    Column("owner_user_id", Integer, nullable=False),
+    UniqueConstraint("name", "street", name="uq_name_street"),
+)
+
+tag = Table(
+    "tag",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(25), nullable=False, unique=True),
+)
+
+unit = Table(
+    "unit",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(25), nullable=False, unique=True),
+)
+
+users = Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("username", String(50), nullable=False, unique=True),
+    Column("email", String(120), nullable=False, unique=True),
+    Column("password", String(255), nullable=False),
+)
+
+cart_user = Table(
+    "cart_user",
+    metadata,
+    Column("cart_id", Integer, ForeignKey("cart.id"), primary_key=True),
+    Column("user_id", Integer, primary_key=True),
+    UniqueConstraint("cart_id", "user_id", name="uq_rplanner_user"),
+)
+
+collection_user = Table(
+    "collection_user",
+    metadata,
+    Column("collection_id", Integer, ForeignKey("collection.id"), primary_key=True),  # noqa
+    Column("user_id", Integer, primary_key=True),
+    Column("can_edit", Boolean, nullable=False),
+    UniqueConstraint("collection_id", "user_id", name="uq_collection_user"),
+)
+
+ingredient = Table(
+    "ingredient",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(50), nullable=False, unique=True),
+    Column("displayname", String(25), nullable=False),
+    Column("default_price", Float(precision=2), nullable=False),
+    Column("quantity_per_unit", Float(precision=2), nullable=False),
+    Column("is_spices", Boolean, nullable=False),
+    Column("search_description", String(100), nullable=False),
+    Column("unit_id", Integer, ForeignKey("unit.id"), nullable=False),
+)
+
+recipe = Table(
+    "recipe",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(50), nullable=False, unique=True),
+    Column("person_count", Integer, nullable=False),
+    Column("preperation_description", String(1000), nullable=False),
+    Column("preperation_time_minutes", Integer, nullable=False),
+    Column("difficulty", String(25), nullable=False),
+    Column("search_description", String(75), nullable=False),
+    Column("creator_user_id", Integer, nullable=False),
+    Column("category_id", Integer, ForeignKey("category.id"), nullable=False),
+)
+
+rplanner_user = Table(
+    "rplanner_user",
+    metadata,
+    Column("rplanner_id", Integer, ForeignKey("rplanner.id"), primary_key=True),  # noqa
+    Column("user_id", Integer, primary_key=True),
+    Column("can_edit", Boolean, nullable=False),
+    UniqueConstraint("rplanner_id", "user_id", name="uq_rplanner_user"),
+)
+
+sarea = Table(
+    "sarea",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(25), nullable=False, unique=True),
+    Column("order_number", Integer, nullable=False),
+    Column("supermarket_id", Integer, ForeignKey("supermarket.id"), nullable=False),  # noqa
+    UniqueConstraint("supermarket_id", "name", name="uq_supermarketid_name"),
+)
+
+supermarket_edit_user = Table(
+    "supermarket_edit_user",
+    metadata,
+    Column("supermarket_id", Integer, ForeignKey("supermarket.id"), primary_key=True),  # noqa
+    Column("user_id", Integer, primary_key=True),
+    UniqueConstraint("supermarket_id", "user_id", name="uq_supermarket_user"),
+)
+
+user_roles = Table(
+    "user_roles",
+    metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("role_id", Integer, ForeignKey("role.id"), primary_key=True),
+    UniqueConstraint("user_id", "role_id", name="uq_user_role"),
+)
+
+cart_item = Table(
+    "cart_item",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("cart_id", Integer, ForeignKey("cart.id"), nullable=False),
+    Column("recipe_id", Integer, ForeignKey("recipe.id")),
+    Column("ingredient_id", Integer, ForeignKey("ingredient.id"), nullable=False),  # noqa
+    Column("quantity", Integer, nullable=False),
+    Column("is_done", Boolean, nullable=False),
+)
+
+collection_recipe = Table(
+    "collection_recipe",
+    metadata,
+    Column("collection_id", Integer, ForeignKey("collection.id"), primary_key=True),  # noqa
+    Column("recipe_id", Integer, ForeignKey("recipe.id"), primary_key=True),
+    UniqueConstraint("collection_id", "recipe_id", name="uq_collection_recipe"),  # noqa
+)
+
+recipe_image = Table(
+    "recipe_image",
+    metadata,
+    Column("recipe_id", Integer, ForeignKey("recipe.id"), primary_key=True),
+    Column("image_id", Integer, ForeignKey("rimage.id"), primary_key=True),
+    UniqueConstraint("recipe_id", "image_id", name="uq_recipe_image"),
+)
+
+recipe_ingredient = Table(
+    "recipe_ingredient",
+    metadata,
+    Column("recipe_id", Integer, ForeignKey("recipe.id"), primary_key=True),
+    Column("ingredient_id", Integer, ForeignKey("ingredient.id"), primary_key=True),  # noqa
+    Column("quantity", Integer, nullable=False),
+    UniqueConstraint("recipe_id", "ingredient_id", name="uq_recipe_ingredient"),  # noqa
+)
+
+recipe_rating = Table(
+    "recipe_rating",
+    metadata,
+    Column("user_id", Integer, primary_key=True),
+    Column("recipe_id", Integer, ForeignKey("recipe.id"), primary_key=True),
+    Column("rating", Float(precision=2), nullable=False),
+    UniqueConstraint("user_id", "recipe_id", name="uq_user_recipe_rating"),
+)
+
+recipe_tag = Table(
+    "recipe_tag",
+    metadata,
+    Column("recipe_id", Integer, ForeignKey("recipe.id"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tag.id"), primary_key=True),
+    UniqueConstraint("recipe_id", "tag_id", name="uq_recipe_tag"),
+)
+
+rplanner_item = Table(
+    "rplanner_item",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("rplanner_id", Integer, ForeignKey("rplanner.id"), nullable=False),
+    Column("recipe_id", Integer, ForeignKey("recipe.id"), nullable=False),
+    Column("date", Date, nullable=False),
+    Column("label", String(25), nullable=False),
+    Column("order_number", Integer, nullable=False),
+    Column("planned_recipe_person_count", Integer, nullable=False),
+)
+
+sarea_ingredient = Table(
+    "sarea_ingredient",
+    metadata,
+    Column("sarea_id", Integer, ForeignKey("sarea.id"), primary_key=True),
+    Column("ingredient_id", Integer, ForeignKey("ingredient.id"), primary_key=True),  # noqa
+    Column("ingredient_price", Float(precision=2), nullable=False),
+    UniqueConstraint("sarea_id", "ingredient_id", name="uq_supermarketid_name"),  # noqa
+)
+
+
+def upgrade(connection: Connection) -> None:
+    tables = [
+        table
+        for table in metadata.sorted_tables
+        if table.name in db.metadata.tables
+    ]
+    metadata.create_all(connection, tables=tables, checkfirst=True)
@@ -0,0 +1,28 @@
+"""
+Secondary indexes of the hot filter columns: the items of a planner per
+date, the items of a cart and the owner / shared with lists.
+"""
+from sqlalchemy import Connection
+
+from server.migrations.operations import create_index
+
+
+revision = "0002"
+
+INDEXES = [
+    ("ix_rplanner_item_rplanner_id_date", "rplanner_item", ["rplanner_id", "date"]),  # noqa
+    ("ix_cart_item_cart_id", "cart_item", ["cart_id"]),
+    ("ix_cart_owner_user_id", "cart", ["owner_user_id"]),
+    ("ix_collection_owner_user_id", "collection", ["owner_user_id"]),
+    ("ix_rplanner_owner_user_id", "rplanner", ["owner_user_id"]),
+    ("ix_supermarket_owner_user_id", "supermarket", ["owner_user_id"]),
+    ("ix_cart_user_user_id", "cart_user", ["user_id"]),
+    ("ix_collection_user_user_id", "collection_user", ["user_id"]),
+    ("ix_rplanner_user_user_id", "rplanner_user", ["user_id"]),
+    ("ix_supermarket_edit_user_user_id", "supermarket_edit_user", ["user_id"]),  # noqa
+]
+
+
+def upgrade(connection: Connection) -> None:
+    for name, table_name, column_names in INDEXES:
+        create_index(connection, name, table_name, column_names)
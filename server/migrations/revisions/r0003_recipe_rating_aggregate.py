@@ -0,0 +1,35 @@
+"""
+Rating aggregate of a recipe (rating_sum, rating_count), which is kept up to
+date by the RecipeRating events. The existing ratings are summed up once.
+"""
+from sqlalchemy import Column, Connection, Float, Integer, inspect
+
+from server.migrations.operations import add_column
+
+
+revision = "0003"
+
+COLUMNS = [
+    Column("rating_sum", Float, nullable=False, server_default="0"),
+    Column("rating_count", Integer, nullable=False, server_default="0"),
+]
+
+
+def upgrade(connection: Connection) -> None:
+    if not inspect(connection).has_table("recipe"):
+        return
+
+    for column in COLUMNS:
+        add_column(connection, "recipe", column)
+
+    connection.exec_driver_sql(
+        "UPDATE recipe SET "
+        "rating_sum = COALESCE(("
+        "SELECT SUM(recipe_rating.rating) FROM recipe_rating "
+        "WHERE recipe_rating.recipe_id = recipe.id"
+        "), 0), "
+        "rating_count = ("
+        "SELECT COUNT(*) FROM recipe_rating "
+        "WHERE recipe_rating.recipe_id = recipe.id"
+        ")"
+    )
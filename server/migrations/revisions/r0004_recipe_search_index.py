@@ -0,0 +1,16 @@
+"""
+Full-text index of the recipe search, built from the existing recipes.
+"""
+from sqlalchemy import Connection, inspect
+
+
+revision = "0004"
+
+
+def upgrade(connection: Connection) -> None:
+    if not inspect(connection).has_table("recipe"):
+        return
+
+    # imports the recipe models, which aren't part of every service
+    from server.search.recipe_search import recipe_search
+    recipe_search.rebuild(connection)
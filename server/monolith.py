@@ -6,8 +6,11 @@ from flask import Flask
 from flask_cors import CORS
 
 from server.db import db
-from server.api import api
+from server.db_routing import replica_router
+from server.api import api, EXPOSED_HEADERS
 from server.utils.jwt import jwt_manager
+from server.caching.composite import caching_model_graph
+from server.migrations.migrator import schema_migrator
 from server.core.models.db_models import (user, recipe, planner, cart, supermarket)  # noqa - import all models for table initfrom server.api import api
 from server.services.heathcheck.apis.heathcheck import ns as ns_heathcheck
 from server.services.auth.apis.auth import ns as ns_auth
@@ -34,7 +37,10 @@ class FlaskConfig:
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(minutes=int(os.environ.get("JWT_REFRESH_TOKEN_EXPIRES_MINUTES")))  # noqa
 
 
-def create_app(database_uri: str = None) -> Flask:
+def create_app(
+        database_uri: str = None,
+        replica_database_uri: str = None
+) -> Flask:
     # Create app and configuration
     app = Flask(__name__)
     app.config.from_object(FlaskConfig)
@@ -43,8 +49,9 @@ def create_app(database_uri: str = None) -> Flask:
         app.config["SQLALCHEMY_DATABASE_URI"] = database_uri
 
     # init app
-    CORS(app)
+    CORS(app, expose_headers=EXPOSED_HEADERS)
     db.init_app(app)
+    replica_router.init_app(app, replica_database_uri)
     api.init_app(app)
     jwt_manager.init_app(app)
 
@@ -62,15 +69,22 @@ def create_app(database_uri: str = None) -> Flask:
     api.add_namespace(ns_planner)
     api.add_namespace(ns_cart)
 
+    # cache invalidation of the models, which embed each other
+    caching_model_graph.build()
+
     # add errorhandler
     @app.errorhandler(500)
     def internal_server_error(error):
         err_msg = error if app.debug else "Unexpected internal error."
         return {"error": err_msg}, 500
 
+    is_debug = os.environ.get("DEBUG", False)
+
     # initialize db tables
     with app.app_context():
-        db.drop_all()
-        db.create_all()
+        if is_debug:
+            db.drop_all()
+
+        schema_migrator.check_schema(db.engine)
 
     return app
@@ -0,0 +1,397 @@
+import math
+import time
+
+from bisect import bisect_left, insort
+from threading import RLock, Thread
+
+from sqlalchemy import Connection, Engine, bindparam, text
+
+from server.logger import logger
+from server.search.tokenizer import tokenize
+from server.search.documents import FIELD_WEIGHTS, iter_all_documents
+
+
+INDEX_TABLE = "recipe_search"
+
+# score factor of a token, which only starts with the query term
+PREFIX_MATCH_FACTOR = 0.5
+
+
+class SearchBackend:
+    """
+    Inverted index of the recipe search documents.
+
+    The SQL backends write within the transaction of the connection, the
+    in-process backend applies changes after the commit (see recipe_search).
+    """
+    name: str
+    writes_in_transaction = True
+
+    def create(self, connection: Connection) -> None: pass
+
+    def drop(self, connection: Connection) -> None: pass
+
+    def upsert(
+            self,
+            connection: Connection,
+            documents: dict[int, dict[str, str]]
+    ) -> None: pass
+
+    def remove(self, connection: Connection, ids: list[int]) -> None: pass
+
+    def search(
+            self,
+            connection: Connection,
+            terms: list[str],
+            limit: int
+    ) -> list[int]:
+        """
+        Ids of the recipes matching every term (as token prefix), the most
+        relevant first.
+        """
+        raise NotImplementedError()
+
+    def rebuild(self, connection: Connection) -> None:
+        self.drop(connection)
+        self.create(connection)
+        for documents in iter_all_documents(connection):
+            self.upsert(connection, documents)
+
+
+class Fts5SearchBackend(SearchBackend):
+    """
+    SQLite FTS5 virtual table, ranked with bm25 and the field weights.
+    """
+    name = "fts5"
+
+    def create(self, connection: Connection) -> None:
+        columns = ", ".join(FIELD_WEIGHTS)
+        connection.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {INDEX_TABLE} "
+            f"USING fts5({columns}, tokenize = 'unicode61 remove_diacritics 2')"  # noqa
+        )
+
+    def drop(self, connection: Connection) -> None:
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {INDEX_TABLE}")
+
+    def upsert(
+            self,
+            connection: Connection,
+            documents: dict[int, dict[str, str]]
+    ) -> None:
+        if not documents:
+            return
+
+        self.remove(connection, list(documents))
+
+        columns = ", ".join(FIELD_WEIGHTS)
+        values = ", ".join(f":{field}" for field in FIELD_WEIGHTS)
+        connection.execute(
+            text(f"INSERT INTO {INDEX_TABLE} (rowid, {columns}) VALUES (:id, {values})"),  # noqa
+            [{"id": id, **document} for id, document in documents.items()]
+        )
+
+    def remove(self, connection: Connection, ids: list[int]) -> None:
+        if not ids:
+            return
+
+        connection.execute(
+            text(f"DELETE FROM {INDEX_TABLE} WHERE rowid IN :ids")
+            .bindparams(bindparam("ids", expanding=True)),
+            {"ids": list(ids)}
+        )
+
+    def search(
+            self,
+            connection: Connection,
+            terms: list[str],
+            limit: int
+    ) -> list[int]:
+        # quoted prefix queries, which are implicitly combined with AND
+        match_query = " ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(str(weight) for weight in FIELD_WEIGHTS.values())
+
+        return connection.execute(
+            text(
+                f"SELECT rowid FROM {INDEX_TABLE} "
+                f"WHERE {INDEX_TABLE} MATCH :query "
+                f"ORDER BY bm25({INDEX_TABLE}, {weights}), rowid "
+                "LIMIT :limit"
+            ),
+            {"query": match_query, "limit": limit}
+        ).scalars().all()
+
+    @staticmethod
+    def is_available(connection: Connection) -> bool:
+        compile_options = connection.exec_driver_sql(
+            "PRAGMA compile_options").scalars().all()
+
+        return "ENABLE_FTS5" in compile_options
+
+
+class MysqlFulltextSearchBackend(SearchBackend):
+    """
+    InnoDB table with FULLTEXT indexes, searched in boolean mode.
+
+    Tokens shorter than innodb_ft_min_token_size (default 3) and stopwords
+    are not indexed by MySQL.
+    """
+    name = "fulltext"
+
+    def create(self, connection: Connection) -> None:
+        connection.exec_driver_sql(
+            f"CREATE TABLE IF NOT EXISTS {INDEX_TABLE} ("
+            "recipe_id INTEGER NOT NULL PRIMARY KEY, "
+            "name VARCHAR(255) NOT NULL, "
+            "keywords TEXT NOT NULL, "
+            "description TEXT NOT NULL, "
+            "FULLTEXT INDEX ft_recipe_search_name (name), "
+            "FULLTEXT INDEX ft_recipe_search_all (name, keywords, description)"  # noqa
+            ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"
+        )
+
+    def drop(self, connection: Connection) -> None:
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {INDEX_TABLE}")
+
+    def upsert(
+            self,
+            connection: Connection,
+            documents: dict[int, dict[str, str]]
+    ) -> None:
+        if not documents:
+            return
+
+        connection.execute(
+            text(
+                f"REPLACE INTO {INDEX_TABLE} (recipe_id, name, keywords, description) "  # noqa
+                "VALUES (:id, :name, :keywords, :description)"
+            ),
+            [
+                {
+                    "id": id,
+                    "name": document["name"],
+                    "keywords": " ".join((
+                        document["tags"],
+                        document["ingredients"],
+                        document["category"]
+                    )),
+                    "description": " ".join((
+                        document["search_description"],
+                        document["preperation_description"]
+                    ))
+                }
+                for id, document in documents.items()
+            ]
+        )
+
+    def remove(self, connection: Connection, ids: list[int]) -> None:
+        if not ids:
+            return
+
+        connection.execute(
+            text(f"DELETE FROM {INDEX_TABLE} WHERE recipe_id IN :ids")
+            .bindparams(bindparam("ids", expanding=True)),
+            {"ids": list(ids)}
+        )
+
+    def search(
+            self,
+            connection: Connection,
+            terms: list[str],
+            limit: int
+    ) -> list[int]:
+        match_query = " ".join(f"+{term}*" for term in terms)
+
+        return connection.execute(
+            text(
+                f"SELECT recipe_id FROM {INDEX_TABLE} "
+                "WHERE MATCH(name, keywords, description) AGAINST (:query IN BOOLEAN MODE) "  # noqa
+                "ORDER BY "
+                "3 * MATCH(name) AGAINST (:query IN BOOLEAN MODE) + "
+                "MATCH(name, keywords, description) AGAINST (:query IN BOOLEAN MODE) DESC, "  # noqa
+                "recipe_id "
+                "LIMIT :limit"
+            ),
+            {"query": match_query, "limit": limit}
+        ).scalars().all()
+
+
+class InMemorySearchBackend(SearchBackend):
+    """
+    Inverted index in the memory of the process, for databases without
+    full-text search.
+
+    Writes of this process are applied after their commit, writes of other
+    processes are picked up by rebuilding the index after max_age seconds.
+    Only the first build blocks the search, later rebuilds run in a
+    background thread, while the current index is still searched.
+    """
+    name = "memory"
+    writes_in_transaction = False
+
+    def __init__(self, max_age: float) -> None:
+        self._max_age = max_age
+        self._lock = RLock()
+        self._built_at: float | None = None
+        self._rebuild_thread: Thread | None = None
+        # writes of this process during a background rebuild, applied to
+        # the rebuilt index before it replaces the current one
+        self._pending_writes: list[tuple[dict, list[int]]] | None = None
+        # token -> {recipe_id: weight}
+        self._postings: dict[str, dict[int, float]] = {}
+        # recipe_id -> {token: weight}
+        self._documents: dict[int, dict[str, float]] = {}
+        # all tokens for the prefix lookup
+        self._tokens: list[str] = []
+
+    def drop(self, connection: Connection) -> None:
+        with self._lock:
+            self._built_at = None
+            self._postings = {}
+            self._documents = {}
+            self._tokens = []
+
+    def rebuild(self, connection: Connection) -> None:
+        with self._lock:
+            self.drop(connection)
+            for documents in iter_all_documents(connection):
+                self.upsert(connection, documents)
+            self._built_at = time.monotonic()
+
+    def upsert(
+            self,
+            connection: Connection,
+            documents: dict[int, dict[str, str]]
+    ) -> None:
+        with self._lock:
+            if self._pending_writes is not None:
+                self._pending_writes.append((documents, []))
+
+            self._remove(list(documents))
+
+            for id, document in documents.items():
+                token_weights: dict[str, float] = {}
+                for field, weight in FIELD_WEIGHTS.items():
+                    for token in tokenize(document[field]):
+                        token_weights[token] = token_weights.get(token, 0.) + weight  # noqa
+
+                self._documents[id] = token_weights
+                for token, weight in token_weights.items():
+                    postings = self._postings.get(token)
+                    if postings is None:
+                        postings = self._postings[token] = {}
+                        insort(self._tokens, token)
+                    postings[id] = weight
+
+    def remove(self, connection: Connection, ids: list[int]) -> None:
+        with self._lock:
+            if self._pending_writes is not None:
+                self._pending_writes.append(({}, ids))
+
+            self._remove(ids)
+
+    def search(
+            self,
+            connection: Connection,
+            terms: list[str],
+            limit: int
+    ) -> list[int]:
+        with self._lock:
+            if self._built_at is None:
+                self.rebuild(connection)
+            elif self._is_expired():
+                self._start_rebuild(connection.engine)
+
+            scores: dict[int, float] | None = None
+            for term in terms:
+                term_scores = self._score_term(term)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {
+                        id: score + term_scores[id]
+                        for id, score in scores.items()
+                        if id in term_scores
+                    }
+
+                if not scores:
+                    return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [id for id, _ in ranked[:limit]]
+
+    def _remove(self, ids: list[int]) -> None:
+        with self._lock:
+            for id in ids:
+                token_weights = self._documents.pop(id, None)
+                if token_weights is None:
+                    continue
+
+                for token in token_weights:
+                    postings = self._postings[token]
+                    del postings[id]
+                    if not postings:
+                        del self._postings[token]
+                        del self._tokens[bisect_left(self._tokens, token)]
+
+    def _score_term(self, term: str) -> dict[int, float]:
+        document_count = len(self._documents)
+        scores: dict[int, float] = {}
+
+        i = bisect_left(self._tokens, term)
+        while i < len(self._tokens) and self._tokens[i].startswith(term):
+            token = self._tokens[i]
+            postings = self._postings[token]
+            idf = math.log(1 + document_count / len(postings))
+            factor = 1. if token == term else PREFIX_MATCH_FACTOR
+
+            for id, weight in postings.items():
+                score = weight * idf * factor
+                if score > scores.get(id, 0.):
+                    scores[id] = score
+            i += 1
+
+        return scores
+
+    def _is_expired(self) -> bool:
+        return (
+            self._built_at is None or
+            time.monotonic() - self._built_at >= self._max_age
+        )
+
+    def _start_rebuild(self, engine: Engine) -> None:
+        with self._lock:
+            if self._pending_writes is not None:
+                return
+
+            self._pending_writes = []
+            self._rebuild_thread = Thread(
+                target=self._rebuild_in_background,
+                args=(engine,),
+                name="recipe-search-rebuild",
+                daemon=True
+            )
+            self._rebuild_thread.start()
+
+    def _rebuild_in_background(self, engine: Engine) -> None:
+        index = InMemorySearchBackend(max_age=self._max_age)
+
+        try:
+            with engine.connect() as connection:
+                index.rebuild(connection)
+        except Exception as e:
+            logger.error(f"Rebuild of the recipe search index failed: {e}")
+            with self._lock:
+                self._pending_writes = None
+            return
+
+        with self._lock:
+            for documents, removed_ids in self._pending_writes:
+                index.remove(None, removed_ids)
+                index.upsert(None, documents)
+
+            self._postings = index._postings
+            self._documents = index._documents
+            self._tokens = index._tokens
+            self._built_at = index._built_at
+            self._pending_writes = None
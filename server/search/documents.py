@@ -0,0 +1,119 @@
+from typing import Iterable, Iterator
+
+from sqlalchemy import Connection, select
+
+from server.core.models.db_models.recipe import (
+    Recipe, RecipeIngredient, RecipeTagComposite
+)
+from server.core.models.db_models.tag import Tag
+from server.core.models.db_models.ingredient import Ingredient
+from server.core.models.db_models.category import Category
+
+
+# indexed fields of a recipe document and their relevance weight
+FIELD_WEIGHTS = {
+    "name": 10.,
+    "tags": 5.,
+    "ingredients": 5.,
+    "category": 3.,
+    "search_description": 2.,
+    "preperation_description": 1.,
+}
+
+DOCUMENT_BATCH_SIZE = 5_000
+
+
+def load_documents(
+        connection: Connection,
+        recipe_ids: Iterable[int]
+) -> dict[int, dict[str, str]]:
+    """
+    Search documents of the recipes ({recipe_id: {field: text}}), recipes
+    which don't exist (anymore) are missing in the result.
+
+    Loaded with one query per field source through the connection, so it can
+    be called within a flush.
+    """
+    recipe_ids = list(recipe_ids)
+    documents: dict[int, dict[str, str]] = {}
+
+    for i in range(0, len(recipe_ids), DOCUMENT_BATCH_SIZE):
+        batch_ids = recipe_ids[i:i + DOCUMENT_BATCH_SIZE]
+        documents.update(
+            _load_batch(connection, Recipe.id.in_(batch_ids)))
+
+    return documents
+
+
+def iter_all_documents(
+        connection: Connection
+) -> Iterator[dict[int, dict[str, str]]]:
+    """
+    Search documents of all recipes in batches of DOCUMENT_BATCH_SIZE.
+    """
+    last_id = None
+
+    while True:
+        query = select(Recipe.id).order_by(Recipe.id).limit(DOCUMENT_BATCH_SIZE)  # noqa
+        if last_id is not None:
+            query = query.where(Recipe.id > last_id)
+
+        batch_ids = connection.execute(query).scalars().all()
+        if not batch_ids:
+            return
+
+        last_id = batch_ids[-1]
+        yield _load_batch(
+            connection,
+            Recipe.id.between(batch_ids[0], last_id)
+        )
+
+
+def _load_batch(connection: Connection, id_filter) -> dict[int, dict[str, str]]:  # noqa
+    documents: dict[int, dict[str, str]] = {}
+
+    recipe_rows = connection.execute(
+        select(
+            Recipe.id,
+            Recipe.name,
+            Recipe.search_description,
+            Recipe.preperation_description,
+            Category.name
+        )
+        .outerjoin(Category, Recipe.category_id == Category.id)
+        .where(id_filter)
+    )
+    for id, name, search_desc, preperation_desc, category in recipe_rows:
+        documents[id] = {
+            "name": name or "",
+            "tags": [],
+            "ingredients": [],
+            "category": category or "",
+            "search_description": search_desc or "",
+            "preperation_description": preperation_desc or "",
+        }
+
+    if not documents:
+        return documents
+
+    tag_rows = connection.execute(
+        select(RecipeTagComposite.recipe_id, Tag.name)
+        .join(Tag, RecipeTagComposite.tag_id == Tag.id)
+        .where(RecipeTagComposite.recipe_id.in_(documents.keys()))
+    )
+    for recipe_id, tag_name in tag_rows:
+        documents[recipe_id]["tags"].append(tag_name)
+
+    ingredient_rows = connection.execute(
+        select(RecipeIngredient.recipe_id, Ingredient.name)
+        .join(Ingredient, RecipeIngredient.ingredient_id == Ingredient.id)
+        .where(RecipeIngredient.recipe_id.in_(documents.keys()))
+    )
+    for recipe_id, ingredient_name in ingredient_rows:
+        documents[recipe_id]["ingredients"].append(ingredient_name)
+
+    for document in documents.values():
+        document["tags"] = " ".join(document["tags"])
+        document["ingredients"] = " ".join(document["ingredients"])
+
+    return documents
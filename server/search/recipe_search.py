@@ -0,0 +1,248 @@
+import os
+
+from itertools import chain
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import Connection, Engine, MetaData, event, inspect, select
+from sqlalchemy.orm import Session
+
+from server.db import db
+from server.logger import logger
+from server.core.models.db_models.recipe import (
+    Recipe, RecipeIngredient, RecipeTagComposite
+)
+from server.core.models.db_models.tag import Tag
+from server.core.models.db_models.ingredient import Ingredient
+from server.core.models.db_models.category import Category
+from server.search.tokenizer import tokenize
+from server.search.documents import load_documents
+from server.search.backends import (
+    Fts5SearchBackend, InMemorySearchBackend,
+    MysqlFulltextSearchBackend, SearchBackend
+)
+
+
+# auto | fulltext | fts5 | memory
+SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "auto")
+SEARCH_MAX_RESULTS = int(os.environ.get("SEARCH_MAX_RESULTS", 1_000))
+SEARCH_INDEX_MAX_AGE = float(os.environ.get("SEARCH_INDEX_MAX_AGE", 300))
+
+# fields of a recipe, which are part of its search document
+RECIPE_DOCUMENT_FIELDS = [
+    "name",
+    "search_description",
+    "preperation_description",
+    "category_id",
+    "category",
+    "tags",
+    "ingredients"
+]
+
+PENDING_IDS_KEY = "recipe_search_pending_ids"
+PENDING_CHANGES_KEY = "recipe_search_pending_changes"
+
+
+class RecipeSearch:
+    """
+    Full-text search of recipes over name, descriptions, category, tag and
+    ingredient names.
+
+    The index is kept in sync by the session events of the models the
+    search documents are built from. A search returns at most max_results
+    ids (SEARCH_MAX_RESULTS), the most relevant ones, a list paginated over
+    them never reaches the less relevant matches. Backends by database:
+        mysql:  FULLTEXT index (fulltext)
+        sqlite: FTS5 virtual table, if compiled in (fts5)
+        other:  inverted index in the process memory (memory)
+    """
+
+    def __init__(
+            self,
+            backend_name: str,
+            max_results: int,
+            index_max_age: float
+    ) -> None:
+        self._backend_name = backend_name
+        self._max_results = max_results
+        self._index_max_age = index_max_age
+        self._backends: WeakKeyDictionary[Engine, SearchBackend] = WeakKeyDictionary()  # noqa
+
+    @property
+    def max_results(self) -> int:
+        return self._max_results
+
+    def search(self, search_text: str, limit: int = None) -> list[int] | None:
+        """
+        Ids of the recipes matching all words of the text as prefix, the
+        most relevant first. None, if the text contains no searchable word.
+        """
+        terms = tokenize(search_text)
+        if not terms:
+            return None
+
+        connection = db.session.connection()
+        backend = self.get_backend(connection)
+
+        return backend.search(connection, terms, limit or self._max_results)
+
+    def rebuild(self, connection: Connection = None) -> None:
+        """
+        Builds the index of the existing recipes (e.g. by the migration or
+        after an import), in the transaction of the given connection.
+        """
+        if connection is not None:
+            self.get_backend(connection).rebuild(connection)
+            return
+
+        with db.engine.begin() as connection:
+            self.get_backend(connection).rebuild(connection)
+
+    def get_backend(self, connection: Connection) -> SearchBackend:
+        engine = connection.engine
+        backend = self._backends.get(engine)
+
+        if backend is None:
+            backend = self._create_backend(connection)
+            self._backends[engine] = backend
+            logger.info(f"Recipe search uses the '{backend.name}' index.")
+
+        return backend
+
+    def register(self, metadata: MetaData) -> None:
+        event.listen(metadata, "after_create", self._after_create)
+        event.listen(metadata, "before_drop", self._before_drop)
+        event.listen(Session, "before_flush", self._before_flush)
+        event.listen(Session, "after_flush", self._after_flush)
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_rollback", self._after_rollback)
+
+    # protected
+    def _create_backend(self, connection: Connection) -> SearchBackend:
+        backend_name = self._backend_name
+        dialect = connection.dialect.name
+
+        if backend_name == "auto":
+            if dialect in ("mysql", "mariadb"):
+                backend_name = MysqlFulltextSearchBackend.name
+            elif dialect == "sqlite" and Fts5SearchBackend.is_available(connection):  # noqa
+                backend_name = Fts5SearchBackend.name
+            else:
+                backend_name = InMemorySearchBackend.name
+
+        if backend_name == MysqlFulltextSearchBackend.name:
+            return MysqlFulltextSearchBackend()
+
+        if backend_name == Fts5SearchBackend.name:
+            return Fts5SearchBackend()
+
+        if backend_name == InMemorySearchBackend.name:
+            return InMemorySearchBackend(max_age=self._index_max_age)
+
+        err_msg = f"Unknown search backend '{backend_name}'."
+        raise ValueError(err_msg)
+
+    # protected
+    def _after_create(self, target, connection: Connection, **kw) -> None:
+        self.get_backend(connection).create(connection)
+
+    # protected
+    def _before_drop(self, target, connection: Connection, **kw) -> None:
+        self.get_backend(connection).drop(connection)
+
+    # protected
+    def _before_flush(self, session: Session, flush_context, instances) -> None:  # noqa
+        # recipes of renamed or deleted tags, ingredients and categories,
+        # the links of deleted objects are gone after the flush
+        changed_ids = {Tag: set(), Ingredient: set(), Category: set()}
+
+        for obj in chain(session.dirty, session.deleted):
+            model = type(obj)
+            if model not in changed_ids:
+                continue
+
+            if obj in session.deleted or _has_changes(obj, ["name"]):
+                changed_ids[model].add(obj.id)
+
+        queries = [
+            (Tag, select(RecipeTagComposite.recipe_id).where(RecipeTagComposite.tag_id.in_(changed_ids[Tag]))),  # noqa
+            (Ingredient, select(RecipeIngredient.recipe_id).where(RecipeIngredient.ingredient_id.in_(changed_ids[Ingredient]))),  # noqa
+            (Category, select(Recipe.id).where(Recipe.category_id.in_(changed_ids[Category]))),  # noqa
+        ]
+
+        recipe_ids = session.info.setdefault(PENDING_IDS_KEY, set())
+        with session.no_autoflush:
+            for model, query in queries:
+                if changed_ids[model]:
+                    recipe_ids.update(session.execute(query).scalars())
+
+    # protected
+    def _after_flush(self, session: Session, flush_context) -> None:
+        recipe_ids: set[int] = session.info.pop(PENDING_IDS_KEY, set())
+        removed_ids: set[int] = set()
+
+        for obj in chain(session.new, session.dirty):
+            if isinstance(obj, (RecipeTagComposite, RecipeIngredient)):
+                recipe_ids.add(obj.recipe_id)
+            elif isinstance(obj, Recipe) and (
+                obj in session.new or
+                _has_changes(obj, RECIPE_DOCUMENT_FIELDS)
+            ):
+                recipe_ids.add(obj.id)
+
+        for obj in session.deleted:
+            if isinstance(obj, (RecipeTagComposite, RecipeIngredient)):
+                recipe_ids.add(obj.recipe_id)
+            elif isinstance(obj, Recipe):
+                removed_ids.add(obj.id)
+
+        recipe_ids -= removed_ids
+        if not recipe_ids and not removed_ids:
+            return
+
+        connection = session.connection()
+        backend = self.get_backend(connection)
+
+        documents = load_documents(connection, recipe_ids)
+        removed_ids |= recipe_ids - documents.keys()
+
+        if backend.writes_in_transaction:
+            backend.remove(connection, list(removed_ids))
+            backend.upsert(connection, documents)
+            return
+
+        # applied to the in-process index after the commit
+        _, pending_documents, pending_removed_ids = session.info.setdefault(
+            PENDING_CHANGES_KEY, (backend, {}, set()))
+        for id in removed_ids:
+            pending_documents.pop(id, None)
+        pending_documents.update(documents)
+        pending_removed_ids.difference_update(documents)
+        pending_removed_ids.update(removed_ids)
+
+    # protected
+    def _after_commit(self, session: Session) -> None:
+        pending_changes = session.info.pop(PENDING_CHANGES_KEY, None)
+        if pending_changes is None:
+            return
+
+        backend, documents, removed_ids = pending_changes
+        backend.remove(None, list(removed_ids))
+        backend.upsert(None, documents)
+
+    # protected
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop(PENDING_IDS_KEY, None)
+        session.info.pop(PENDING_CHANGES_KEY, None)
+
+
+def _has_changes(obj: db.Model, fields: list[str]) -> bool:
+    attrs = inspect(obj).attrs
+    return any(attrs[field].history.has_changes() for field in fields)
+
+
+recipe_search = RecipeSearch(
+    backend_name=SEARCH_BACKEND,
+    max_results=SEARCH_MAX_RESULTS,
+    index_max_age=SEARCH_INDEX_MAX_AGE
+)
+recipe_search.register(db.metadata)
@@ -0,0 +1,24 @@
+import re
+import unicodedata
+
+
+# letters and digits, "_" separates tokens like in the FTS5 unicode61
+# tokenizer, so every backend splits a text into the same tokens
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+def normalize(text: str) -> str:
+    """
+    Case folded text without diacritics ("Crème" -> "creme").
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+
+    return stripped.casefold()
+
+
+def tokenize(text: str | None) -> list[str]:
+    if not text:
+        return []
+
+    return TOKEN_PATTERN.findall(normalize(text))
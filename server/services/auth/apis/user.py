@@ -7,7 +7,9 @@ from server.core.permissions.general import IsAdminOrStaff
 from server.services.auth.controller import auth_controller
 from server.core.models.api_models.user import user_model_public
 from server.core.models.api_models.auth import register_model_send
-from server.core.models.api_models.utils import error_model
+from server.core.models.api_models.utils import (
+    error_model, ids_model_send, qpp_fields_model, qpp_ids_model
+)
 from server.services.auth.controller.user import user_controller
 
 
@@ -51,6 +53,35 @@ class UserListAPI(Resource):
     # TODO: patch for adding /admin/user/ removing roles etc
 
 
+@ns.route("/batch")
+class UserBatchAPI(Resource):
+
+    @ns.expect(qpp_ids_model)
+    @ns.response(code=200, model=[user_model_public], description="User models by IDs (missing IDs in the 'X-Missing-Ids' header)")  # noqa
+    @ns.response(code=400, model=error_model, description="Wrong user input")
+    @ns.response(code=401, model=error_model, description="User unauthorized")  # noqa
+    @ns.response(code=500, model=error_model, description="Internal error message")  # noqa
+    @jwt_required()
+    def get(self):
+        return user_controller.handle_get_batch(
+            ids=request.args.get("ids"),
+            reqargs=request.args
+        )
+
+    @ns.expect(ids_model_send, qpp_fields_model)
+    @ns.response(code=200, model=[user_model_public], description="User models by IDs (missing IDs in the 'X-Missing-Ids' header)")  # noqa
+    @ns.response(code=400, model=error_model, description="Wrong user input")
+    @ns.response(code=401, model=error_model, description="User unauthorized")  # noqa
+    @ns.response(code=415, model=error_model, description="Unsupported Mediatype")  # noqa
+    @ns.response(code=500, model=error_model, description="Internal error message")  # noqa
+    @jwt_required()
+    def post(self):
+        return user_controller.handle_post_batch(
+            data=request.get_json(),
+            reqargs=request.args
+        )
+
+
 @ns.route("/me")
 class UserMeAPI(Resource):
 
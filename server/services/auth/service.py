@@ -7,8 +7,10 @@ from flask import Flask
 from flask_cors import CORS
 
 from server.db import db
-from server.api import api
+from server.db_routing import replica_router
+from server.api import api, EXPOSED_HEADERS
 from server.utils.jwt import jwt_manager
+from server.migrations.migrator import schema_migrator
 from server.utils.initialize.user_service import initialize_user_database  # noqa
 from server.core.models.db_models import (user)  # noqa - import all models for table initfrom server.api import api
 from server.services.heathcheck.apis.heathcheck import ns as ns_heathcheck
@@ -31,7 +33,10 @@ class FlaskConfig:
         minutes=int(os.environ.get("JWT_REFRESH_TOKEN_EXPIRES_MINUTES")))
 
 
-def create_app(database_uri: str = None) -> Flask:
+def create_app(
+        database_uri: str = None,
+        replica_database_uri: str = None
+) -> Flask:
     # Create app and configuration
     app = Flask(__name__)
     app.config.from_object(FlaskConfig)
@@ -40,8 +45,9 @@ def create_app(database_uri: str = None) -> Flask:
         app.config["SQLALCHEMY_DATABASE_URI"] = database_uri
 
     # init app
-    CORS(app)
+    CORS(app, expose_headers=EXPOSED_HEADERS)
     db.init_app(app)
+    replica_router.init_app(app, replica_database_uri)
     api.init_app(app)
     jwt_manager.init_app(app)
 
@@ -56,9 +62,8 @@ def create_app(database_uri: str = None) -> Flask:
         if is_debug:
             db.drop_all()
 
-        # TODO: Add DB-Migrations!
-        logger.info("-------------- CREATE TABLES --------------")
-        db.create_all()
+        logger.info("-------------- CHECK DB SCHEMA --------------")
+        schema_migrator.check_schema(db.engine)
 
         initialize_user_database(app)
 
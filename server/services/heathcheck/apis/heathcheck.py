@@ -1,5 +1,11 @@
 from flask_restx import Resource, Namespace
 from server.logger import logger
+from server.caching.redis import (
+    api_cache,
+    local_api_cache,
+    redis_circuit_breaker,
+    cache_invalidation_subscriber
+)
 
 
 ns = Namespace(
@@ -15,3 +21,20 @@ class Heathcheck(Resource):
     def get(self):
         logger.info("heathcheck requested.")
         return {"heathcheck": "ok"}, 200
+
+
+@ns.route("/heathcheck/cache")
+class CacheStats(Resource):
+
+    def get(self):
+        return {
+            "local": {
+                **local_api_cache.stats.to_dict(),
+                "size": len(local_api_cache),
+                "is_active": cache_invalidation_subscriber.is_subscribed
+            },
+            "redis": {
+                **api_cache.stats.to_dict(),
+                "circuit_breaker": redis_circuit_breaker.to_dict()
+            }
+        }, 200
@@ -14,3 +14,21 @@ def test_heathcheck(client: FlaskClient):
     # then
     assert status_code == 200
     assert res_data == {"heathcheck": "ok"}
+
+
+def test_heathcheck_cache_stats(client: FlaskClient):
+    # given
+    expected_keys = {"hits", "misses", "hit_rate"}
+
+    # when
+    response = client.get("/api/v1/heathcheck/cache")
+
+    status_code = response.status_code
+    res_data = json.loads(response.data.decode("utf-8"))
+
+    # then
+    assert status_code == 200
+    assert expected_keys.issubset(res_data["local"].keys())
+    assert expected_keys.issubset(res_data["redis"].keys())
+    assert "is_active" in res_data["local"]
+    assert "state" in res_data["redis"]["circuit_breaker"]
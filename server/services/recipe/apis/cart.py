@@ -4,10 +4,13 @@ from flask_jwt_extended import jwt_required
 
 from server.utils import jwt
 from server.utils import swagger as sui
-from server.core.models.api_models.utils import error_model
+from server.core.models.api_models.utils import (
+    bulk_result_model, error_model, qpp_fields_model
+)
 from server.core.models.api_models.cart import (
     cart_item_model, cart_item_model_send,
-    cart_model_detail, cart_model_send, user_shared_cart_model)
+    cart_model_detail, cart_model_list, cart_model_send, qpp_cart_model,
+    user_shared_cart_model)
 from server.services.recipe.controller.cart import (
     cart_controller, cart_item_controller,
     user_shared_cart_controller)
@@ -27,7 +30,8 @@ ns = Namespace(
 @ns.route("/")
 class CartListAPI(Resource):
 
-    @ns.response(code=200, model=[cart_model_detail], description=sui.desc_list(ns.name))       # noqa
+    @ns.expect(qpp_cart_model)
+    @ns.response(code=200, model=[cart_model_list], description=sui.desc_list(ns.name))         # noqa
     @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                      # noqa
     @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                       # noqa
     @jwt_required()
@@ -57,6 +61,7 @@ class CartListAPI(Resource):
 @ns.route("/<int:id>")
 class CartAPI(Resource):
 
+    @ns.expect(qpp_fields_model)
     @ns.response(code=200, model=cart_model_detail, description=sui.desc_get(ns.name))          # noqa
     @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                      # noqa
     @ns.response(code=404, model=error_model, description=sui.desc_notfound(ns.name))           # noqa
@@ -64,7 +69,10 @@ class CartAPI(Resource):
     @jwt_required()
     @IsCartOwnerOrCanEdit
     def get(self, id):
-        return cart_controller.handle_get(id)
+        return cart_controller.handle_get(
+            id=id,
+            reqargs=request.args
+        )
 
     @ns.expect(cart_model_send)
     @ns.response(code=200, model=cart_model_detail, description=sui.desc_update(ns.name))       # noqa
@@ -127,6 +135,26 @@ class CartItemListAPI(Resource):
         )
 
 
+@ns.route("/<int:id>/item/bulk")
+class CartItemBulkAPI(Resource):
+
+    @ns.expect([cart_item_model_send])
+    @ns.response(code=201, model=[bulk_result_model], description=sui.desc_added("CartItem"))   # noqa
+    @ns.response(code=207, model=[bulk_result_model], description=sui.DESC_BULK_PARTIAL)        # noqa
+    @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                       # noqa
+    @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                      # noqa
+    @ns.response(code=404, model=error_model, description=sui.desc_notfound("Cart"))            # noqa
+    @ns.response(code=415, model=error_model, description="Unsupported Mediatype")              # noqa
+    @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                       # noqa
+    @jwt_required()
+    @IsCartOwnerOrCanEdit
+    def post(self, id):
+        return cart_item_controller.handle_post_bulk(
+            data_list=request.get_json(),
+            fixed_data={"cart_id": id}
+        )
+
+
 @ns.route("/<int:id>/item/<int:item_id>")
 class CartItemAPI(Resource):
     @ns.expect(cart_item_model_send)
@@ -3,7 +3,7 @@ from flask_restx import Resource, Namespace
 from flask_jwt_extended import jwt_required
 
 from server.utils import swagger as sui
-from server.core.models.api_models.utils import error_model
+from server.core.models.api_models.utils import error_model, qpp_fields_model
 from server.core.permissions.general import IsAdminOrStaff
 from server.core.models.api_models.category import (
     category_model, category_model_send
@@ -46,13 +46,17 @@ class CategoryListAPI(Resource):
 @ns.route("/<int:id>")
 class CategoryAPI(Resource):
 
+    @ns.expect(qpp_fields_model)
     @ns.response(code=200, model=category_model, description=sui.desc_get(ns.name))             # noqa
     @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                      # noqa
     @ns.response(code=404, model=error_model, description=sui.desc_notfound(ns.name))           # noqa
     @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                       # noqa
     @jwt_required()
     def get(self, id):
-        return category_controller.handle_get(id)
+        return category_controller.handle_get(
+            id=id,
+            reqargs=request.args
+        )
 
     @ns.expect(category_model_send)
     @ns.response(code=200, model=category_model, description=sui.desc_update(ns.name))          # noqa
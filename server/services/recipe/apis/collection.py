@@ -4,9 +4,9 @@ from flask_jwt_extended import jwt_required
 
 from server.utils import jwt
 from server.utils import swagger as sui
-from server.core.models.api_models.utils import error_model
+from server.core.models.api_models.utils import error_model, qpp_fields_model
 from server.core.models.api_models.collection import (
-    collection_model, qpp_collection_model,
+    collection_model, collection_model_list, qpp_collection_model,
     collection_model_send, user_shared_collection_model,
     user_shared_collection_model_send)
 from server.services.recipe.controller.collection import (
@@ -31,7 +31,7 @@ ns = Namespace(
 class CollectionListAPI(Resource):
 
     @ns.expect(qpp_collection_model)
-    @ns.response(code=200, model=[collection_model], description=sui.desc_list(ns.name))        # noqa
+    @ns.response(code=200, model=[collection_model_list], description=sui.desc_list(ns.name))   # noqa
     @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                      # noqa
     @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                       # noqa
     @jwt_required()
@@ -61,6 +61,7 @@ class CollectionListAPI(Resource):
 @ns.route("/<int:id>")
 class CollectionAPI(Resource):
 
+    @ns.expect(qpp_fields_model)
     @ns.response(code=200, model=collection_model, description=sui.desc_get(ns.name))           # noqa
     @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                       # noqa
     @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                      # noqa
@@ -69,7 +70,10 @@ class CollectionAPI(Resource):
     @jwt_required()
     @IsCollectionOwnerOrHasAccess
     def get(self, id):
-        return collection_controller.handle_get(id)
+        return collection_controller.handle_get(
+            id=id,
+            reqargs=request.args
+        )
 
     @ns.expect(collection_model_send)
     @ns.response(code=200, model=collection_model, description=sui.desc_update(ns.name))        # noqa
@@ -3,7 +3,9 @@ from flask_restx import Resource, Namespace
 from flask_jwt_extended import jwt_required
 
 from server.utils import swagger as sui
-from server.core.models.api_models.utils import error_model
+from server.core.models.api_models.utils import (
+    error_model, ids_model_send, qpp_fields_model, qpp_ids_model
+)
 from server.core.permissions.general import IsAdminOrStaff
 from server.core.models.api_models.ingredient import (
     ingredient_model, qpp_ingredient_model,
@@ -43,9 +45,39 @@ class IngredientListAPI(Resource):
         )
 
 
+@ns.route("/batch")
+class IngredientBatchAPI(Resource):
+
+    @ns.expect(qpp_ids_model)
+    @ns.response(code=200, model=[ingredient_model], description=sui.desc_batch(ns.name))           # noqa
+    @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                           # noqa
+    @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                          # noqa
+    @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                           # noqa
+    @jwt_required()
+    def get(self):
+        return ingredient_controller.handle_get_batch(
+            ids=request.args.get("ids"),
+            reqargs=request.args
+        )
+
+    @ns.expect(ids_model_send, qpp_fields_model)
+    @ns.response(code=200, model=[ingredient_model], description=sui.desc_batch(ns.name))           # noqa
+    @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                           # noqa
+    @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                          # noqa
+    @ns.response(code=415, model=error_model, description="Unsupported Mediatype")                  # noqa
+    @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                           # noqa
+    @jwt_required()
+    def post(self):
+        return ingredient_controller.handle_post_batch(
+            data=request.get_json(),
+            reqargs=request.args
+        )
+
+
 @ns.route("/<int:id>")
 class IngredientAPI(Resource):
 
+    @ns.expect(qpp_fields_model)
     @ns.response(code=200, model=ingredient_model, description=sui.desc_get(ns.name))               # noqa
     @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                           # noqa
     @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                          # noqa
@@ -53,7 +85,10 @@ class IngredientAPI(Resource):
     @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                           # noqa
     @jwt_required()
     def get(self, id):
-        return ingredient_controller.handle_get(id)
+        return ingredient_controller.handle_get(
+            id=id,
+            reqargs=request.args
+        )
 
     @ns.expect(ingredient_model_send)
     @ns.response(code=200, model=ingredient_model, description=sui.desc_update(ns.name))            # noqa
@@ -4,18 +4,22 @@ from flask_jwt_extended import jwt_required
 
 from server.utils import jwt
 from server.utils import swagger as sui
-from server.core.models.api_models.utils import error_model
+from server.core.models.api_models.utils import error_model, qpp_fields_model
+from server.core.enums import access
 from server.core.models.api_models.planner import (
     qpp_recipe_planner_item_model,
-    qpp_recipe_planner_model, recipe_planner_item_model,
-    recipe_planner_item_model_send,
-    recipe_planner_model, recipe_planner_model_detail,
-    recipe_planner_model_send,
+    qpp_recipe_planner_model, qpp_shopping_list_model,
+    recipe_planner_item_model,
+    recipe_planner_item_model_send, recipe_planner_item_order_model_send,
+    recipe_planner_model_detail, recipe_planner_model_list,
+    recipe_planner_model_send, shopping_list_cart_model_send,
+    shopping_list_item_model,
     user_shared_recipe_planner_model, user_shared_recipe_planner_model_send)
 from server.services.recipe.controller.planner import (
     recipe_planner_controller,
     recipe_planner_item_controller, user_shared_recipe_planner_controller
 )
+from server.core.permissions.cart import cart_permission
 from server.core.permissions.planner import (
     IsRecipePlannerOwner,
     IsRecipePlannerOwnerOrCanEdit,
@@ -34,7 +38,7 @@ ns = Namespace(
 class RecipePlannerListAPI(Resource):
 
     @ns.expect(qpp_recipe_planner_model)
-    @ns.response(code=200, model=[recipe_planner_model_detail], description=sui.desc_list(ns.name)) # noqa
+    @ns.response(code=200, model=[recipe_planner_model_list], description=sui.desc_list(ns.name))   # noqa
     @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                          # noqa
     @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                           # noqa
     @jwt_required()
@@ -42,7 +46,7 @@ class RecipePlannerListAPI(Resource):
         return recipe_planner_controller.handle_get_list(
             reqargs=request.args,
             user_id=jwt.get_user_id(),
-            api_response_model=recipe_planner_model
+            api_response_model=recipe_planner_model_list
         )
 
     @ns.expect(recipe_planner_model_send)
@@ -65,6 +69,7 @@ class RecipePlannerListAPI(Resource):
 @ns.route("/<int:id>")
 class RecipePlannerAPI(Resource):
 
+    @ns.expect(qpp_fields_model)
     @ns.response(code=200, model=recipe_planner_model_detail, description=sui.desc_get(ns.name))    # noqa
     @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                           # noqa
     @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                          # noqa
@@ -73,7 +78,10 @@ class RecipePlannerAPI(Resource):
     @jwt_required()
     @IsRecipePlannerOwnerOrHasAccess
     def get(self, id):
-        return recipe_planner_controller.handle_get(id)
+        return recipe_planner_controller.handle_get(
+            id=id,
+            reqargs=request.args
+        )
 
     @ns.expect(recipe_planner_model_send)
     @ns.response(code=200, model=recipe_planner_model_detail, description=sui.desc_update(ns.name)) # noqa
@@ -177,6 +185,68 @@ class RecipePlannerChangeOrderAPI(Resource):
         )
 
 
+@ns.route("/<int:id>/item/order")
+class RecipePlannerItemOrderAPI(Resource):
+
+    @ns.expect(recipe_planner_item_order_model_send)
+    @ns.response(code=200, model=[recipe_planner_item_model], description="New order of the items of the date")  # noqa
+    @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                                       # noqa
+    @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                                      # noqa
+    @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                                       # noqa
+    @jwt_required()
+    @IsRecipePlannerOwnerOrCanEdit
+    def put(self, id):
+        return recipe_planner_item_controller.handle_put_order(
+            planner_id=id,
+            data=request.get_json()
+        )
+
+
+@ns.route("/<int:id>/shopping-list")
+class RecipePlannerShoppingListAPI(Resource):
+
+    @ns.expect(qpp_shopping_list_model)
+    @ns.response(code=200, model=[shopping_list_item_model], description="Summed up ingredients of the planned recipes")  # noqa
+    @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                                       # noqa
+    @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                                      # noqa
+    @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                                       # noqa
+    @jwt_required()
+    @IsRecipePlannerOwnerOrHasAccess
+    def get(self, id):
+        return recipe_planner_item_controller.handle_get_shopping_list(
+            planner_id=id,
+            reqargs=request.args
+        )
+
+    @ns.expect(shopping_list_cart_model_send, qpp_shopping_list_model)
+    @ns.response(code=201, model=[shopping_list_item_model], description="Ingredients added to the cart")       # noqa
+    @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                                       # noqa
+    @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                                      # noqa
+    @ns.response(code=404, model=error_model, description=sui.desc_notfound("Cart"))                            # noqa
+    @ns.response(code=415, model=error_model, description="Unsupported Mediatype")                              # noqa
+    @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                                       # noqa
+    @jwt_required()
+    @IsRecipePlannerOwnerOrHasAccess
+    def post(self, id):
+        data = request.get_json()
+
+        error_response = recipe_planner_item_controller.validate_shopping_list_cart(data)  # noqa
+        if error_response is not None:
+            return error_response
+
+        cart_id = data["cart_id"]
+
+        error_response = cart_permission.check(cart_id, access.EDIT)
+        if error_response is not None:
+            return error_response
+
+        return recipe_planner_item_controller.handle_post_shopping_list_cart(
+            planner_id=id,
+            reqargs=request.args,
+            cart_id=cart_id
+        )
+
+
 @ns.route("/<int:id>/access/user/<int:user_id>")
 class UserSharedRecipePlannerAPI(Resource):
 
@@ -3,15 +3,20 @@ from flask_restx import Resource, Namespace
 from flask_jwt_extended import jwt_required
 
 from server.utils import swagger as sui, jwt
-from server.core.models.api_models.utils import error_model
+from server.core.models.api_models.utils import (
+    bulk_result_model, error_model, ids_model_send, qpp_fields_model,
+    qpp_ids_model
+)
 from server.core.permissions.recipe import IsRecipeCreatorOrAdminOrStaff
 from server.core.models.api_models.recipe import (
     recipe_image_model, recipe_ingredient_model,
     recipe_ingredient_model_send, recipe_model_detail,
     qpp_recipe_model, recipe_model,
     recipe_model_send, recipe_rating_model, recipe_rating_model_agg,
-    qpp_recipe_rating_model,
-    recipe_rating_model_send, recipe_tag_model)
+    recipe_rating_model_agg_batch, qpp_recipe_rating_model,
+    qpp_recipe_rating_batch_model,
+    recipe_rating_model_send, recipe_tag_model,
+    recipe_ingredient_model_send_bulk, recipe_tag_model_send_bulk)
 from server.services.recipe.controller import (
     recipe_controller,
     recipe_ingredient_controller,
@@ -21,6 +26,7 @@ from server.services.recipe.controller import (
 from server.services.recipe.controller.recipe import (
     recipe_image_controller,
     recipe_rating_controller)
+from server.search.recipe_search import recipe_search
 
 
 ns = Namespace(
@@ -34,7 +40,7 @@ ns = Namespace(
 class RecipeListAPI(Resource):
 
     @ns.expect(qpp_recipe_model)
-    @ns.response(code=200, model=[recipe_model], description=sui.desc_list(ns.name))            # noqa
+    @ns.response(code=200, model=[recipe_model], description=f"{sui.desc_list(ns.name)} (a search only lists the {recipe_search.max_results} most relevant matches, else the 'X-Search-Truncated' header is set)")  # noqa
     @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                      # noqa
     @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                       # noqa
     @jwt_required()
@@ -61,9 +67,39 @@ class RecipeListAPI(Resource):
         return recipe_controller.handle_post(data)
 
 
+@ns.route("/batch")
+class RecipeBatchAPI(Resource):
+
+    @ns.expect(qpp_ids_model)
+    @ns.response(code=200, model=[recipe_model_detail], description=sui.desc_batch(ns.name))    # noqa
+    @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                       # noqa
+    @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                      # noqa
+    @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                       # noqa
+    @jwt_required()
+    def get(self):
+        return recipe_controller.handle_get_batch(
+            ids=request.args.get("ids"),
+            reqargs=request.args
+        )
+
+    @ns.expect(ids_model_send, qpp_fields_model)
+    @ns.response(code=200, model=[recipe_model_detail], description=sui.desc_batch(ns.name))    # noqa
+    @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                       # noqa
+    @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                      # noqa
+    @ns.response(code=415, model=error_model, description="Unsupported Mediatype")              # noqa
+    @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                       # noqa
+    @jwt_required()
+    def post(self):
+        return recipe_controller.handle_post_batch(
+            data=request.get_json(),
+            reqargs=request.args
+        )
+
+
 @ns.route("/<int:id>")
 class RecipeAPI(Resource):
 
+    @ns.expect(qpp_fields_model)
     @ns.response(code=200, model=recipe_model_detail, description=sui.desc_get(ns.name))        # noqa
     @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                       # noqa
     @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                      # noqa
@@ -71,7 +107,10 @@ class RecipeAPI(Resource):
     @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                       # noqa
     @jwt_required()
     def get(self, id):
-        return recipe_controller.handle_get(id)
+        return recipe_controller.handle_get(
+            id=id,
+            reqargs=request.args
+        )
 
     @ns.expect(recipe_model_send)
     @ns.response(code=200, model=recipe_model_detail, description=sui.desc_update(ns.name))     # noqa
@@ -99,6 +138,26 @@ class RecipeAPI(Resource):
         return recipe_controller.handle_delete(id)
 
 
+@ns.route("/<int:id>/tag")
+class RecipeTagBulkAPI(Resource):
+
+    @ns.expect([recipe_tag_model_send_bulk])
+    @ns.response(code=201, model=[bulk_result_model], description=sui.desc_added("RecipeTag"))   # noqa
+    @ns.response(code=207, model=[bulk_result_model], description=sui.DESC_BULK_PARTIAL)         # noqa
+    @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                        # noqa
+    @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                       # noqa
+    @ns.response(code=404, model=error_model, description=sui.desc_notfound("Recipe"))           # noqa
+    @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                        # noqa
+    @jwt_required()
+    @IsRecipeCreatorOrAdminOrStaff
+    def post(self, id):
+        return recipe_tag_controller.handle_post_bulk(
+            data_list=request.get_json(),
+            unique_primarykey_fields=["recipe_id", "tag_id"],
+            fixed_data={"recipe_id": id}
+        )
+
+
 @ns.route("/<int:id>/tag/<int:tag_id>")
 class RecipeTagAPI(Resource):
 
@@ -134,6 +193,27 @@ class RecipeTagAPI(Resource):
         )
 
 
+@ns.route("/<int:id>/ingredient")
+class RecipeIngredientBulkAPI(Resource):
+
+    @ns.expect([recipe_ingredient_model_send_bulk])
+    @ns.response(code=201, model=[bulk_result_model], description=sui.desc_added("RecipeIngredient"))   # noqa
+    @ns.response(code=207, model=[bulk_result_model], description=sui.DESC_BULK_PARTIAL)                # noqa
+    @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                               # noqa
+    @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                              # noqa
+    @ns.response(code=404, model=error_model, description=sui.desc_notfound("Recipe"))                  # noqa
+    @ns.response(code=415, model=error_model, description="Unsupported Mediatype")                      # noqa
+    @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                               # noqa
+    @jwt_required()
+    @IsRecipeCreatorOrAdminOrStaff
+    def post(self, id):
+        return recipe_ingredient_controller.handle_post_bulk(
+            data_list=request.get_json(),
+            unique_primarykey_fields=["recipe_id", "ingredient_id"],
+            fixed_data={"recipe_id": id}
+        )
+
+
 @ns.route("/<int:id>/ingredient/<int:ingredient_id>")
 class RecipeIngredientAPI(Resource):
 
@@ -245,6 +325,21 @@ class RecipeImageAPI(Resource):
         )
 
 
+@ns.route("/rating")
+class RecipeRatingBatchAPI(Resource):
+
+    @ns.expect(qpp_recipe_rating_batch_model)
+    @ns.response(code=200, model=[recipe_rating_model_agg_batch], description=sui.desc_list("RecipeRating"))   # noqa
+    @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                                     # noqa
+    @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                                    # noqa
+    @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                                     # noqa
+    @jwt_required()
+    def get(self):
+        return recipe_rating_controller.handle_get_batch(
+            reqargs=request.args
+        )
+
+
 @ns.route("/<int:id>/rating")
 class RecipeRatingAPI(Resource):
 
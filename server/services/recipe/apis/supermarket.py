@@ -9,7 +9,9 @@ from server.core.models.api_models.supermarket import (
     supermarket_area_model_send,
     supermarket_model, supermarket_model_detail, qpp_supermarket_model,
     supermarket_model_send)
-from server.core.models.api_models.utils import error_model
+from server.core.models.api_models.utils import (
+    error_model, order_model_send, qpp_fields_model
+)
 from server.services.recipe.controller.supermarket import (
     supermarket_area_controller,
     supermarket_area_ingredient_controller, supermarket_controller,
@@ -60,6 +62,7 @@ class SupermarketListAPI(Resource):
 @ns.route("/<int:id>")
 class SupermarketAPI(Resource):
 
+    @ns.expect(qpp_fields_model)
     @ns.response(code=200, model=supermarket_model_detail, description=sui.desc_get(ns.name))   # noqa
     @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                       # noqa
     @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                      # noqa
@@ -69,7 +72,8 @@ class SupermarketAPI(Resource):
     def get(self, id):
         return supermarket_controller.handle_get(
             id=id,
-            api_response_model=supermarket_model_detail
+            api_response_model=supermarket_model_detail,
+            reqargs=request.args
         )
 
     @ns.expect(supermarket_model_send)
@@ -172,6 +176,23 @@ class SupermarketAreaChangeOrderAPI(Resource):
         )
 
 
+@ns.route("/<int:id>/area/order")
+class SupermarketAreaOrderAPI(Resource):
+
+    @ns.expect(order_model_send)
+    @ns.response(code=200, model=[supermarket_area_model], description="New order of the areas")  # noqa
+    @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                          # noqa
+    @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                         # noqa
+    @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                          # noqa
+    @jwt_required()
+    @IsSupermarketOwnerOrCanEdit
+    def put(self, id):
+        return supermarket_area_controller.handle_put_order(
+            supermarket_id=id,
+            data=request.get_json()
+        )
+
+
 @ns.route("/<int:id>/area/<int:sarea_id>/ingredient/<int:ingredient_id>")
 class SupermarketAreaIngredientAPI(Resource):
 
@@ -3,7 +3,7 @@ from flask_restx import Resource, Namespace
 from flask_jwt_extended import jwt_required
 
 from server.utils import swagger as sui
-from server.core.models.api_models.utils import error_model
+from server.core.models.api_models.utils import error_model, qpp_fields_model
 from server.core.permissions.general import IsAdminOrStaff
 from server.core.models.api_models.tag import (
     tag_model, qpp_tag_model, tag_model_send
@@ -46,6 +46,7 @@ class TagListAPI(Resource):
 @ns.route("/<int:id>")
 class TagAPI(Resource):
 
+    @ns.expect(qpp_fields_model)
     @ns.response(code=200, model=tag_model, description=sui.desc_get(ns.name))              # noqa
     @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                   # noqa
     @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                  # noqa
@@ -53,7 +54,10 @@ class TagAPI(Resource):
     @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                   # noqa
     @jwt_required()
     def get(self, id):
-        return tag_controller.handle_get(id)
+        return tag_controller.handle_get(
+            id=id,
+            reqargs=request.args
+        )
 
     @ns.expect(tag_model_send)
     @ns.response(code=200, model=tag_model, description=sui.desc_update(ns.name))           # noqa
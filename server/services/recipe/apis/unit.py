@@ -4,7 +4,7 @@ from flask_jwt_extended import jwt_required
 
 from server.utils import swagger as sui
 from server.services.recipe.controller import unit_controller
-from server.core.models.api_models.utils import error_model
+from server.core.models.api_models.utils import error_model, qpp_fields_model
 from server.core.permissions.general import IsAdminOrStaff
 from server.core.models.api_models.unit import (
     unit_model, unit_model_send
@@ -46,6 +46,7 @@ class UnitListAPI(Resource):
 @ns.route("/<int:id>")
 class UnitAPI(Resource):
 
+    @ns.expect(qpp_fields_model)
     @ns.response(code=200, model=unit_model, description=sui.desc_get(ns.name))                 # noqa
     @ns.response(code=400, model=error_model, description=sui.DESC_INVUI)                       # noqa
     @ns.response(code=401, model=error_model, description=sui.DESC_UNAUTH)                      # noqa
@@ -53,7 +54,10 @@ class UnitAPI(Resource):
     @ns.response(code=500, model=error_model, description=sui.DESC_UNEXP)                       # noqa
     @jwt_required()
     def get(self, id):
-        return unit_controller.handle_get(id)
+        return unit_controller.handle_get(
+            id=id,
+            reqargs=request.args
+        )
 
     @ns.expect(unit_model_send)
     @ns.response(code=200, model=unit_model, description=sui.desc_update(ns.name))              # noqa
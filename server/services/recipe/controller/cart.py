@@ -1,12 +1,16 @@
 from flask import Response
+from sqlalchemy import insert
+from sqlalchemy.orm import with_expression
 
 from server.core.models.db_models.cart import (
     Cart, CartItem, UserSharedEditCart
 )
 from server.core.controller.crud_controller import BaseCrudController
+from server.core.permissions.cart import cart_permission
 from server.core.models.api_models.cart import (
-    cart_item_model, cart_item_model_send, cart_model,
-    cart_model_detail, cart_model_send, user_shared_cart_model)
+    cart_include_fields, cart_item_model, cart_item_model_send, cart_model,
+    cart_model_detail, cart_model_list, cart_model_send,
+    user_shared_cart_model)
 from server.core.models.db_models.recipe import Recipe
 from server.core.models.db_models.ingredient import Ingredient
 from server.errors import http_errors, errors
@@ -23,19 +27,18 @@ class CartController(BaseCrudController):
             user_id: int
     ) -> Response:
         try:
-            query_cart_owner = self._model.query.filter(
-                self._model.owner_user_id == user_id)
-
-            query_cart_shared = self._model.query \
-                .join(UserSharedEditCart) \
-                .filter(UserSharedEditCart.user_id == user_id)
-
-            query = query_cart_owner.union(query_cart_shared)
+            query = self._model.query \
+                .filter(cart_permission.create_access_filter(user_id)) \
+                .options(with_expression(
+                    self._model.role,
+                    cart_permission.create_role_expression(user_id)
+                ))
 
             return super().handle_get_list(
                 reqargs=reqargs,
                 query=query,
-                redis_addition_key=f"uid:{user_id}"
+                redis_addition_key=f"uid:{user_id}",
+                api_response_model=cart_model_list
             )
         except Exception as e:
             logger.error(e)
@@ -64,7 +67,19 @@ class CartController(BaseCrudController):
 
 
 class CartItemController(BaseCrudController):
-    pass
+    _model: CartItem
+
+    def insert_items(self, items: list[dict]) -> None:
+        """
+        Inserts the items with one bulk INSERT, without the checks of
+        handle_post_bulk (for items created by the server, like the
+        shopping list of a planner).
+        """
+        if items:
+            db.session.execute(insert(self._model), items)
+            db.session.commit()
+
+            self._clear_cache()
 
 
 class UserSharedCartController(BaseCrudController):
@@ -77,7 +92,16 @@ cart_controller = CartController(
     api_model_detail=cart_model_detail,
     api_model_send=cart_model_send,
     read_only_fields=["owner_user_id"],
-    unique_columns_together=["name", "owner_user_id"]
+    unique_columns_together=["name", "owner_user_id"],
+    cache_dependencies=[UserSharedEditCart],
+    access_resource=(Cart, "id"),
+    loader_profiles=[
+        (cart_model_detail, ["items.recipe", "items.ingredient.unit"])
+    ],
+    include_fields=cart_include_fields,
+    include_loader_paths={
+        "items": ["items.recipe", "items.ingredient.unit"]
+    }
 )
 
 cart_item_controller = CartItemController(
@@ -93,8 +117,7 @@ cart_item_controller = CartItemController(
         "cart_id",
         "recipe_id",
         "ingredient_id"
-    ],
-    clear_cache_models=[Cart]
+    ]
 )
 
 user_shared_cart_controller = UserSharedCartController(
@@ -106,5 +129,5 @@ user_shared_cart_controller = UserSharedCartController(
     ],
     read_only_fields=["cart_id", "user_id"],
     unique_columns_together=["cart_id", "user_id"],
-    clear_cache_models=[Cart]
+    access_resource=(Cart, "cart_id")
 )
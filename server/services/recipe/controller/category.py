@@ -4,7 +4,6 @@ from server.core.models.api_models.category import (
     category_model,
     category_model_send
 )
-from server.core.models.db_models.recipe import Recipe
 
 
 class CategoryController(BaseCrudController):
@@ -18,5 +17,5 @@ category_controller = CategoryController(
     api_model_send=category_model_send,
     unique_columns=["name"],
     search_fields=["name"],
-    clear_cache_models=[Recipe]
+    use_local_cache=True
 )
@@ -1,11 +1,13 @@
 from flask import Response
+from sqlalchemy.orm import with_expression
 
 from server.core.models.db_models.collection import (
     Collection, CollectionRecipeComposite,
     UserSharedCollection)
 from server.core.controller.crud_controller import BaseCrudController
+from server.core.permissions.collection import collection_permission
 from server.core.models.api_models.collection import (
-    collection_model,
+    collection_include_fields, collection_model, collection_model_list,
     collection_model_send, collection_recipe_model,
     user_shared_collection_model,
     user_shared_collection_model_send)
@@ -14,24 +16,32 @@ from server.errors import http_errors
 from server.logger import logger
 
 
+# relationships rendered by collection_model
+COLLECTION_LOADER_PATHS = [
+    "recipes_.recipe.category",
+    "recipes_.recipe.tags",
+    "recipes_.recipe.images",
+    "acl"
+]
+
+
 class CollectionController(BaseCrudController):
     _model: Collection
 
     def handle_get_list(self, reqargs: dict, user_id: int) -> Response:
         try:
-            query_collection_owner = self._model.query.filter(
-                self._model.owner_user_id == user_id)
-
-            query_collection_shared = self._model.query \
-                .join(UserSharedCollection) \
-                .filter(UserSharedCollection.user_id == user_id)
-
-            query = query_collection_owner.union(query_collection_shared)
+            query = self._model.query \
+                .filter(collection_permission.create_access_filter(user_id)) \
+                .options(with_expression(
+                    self._model.role,
+                    collection_permission.create_role_expression(user_id)
+                ))
 
             return super().handle_get_list(
                 reqargs=reqargs,
                 query=query,
-                redis_addition_key=f"uid:{user_id}"
+                redis_addition_key=f"uid:{user_id}",
+                api_response_model=collection_model_list
             )
         except Exception as e:
             logger.error(e)
@@ -55,7 +65,21 @@ collection_controller = CollectionController(
         "name",
         "owner_user_id"
     ],
-    read_only_fields=["owner_user_id"]
+    read_only_fields=["owner_user_id"],
+    cache_dependencies=[UserSharedCollection],
+    access_resource=(Collection, "id"),
+    loader_profiles=[
+        (collection_model, COLLECTION_LOADER_PATHS),
+        (collection_model_list, COLLECTION_LOADER_PATHS)
+    ],
+    include_fields=collection_include_fields,
+    include_loader_paths={
+        "recipes.ingredients": ["recipes_.recipe.ingredients.ingredient.unit"],  # noqa
+        "recipes.rating": [
+            "recipes_.recipe.rating_sum",
+            "recipes_.recipe.rating_count"
+        ]
+    }
 )
 
 collection_recipe_controller = CollectionRecipeController(
@@ -69,8 +93,7 @@ collection_recipe_controller = CollectionRecipeController(
     unique_columns_together=[
         "collection_id",
         "recipe_id"
-    ],
-    clear_cache_models=[Collection]
+    ]
 )
 
 user_shared_collection_controller = UserSharedCollectionController(
@@ -83,5 +106,6 @@ user_shared_collection_controller = UserSharedCollectionController(
     unique_columns_together=[
         "collection_id",
         "user_id"
-    ]
+    ],
+    access_resource=(Collection, "collection_id")
 )
@@ -2,11 +2,7 @@ from server.core.controller.crud_controller import BaseCrudController
 from server.core.models.api_models.ingredient import (
     ingredient_model, ingredient_model_send
 )
-from server.core.models.db_models.recipe import Recipe
-from server.core.models.db_models.planner import RecipePlanner
 from server.core.models.db_models.ingredient import Ingredient
-from server.core.models.db_models.cart import Cart
-from server.core.models.db_models.supermarket import Supermarket
 from server.core.models.db_models.unit import Unit
 
 
@@ -20,7 +16,7 @@ ingredient_controller = IngredientController(
     api_model_send=ingredient_model_send,
     unique_columns=["name"],
     search_fields=["name"],
-    clear_cache_models=[Recipe, RecipePlanner, Cart, Supermarket],
     foreign_key_columns=[(Unit, "unit_id")],
-    use_caching=True
+    use_caching=True,
+    use_local_cache=True
 )
@@ -1,27 +1,39 @@
+import math
 from typing import Any
 from datetime import date
 from dateutil import parser
 
 from datetime import datetime, timedelta
 from flask import Response
-from flask_restx import marshal
-from sqlalchemy import and_
+from flask_sqlalchemy.query import Query
+from sqlalchemy import Float, and_, cast, func
+from sqlalchemy.orm import joinedload, with_expression
 
 from server.errors import errors
 from server.core.controller.crud_controller import BaseCrudController
+from server.core.controller.order_rank import OrderRank
+from server.core.permissions.planner import recipe_planner_permission
 from server.core.models.db_models.planner import (
     RecipePlanner, RecipePlannerItem,
     UserSharedRecipePlanner)
-from server.core.models.db_models.recipe import Recipe
+from server.core.models.db_models.recipe import Recipe, RecipeIngredient
+from server.core.models.db_models.ingredient import Ingredient
 from server.errors import http_errors
 from server.logger import logger
+from server.utils.serializer import serialize
 from server.db import db
+from server.db_routing import replica_router
 from server.core.models.api_models.planner import (
-    recipe_planner_item_model,
+    recipe_planner_item_include_fields, recipe_planner_item_model,
     recipe_planner_item_model_send, recipe_planner_model,
     recipe_planner_model_detail,
-    recipe_planner_model_send, user_shared_recipe_planner_model,
+    recipe_planner_model_send, shopping_list_item_model,
+    user_shared_recipe_planner_model,
     user_shared_recipe_planner_model_send)
+from server.services.recipe.controller.cart import cart_item_controller
+
+
+SHOPPING_LIST_MAX_DAYS = 31
 
 
 class RecipePlannerController(BaseCrudController):
@@ -34,14 +46,13 @@ class RecipePlannerController(BaseCrudController):
             api_response_model: db.Model  # type: ignore
     ) -> Response:
         try:
-            query_planner_owner = self._model.query.filter(
-                self._model.owner_user_id == user_id)
-
-            query_planner_shared = self._model.query \
-                .join(UserSharedRecipePlanner) \
-                .filter(UserSharedRecipePlanner.user_id == user_id)
-
-            query = query_planner_owner.union(query_planner_shared)
+            permission = recipe_planner_permission
+            query = self._model.query \
+                .filter(permission.create_access_filter(user_id)) \
+                .options(with_expression(
+                    self._model.role,
+                    permission.create_role_expression(user_id)
+                ))
 
             return super().handle_get_list(
                 reqargs=reqargs,
@@ -56,6 +67,11 @@ class RecipePlannerController(BaseCrudController):
 
 class RecipePlannerItemController(BaseCrudController):
     _model: RecipePlannerItem
+    _order_rank = OrderRank(
+        model=RecipePlannerItem,
+        rank_column=RecipePlannerItem.order_number,
+        group_columns=[RecipePlannerItem.rplanner_id, RecipePlannerItem.date]
+    )
 
     def handle_get_list(
             self,
@@ -94,43 +110,20 @@ class RecipePlannerItemController(BaseCrudController):
             id: int,
             new_order_number: int
     ) -> Response:
+        """
+        Moves the item to the position new_order_number of its date, only
+        the item is updated (see OrderRank).
+        """
         try:
             rp_item_obj: RecipePlannerItem = self._find_object_by_id(id)
 
-            if new_order_number == rp_item_obj.order_number:
-                return marshal(rp_item_obj, self._api_model)
-
-            inc_number = 1
-            if new_order_number > rp_item_obj.order_number:
-                # new_order_number > area_obj.order_number
-                updating_rp_items = self._model.query.filter(
-                    and_(
-                        self._model.rplanner_id == rp_item_obj.rplanner_id,
-                        self._model.order_number > rp_item_obj.order_number,
-                        self._model.order_number <= new_order_number
-                    )
-                ).all()
-                inc_number = -1
-            else:
-                updating_rp_items = self._model.query.filter(
-                    and_(
-                        self._model.rplanner_id == rp_item_obj.rplanner_id,
-                        self._model.order_number < rp_item_obj.order_number,
-                        self._model.order_number >= new_order_number
-                    )
-                ).all()
-
-            updating_rp_item: RecipePlannerItem
-            for updating_rp_item in updating_rp_items:
-                updating_rp_item.order_number += inc_number
-
-            rp_item_obj.order_number = new_order_number
+            self._order_rank.move(rp_item_obj, new_order_number)
 
             db.session.commit()
 
             self._clear_cache()
 
-            return marshal(rp_item_obj, self._api_model)
+            return serialize(rp_item_obj, self._api_model)
 
         except errors.DbModelValidationException as e:
             return http_errors.bad_request(e)
@@ -142,13 +135,115 @@ class RecipePlannerItemController(BaseCrudController):
             logger.error(e)
             return http_errors.UNEXPECTED_ERROR_RESULT
 
+    def handle_put_order(self, planner_id: int, data: Any) -> Response:
+        if not isinstance(data, dict):
+            err_msg = "The body has to be an object with the fields 'date' and 'ids'."  # noqa
+            return http_errors.bad_request(err_msg)
+
+        try:
+            date_value = self._get_order_date(data.get("date"))
+
+            self._order_rank.set_order(
+                group_values={"rplanner_id": planner_id, "date": date_value},
+                ids=data.get("ids")
+            )
+
+            db.session.commit()
+
+            self._clear_cache()
+
+            rp_items = self._model.query \
+                .filter(
+                    self._model.rplanner_id == planner_id,
+                    self._model.date == date_value
+                ) \
+                .order_by(self._model.order_number) \
+                .all()
+            self._order_rank.load_positions(rp_items)
+
+            return serialize(rp_items, self._api_model), 200
+
+        except errors.ValueErrorGeneral as e:
+            return http_errors.bad_request(e)
+
+        except Exception as e:
+            logger.error(e)
+            return http_errors.UNEXPECTED_ERROR_RESULT
+
+    def handle_get_shopping_list(
+            self,
+            planner_id: int,
+            reqargs: dict
+    ) -> Response:
+        try:
+            with replica_router.reads(self._model):
+                shopping_list = self._get_shopping_list(planner_id, reqargs)
+
+            return shopping_list, 200
+
+        except errors.ValueErrorGeneral as e:
+            return http_errors.bad_request(e)
+
+        except Exception as e:
+            logger.error(e)
+            return http_errors.UNEXPECTED_ERROR_RESULT
+
+    def validate_shopping_list_cart(self, data: Any) -> Response | None:
+        """
+        The body has to be an object with the id of the cart, checked before
+        the permission of the cart.
+        """
+        if not isinstance(data, dict):
+            err_msg = "The body has to be an object with the id 'cart_id'."
+            return http_errors.bad_request(err_msg)
+
+        cart_id = data.get("cart_id")
+        if not isinstance(cart_id, int) or isinstance(cart_id, bool):
+            err_msg = "The field 'cart_id' has to be an integer."
+            return http_errors.bad_request(err_msg)
+
+        return None
+
+    def handle_post_shopping_list_cart(
+            self,
+            planner_id: int,
+            reqargs: dict,
+            cart_id: int
+    ) -> Response:
+        """
+        Adds the shopping list to the cart, the quantities are rounded up
+        to the whole numbers of the cart items.
+        """
+        try:
+            shopping_list = self._get_shopping_list(planner_id, reqargs)
+
+            cart_item_controller.insert_items([
+                {
+                    "cart_id": cart_id,
+                    "recipe_id": None,
+                    "ingredient_id": item["ingredient"]["id"],
+                    "quantity": math.ceil(item["quantity"]),
+                    "is_done": False
+                }
+                for item in shopping_list
+            ])
+
+            return shopping_list, 201
+
+        except errors.ValueErrorGeneral as e:
+            return http_errors.bad_request(e)
+
+        except Exception as e:
+            logger.error(e)
+            return http_errors.UNEXPECTED_ERROR_RESULT
+
     def handle_post(
             self,
             data: dict,
             unique_primarykey: Any = None
     ) -> Response:
         return super().handle_post(
-            data=self._transform_date(data),
+            data=self._assign_rank(self._transform_date(data)),
             unique_primarykey=unique_primarykey
         )
 
@@ -167,6 +262,132 @@ class RecipePlannerItemController(BaseCrudController):
             # if date is invalid, the validation will executed in super()
             return data
 
+    def _paginate_model_query(
+            self,
+            model_query: Query,
+            reqargs: dict
+    ) -> list:
+        rp_items = super()._paginate_model_query(model_query, reqargs)
+        self._order_rank.load_positions(rp_items)
+        return rp_items
+
+    def _assign_rank(self, data: dict) -> dict:
+        """
+        The order_number of a new item is its position within the date, the
+        rank is assigned here. Invalid values are passed on to the
+        validation of the model.
+        """
+        position = data.get("order_number") if isinstance(data, dict) else None  # noqa
+        if not isinstance(position, int) or position < 1:
+            return data
+
+        rplanner_id = data.get("rplanner_id")
+        if not isinstance(rplanner_id, int):
+            return data
+
+        try:
+            date_value = self._get_order_date(data.get("date"))
+        except errors.ValueErrorGeneral:
+            return data
+
+        rank = self._order_rank.rank_for_insert(
+            group_values={"rplanner_id": rplanner_id, "date": date_value},
+            position=position
+        )
+
+        return {**data, "order_number": rank}
+
+    def _get_shopping_list(self, planner_id: int, reqargs: dict) -> list:
+        """
+        Cached with the planner items, so every write of a planner item
+        drops it. Writes of the recipe ingredients only drop the shopping
+        lists of the planners with the recipe (see the
+        cache_scoped_dependencies).
+        """
+        date_from, date_to = self._get_date_range(reqargs)
+
+        redis_addition_key = f"/shopping-list/planner_id={planner_id},date_from={str(date_from)},date_to={str(date_to)}"  # noqa
+
+        return self._get_or_load_cache(
+            lambda: serialize(
+                self._query_shopping_list(planner_id, date_from, date_to),
+                shopping_list_item_model
+            ),
+            redis_addition_key,
+            scope=(RecipePlanner, planner_id)
+        )
+
+    def _query_shopping_list(
+            self,
+            planner_id: int,
+            date_from: date,
+            date_to: date
+    ) -> list[dict]:
+        """
+        One query: the ingredient quantities of the planned recipes, scaled
+        from the person count of the recipe to the planned one and summed
+        up per ingredient, joined with the ingredients and their units.
+        """
+        scaled_quantity = cast(RecipeIngredient.quantity, Float) \
+            * self._model.planned_recipe_person_count \
+            / Recipe.person_count
+
+        quantities = db.session.query(
+                RecipeIngredient.ingredient_id.label("ingredient_id"),
+                func.sum(scaled_quantity).label("quantity")
+            ) \
+            .select_from(self._model) \
+            .join(Recipe, Recipe.id == self._model.recipe_id) \
+            .join(RecipeIngredient, RecipeIngredient.recipe_id == Recipe.id) \
+            .filter(
+                self._model.rplanner_id == planner_id,
+                self._model.date >= date_from,
+                self._model.date <= date_to
+            ) \
+            .group_by(RecipeIngredient.ingredient_id) \
+            .subquery()
+
+        rows = db.session.query(Ingredient, quantities.c.quantity) \
+            .join(quantities, quantities.c.ingredient_id == Ingredient.id) \
+            .options(joinedload(Ingredient.unit)) \
+            .order_by(Ingredient.name) \
+            .all()
+
+        return [
+            {"ingredient": ingredient, "quantity": round(quantity, 2)}
+            for ingredient, quantity in rows
+        ]
+
+    def _get_date_range(self, reqargs: dict) -> tuple[date, date]:
+        """
+        date_from to date_to, the week of date_of_week otherwise.
+        """
+        date_from_str = reqargs.get("date_from")
+        date_to_str = reqargs.get("date_to")
+
+        if date_from_str is None and date_to_str is None:
+            return self._get_date_filter(reqargs.get("date_of_week"))
+
+        date_from = self._parse_date("date_from", date_from_str)
+        date_to = self._parse_date("date_to", date_to_str)
+
+        days = (date_to - date_from).days + 1
+        if days < 1 or days > SHOPPING_LIST_MAX_DAYS:
+            err_msg = f"The date range 'date_from' to 'date_to' needs 1 to {SHOPPING_LIST_MAX_DAYS} days."  # noqa
+            raise errors.ValueErrorGeneral(err_msg)
+
+        return date_from, date_to
+
+    def _get_order_date(self, date_str: str) -> date:
+        return self._parse_date("date", date_str)
+
+    def _parse_date(self, fieldname: str, date_str: str) -> date:
+        try:
+            return parser.parse(date_str).date()
+        except Exception:
+            err_msg = f"Field '{fieldname}' is invalid with value: '{date_str}'"  # noqa
+            raise errors.ValueErrorGeneral(err_msg)
+
     def _get_date_filter(self, date_of_week_str: str = None):
         try:
             date_of_week = datetime.today().date()
@@ -194,7 +415,9 @@ recipe_planner_controller = RecipePlannerController(
     api_model_send=recipe_planner_model_send,
     search_fields=["name"],
     unique_columns_together=["name", "owner_user_id"],
-    read_only_fields=["owner_user_id"]
+    read_only_fields=["owner_user_id"],
+    cache_dependencies=[UserSharedRecipePlanner],
+    access_resource=(RecipePlanner, "id")
 )
 
 recipe_planner_item_controller = RecipePlannerItemController(
@@ -206,12 +429,20 @@ recipe_planner_item_controller = RecipePlannerItemController(
         (RecipePlanner, "rplanner_id"),
         (Recipe, "recipe_id")
     ],
-    unique_columns_together=[
-        "rplanner_id",
-        "date",
-        "order_number"
+    loader_profiles=[
+        (recipe_planner_item_model, ["recipe.category"])
     ],
-    clear_cache_models=[RecipePlanner]
+    include_fields=recipe_planner_item_include_fields,
+    include_loader_paths={
+        "recipe.tags": ["recipe.tags"],
+        "recipe.images": ["recipe.images"],
+        "recipe.rating": ["recipe.rating_sum", "recipe.rating_count"]
+    },
+    cursor_sort_column="date",
+    # the shopping lists sum up the ingredients of the planned recipes
+    cache_scoped_dependencies=[
+        (RecipePlanner, "items_unsorted.recipe.ingredients.ingredient.unit")
+    ]
 )
 
 user_shared_recipe_planner_controller = UserSharedRecipePlannerController(
@@ -223,5 +454,5 @@ user_shared_recipe_planner_controller = UserSharedRecipePlannerController(
     ],
     read_only_fields=["rplanner_id", "user_id"],
     unique_columns_together=["rplanner_id", "user_id"],
-    clear_cache_models=[RecipePlanner]
+    access_resource=(RecipePlanner, "rplanner_id")
 )
@@ -3,7 +3,7 @@ import uuid
 
 from werkzeug.datastructures import FileStorage, ImmutableMultiDict
 
-from sqlalchemy import or_, and_, func
+from sqlalchemy import and_, case, false
 from flask import Response, send_file
 from flask_sqlalchemy.query import Query
 
@@ -14,10 +14,11 @@ from server.core.controller.crud_controller import (
     IController)
 from server.core.models.db_models.recipe import (
     Recipe, RecipeImage, RecipeIngredient,
-    RecipeRating, RecipeTagComposite, ReicpeImageComposite
+    RecipeRating, RecipeTagComposite, ReicpeImageComposite,
+    to_rating_aggregate
 )
 from server.core.models.api_models.recipe import (
-    recipe_image_model, recipe_ingredient_model,
+    recipe_image_model, recipe_include_fields, recipe_ingredient_model,
     recipe_ingredient_model_send, recipe_model,
     recipe_model_detail, recipe_model_send,
     recipe_rating_model, recipe_rating_model_send, recipe_tag_model)
@@ -25,9 +26,10 @@ from server.core.models.db_models.tag import Tag
 from server.core.models.db_models.ingredient import Ingredient
 from server.core.models.db_models.category import Category
 from server.logger import logger
-from server.core.models.db_models.collection import Collection
-from server.core.models.db_models.planner import RecipePlanner
-from server.core.models.db_models.cart import Cart
+from server.search.recipe_search import recipe_search
+
+
+RATING_BATCH_MAX_IDS = 100
 
 
 class RecipeController(BaseCrudController):
@@ -43,40 +45,38 @@ class RecipeController(BaseCrudController):
             difficulty_search = reqargs.get("difficulty")
             query: Query = self._model.query
 
+            is_search_truncated = False
             if search is not None:
-                search_str = f"%{search}%"
-
-                query_recipe = query.filter(
-                    or_(
-                        self._model.name.like(search_str),
-                        self._model.search_description.like(search_str),
-                        self._model.preperation_description.like(search_str)
+                # one more id than the cap, to tell if matches were cut off
+                max_results = recipe_search.max_results
+                recipe_ids = recipe_search.search(search, limit=max_results + 1)  # noqa
+                if recipe_ids is not None and len(recipe_ids) > max_results:
+                    is_search_truncated = True
+                    recipe_ids = recipe_ids[:max_results]
+
+                # most relevant recipes first
+                if recipe_ids:
+                    relevance = case(
+                        {id: rank for rank, id in enumerate(recipe_ids)},
+                        value=self._model.id
                     )
-                )
-
-                query_tag_search = query \
-                    .join(RecipeTagComposite) \
-                    .join(Tag) \
-                    .filter(Tag.name.like(search_str))
-
-                query_ingredient_search = query \
-                    .join(RecipeIngredient) \
-                    .join(Ingredient) \
-                    .filter(Ingredient.name.like(search_str))
-
-                query_category_search = query.join(Category).filter(
-                    Category.name.like(search_str)
-                )
-
-                query = query_recipe.union(query_tag_search) \
-                                    .union(query_ingredient_search) \
-                                    .union(query_category_search)
+                    query = query \
+                        .filter(self._model.id.in_(recipe_ids)) \
+                        .order_by(relevance)
+                elif recipe_ids is not None:
+                    query = query.filter(false())
 
             if difficulty_search is not None:
                 query = query.filter(Recipe.difficulty == difficulty_search)
 
-            return super().handle_get_list(
+            response = super().handle_get_list(
                 reqargs, query=query, api_response_model=api_response_model)
+
+            # pages and count only cover the most relevant matches
+            if is_search_truncated and len(response) == 3:
+                response[2]["X-Search-Truncated"] = "true"
+
+            return response
         except Exception as e:
             logger.error(e)
             return http_errors.UNEXPECTED_ERROR_RESULT
@@ -188,40 +188,62 @@ class RecipeRatingController(BaseCrudController):
 
     def handle_get(self, recipe_id: int, reqargs: dict) -> Response:
         try:
-            self._validate_recipe_existing(recipe_id)
-
             user_id = reqargs.get("user_id")
 
             if user_id:
+                self._validate_recipe_existing(recipe_id)
                 return self._handle_get_user_rating(recipe_id, user_id)
 
-            cache_data = self._get_cache()
-            if cache_data is not None:
-                return cache_data, 200
+            # existence and aggregate in one query
+            row = db.session.query(Recipe.rating_sum, Recipe.rating_count) \
+                .filter(Recipe.id == recipe_id) \
+                .first()
+
+            if row is None:
+                raise errors.DbModelNotFoundException(
+                    model=Recipe,
+                    id=recipe_id
+                )
+
+            return to_rating_aggregate(*row), 200
+
+        except errors.DbModelNotFoundException as e:
+            return http_errors.not_found(e)
 
-            rating_sum = db.session.query(func.sum(self._model.rating)) \
-                .filter(self._model.recipe_id == recipe_id) \
-                .scalar()
+        except Exception as e:
+            logger.error(e)
+            return http_errors.UNEXPECTED_ERROR_RESULT
 
-            rating_count = db.session.query(func.count(self._model.rating)) \
-                .filter(self._model.recipe_id == recipe_id) \
-                .scalar()
+    def handle_get_batch(self, reqargs: dict) -> Response:
+        """
+        Rating aggregates of many recipes, unknown recipe ids are skipped.
+        """
+        try:
+            recipe_ids = self._parse_ids(
+                reqargs.get("ids"),
+                max_ids=RATING_BATCH_MAX_IDS,
+                id_type=int
+            )
 
-            rating_avg = 0.
-            if rating_count > 0:
-                rating_avg = round(rating_sum / rating_count, 1)
+            rows = db.session.query(
+                Recipe.id,
+                Recipe.rating_sum,
+                Recipe.rating_count
+            ).filter(Recipe.id.in_(recipe_ids)).all()
 
-            response_data = {
-                "rating_avg": rating_avg,
-                "rating_count": rating_count
+            aggregates = {
+                id: to_rating_aggregate(rating_sum, rating_count)
+                for id, rating_sum, rating_count in rows
             }
 
-            self._set_cache(response_data)
+            return [
+                {"recipe_id": id, **aggregates[id]}
+                for id in recipe_ids
+                if id in aggregates
+            ], 200
 
-            return response_data, 200
-
-        except errors.DbModelNotFoundException as e:
-            return http_errors.not_found(e)
+        except errors.ValueErrorGeneral as e:
+            return http_errors.bad_request(e)
 
         except Exception as e:
             logger.error(e)
@@ -277,8 +299,28 @@ recipe_controller = RecipeController(
         (Category, "category_id")
     ],
     read_only_fields=["creator_user_id"],
-    clear_cache_models=[Collection, RecipePlanner, Cart],
-    use_caching=True  # CHANGE HERE
+    use_caching=True,  # CHANGE HERE
+    cache_soft_ttl=60 * 10,
+    cache_hard_ttl=60 * 60 * 6,
+    use_normalized_cache=True,
+    cache_list_fields=["difficulty", "category_id"],
+    access_resource=(Recipe, "id"),
+    loader_profiles=[
+        (recipe_model_detail, [
+            "category",
+            "ingredients.ingredient.unit",
+            "tags",
+            "images"
+        ])
+    ],
+    include_fields=recipe_include_fields,
+    include_loader_paths={
+        "category": ["category"],
+        "tags": ["tags"],
+        "images": ["images"],
+        "ingredients": ["ingredients.ingredient.unit"],
+        "rating": ["rating_sum", "rating_count"]
+    }
 )
 
 recipe_ingredient_controller = RecipeIngredientController(
@@ -290,8 +332,7 @@ recipe_ingredient_controller = RecipeIngredientController(
         (Ingredient, "ingredient_id")
     ],
     read_only_fields=["recipe_id", "ingredient_id"],
-    unique_columns_together=["recipe_id", "ingredient_id"],
-    clear_cache_models=[Recipe, Collection, RecipePlanner]
+    unique_columns_together=["recipe_id", "ingredient_id"]
 )
 
 recipe_tag_controller = RecipeTagController(
@@ -303,8 +344,7 @@ recipe_tag_controller = RecipeTagController(
         (Tag, "tag_id")
     ],
     read_only_fields=["recipe_id", "tag_id"],
-    unique_columns_together=["recipe_id", "tag_id"],
-    clear_cache_models=[Recipe, Collection]
+    unique_columns_together=["recipe_id", "tag_id"]
 )
 
 image_controller = ImageController()
@@ -318,8 +358,7 @@ recipe_image_controller = RecipeImageController(
         (Recipe, "recipe_id")
     ],
     read_only_fields=["recipe_id", "image_id"],
-    unique_columns_together=["recipe_id", "image_id"],
-    clear_cache_models=[Recipe, Collection]
+    unique_columns_together=["recipe_id", "image_id"]
 )
 
 recipe_rating_controller = RecipeRatingController(
@@ -330,5 +369,7 @@ recipe_rating_controller = RecipeRatingController(
         (Recipe, "recipe_id")
     ],
     read_only_fields=["user_id", "recipe_id"],
-    unique_columns_together=["user_id", "recipe_id"]
+    unique_columns_together=["user_id", "recipe_id"],
+    # the aggregates are read from the denormalized recipe columns
+    use_caching=False
 )
@@ -1,9 +1,12 @@
+from typing import Any
+
 from flask import Response
-from flask_restx import marshal
-from sqlalchemy import or_, and_
+from flask_sqlalchemy.query import Query
+from sqlalchemy import or_
 
 from server.errors import errors
 from server.core.controller.crud_controller import BaseCrudController
+from server.core.controller.order_rank import OrderRank
 from server.core.models.db_models.supermarket import (
     Supermarket, SupermarketArea,
     SupermarketAreaIngredientComposite, UserSharedEditSupermarket)
@@ -16,6 +19,7 @@ from server.core.models.api_models.supermarket import (
 from server.core.models.db_models.ingredient import Ingredient
 from server.errors import http_errors
 from server.logger import logger
+from server.utils.serializer import serialize
 from server.db import db
 
 
@@ -58,6 +62,11 @@ class SupermarketController(BaseCrudController):
 
 class SupermarketAreaController(BaseCrudController):
     _model: SupermarketArea
+    _order_rank = OrderRank(
+        model=SupermarketArea,
+        rank_column=SupermarketArea.order_number,
+        group_columns=[SupermarketArea.supermarket_id]
+    )
 
     def handle_get_list(
             self,
@@ -76,47 +85,35 @@ class SupermarketAreaController(BaseCrudController):
             logger.error(e)
             return http_errors.UNEXPECTED_ERROR_RESULT
 
+    def handle_post(
+            self,
+            data: dict,
+            unique_primarykey: Any = None
+    ) -> Response:
+        return super().handle_post(
+            data=self._assign_rank(data),
+            unique_primarykey=unique_primarykey
+        )
+
     def handle_post_change_order(
             self,
             id: int,
             new_order_number: int
     ) -> Response:
+        """
+        Moves the area to the position new_order_number, only the area is
+        updated (see OrderRank).
+        """
         try:
             area_obj: SupermarketArea = self._find_object_by_id(id)
 
-            if new_order_number == area_obj.order_number:
-                return marshal(area_obj, self._api_model)
-
-            inc_number = 1
-            if new_order_number > area_obj.order_number:
-                updating_areas = self._model.query.filter(
-                    and_(
-                        self._model.supermarket_id == area_obj.supermarket_id,
-                        self._model.order_number > area_obj.order_number,
-                        self._model.order_number <= new_order_number
-                    )
-                ).all()
-                inc_number = -1
-            else:
-                updating_areas = self._model.query.filter(
-                    and_(
-                        self._model.supermarket_id == area_obj.supermarket_id,
-                        self._model.order_number < area_obj.order_number,
-                        self._model.order_number >= new_order_number
-                    )
-                ).all()
-
-            updating_area: SupermarketArea
-            for updating_area in updating_areas:
-                updating_area.order_number += inc_number
-
-            area_obj.order_number = new_order_number
+            self._order_rank.move(area_obj, new_order_number)
 
             db.session.commit()
 
             self._clear_cache()
 
-            return marshal(area_obj, self._api_model)
+            return serialize(area_obj, self._api_model)
 
         except errors.DbModelValidationException as e:
             return http_errors.bad_request(e)
@@ -128,6 +125,65 @@ class SupermarketAreaController(BaseCrudController):
             logger.error(e)
             return http_errors.UNEXPECTED_ERROR_RESULT
 
+    def handle_put_order(self, supermarket_id: int, data: Any) -> Response:
+        if not isinstance(data, dict):
+            err_msg = "The body has to be an object with the list 'ids'."
+            return http_errors.bad_request(err_msg)
+
+        try:
+            self._order_rank.set_order(
+                group_values={"supermarket_id": supermarket_id},
+                ids=data.get("ids")
+            )
+
+            db.session.commit()
+
+            self._clear_cache()
+
+            areas = self._model.query \
+                .filter(self._model.supermarket_id == supermarket_id) \
+                .order_by(self._model.order_number) \
+                .all()
+            self._order_rank.load_positions(areas)
+
+            return serialize(areas, self._api_model), 200
+
+        except errors.ValueErrorGeneral as e:
+            return http_errors.bad_request(e)
+
+        except Exception as e:
+            logger.error(e)
+            return http_errors.UNEXPECTED_ERROR_RESULT
+
+    def _paginate_model_query(
+            self,
+            model_query: Query,
+            reqargs: dict
+    ) -> list:
+        areas = super()._paginate_model_query(model_query, reqargs)
+        self._order_rank.load_positions(areas)
+        return areas
+
+    def _assign_rank(self, data: dict) -> dict:
+        """
+        The order_number of a new area is its position, the rank is assigned
+        here. Invalid values are passed on to the validation of the model.
+        """
+        position = data.get("order_number") if isinstance(data, dict) else None  # noqa
+        if not isinstance(position, int) or position < 1:
+            return data
+
+        supermarket_id = data.get("supermarket_id")
+        if not isinstance(supermarket_id, int):
+            return data
+
+        rank = self._order_rank.rank_for_insert(
+            group_values={"supermarket_id": supermarket_id},
+            position=position
+        )
+
+        return {**data, "order_number": rank}
+
 
 class SupermarketAreaIngredientController(BaseCrudController):
     pass
@@ -143,7 +199,11 @@ supermarket_controller = SupermarketController(
     api_model_detail=supermarket_model_detail,
     api_model_send=supermarket_model_send,
     read_only_fields=["owner_user_id"],
-    unique_columns_together=["name", "street"]
+    unique_columns_together=["name", "street"],
+    access_resource=(Supermarket, "id"),
+    loader_profiles=[
+        (supermarket_model_detail, ["areas_unsorted.ingredients.ingredient"])
+    ]
 )
 
 supermarket_area_controller = SupermarketAreaController(
@@ -154,11 +214,9 @@ supermarket_area_controller = SupermarketAreaController(
         (Supermarket, "supermarket_id")
     ],
     unique_columns_together=[
-        ["supermarket_id", "name"],
-        ["supermarket_id", "order_number"]
+        ["supermarket_id", "name"]
     ],
-    read_only_fields=["order_number"],
-    clear_cache_models=[Supermarket]
+    read_only_fields=["order_number"]
 )
 
 supermarket_area_ingredient_controller = SupermarketAreaIngredientController(
@@ -176,8 +234,7 @@ supermarket_area_ingredient_controller = SupermarketAreaIngredientController(
     unique_columns_together=[
         "sarea_id",
         "ingredient_id"
-    ],
-    clear_cache_models=[Supermarket, SupermarketArea]
+    ]
 )
 
 user_shared_edit_supermarket_controller = UserSharedEditSupermarketController(
@@ -186,5 +243,6 @@ user_shared_edit_supermarket_controller = UserSharedEditSupermarketController(
     api_model_send=supermarket_user_edit_model,
     foreign_key_columns=[
         (Supermarket, "supermarket_id")
-    ]
+    ],
+    access_resource=(Supermarket, "supermarket_id")
 )
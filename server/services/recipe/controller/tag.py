@@ -3,8 +3,6 @@ from server.core.models.db_models.tag import Tag
 from server.core.models.api_models.tag import (
     tag_model, tag_model_send
 )
-from server.core.models.db_models.recipe import Recipe
-from server.core.models.db_models.collection import Collection
 
 
 class TagController(BaseCrudController):
@@ -17,6 +15,6 @@ tag_controller = TagController(
     api_model_send=tag_model_send,
     unique_columns=["name"],
     search_fields=["name"],
-    clear_cache_models=[Recipe, Collection],
-    use_caching=True
+    use_caching=True,
+    use_local_cache=True
 )
@@ -7,8 +7,11 @@ from flask import Flask
 from flask_cors import CORS
 
 from server.db import db
-from server.api import api
+from server.db_routing import replica_router
+from server.api import api, EXPOSED_HEADERS
 from server.utils.jwt import jwt_manager
+from server.caching.composite import caching_model_graph
+from server.migrations.migrator import schema_migrator
 from server.utils.initialize.recipe_service import initialize_dummy_database  # noqa
 from server.core.models.db_models import (cart, recipe, planner, supermarket)  # noqa - import all models for table initfrom server.api import api
 from server.services.heathcheck.apis.heathcheck import ns as ns_heathcheck
@@ -35,7 +38,10 @@ class FlaskConfig:
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(minutes=int(os.environ.get("JWT_REFRESH_TOKEN_EXPIRES_MINUTES")))  # noqa
 
 
-def create_app(database_uri: str = None) -> Flask:
+def create_app(
+        database_uri: str = None,
+        replica_database_uri: str = None
+) -> Flask:
     # Create app and configuration
     app = Flask(__name__)
     app.config.from_object(FlaskConfig)
@@ -44,8 +50,9 @@ def create_app(database_uri: str = None) -> Flask:
         app.config["SQLALCHEMY_DATABASE_URI"] = database_uri
 
     # init app
-    CORS(app)
+    CORS(app, expose_headers=EXPOSED_HEADERS)
     db.init_app(app)
+    replica_router.init_app(app, replica_database_uri)
     api.init_app(app)
     jwt_manager.init_app(app)
 
@@ -61,15 +68,17 @@ def create_app(database_uri: str = None) -> Flask:
     api.add_namespace(ns_planner)
     api.add_namespace(ns_cart)
 
+    # cache invalidation of the models, which embed each other
+    caching_model_graph.build()
+
     is_debug = os.environ.get("DEBUG", False)
 
     with app.app_context():
         if is_debug:
             db.drop_all()
 
-        # TODO: Add DB Migrations!
-        logger.info("-------------- CREATE TABLES --------------")
-        db.create_all()
+        logger.info("-------------- CHECK DB SCHEMA --------------")
+        schema_migrator.check_schema(db.engine)
 
         if is_debug:
             # initialize db with starting data
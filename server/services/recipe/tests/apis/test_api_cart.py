@@ -2,6 +2,9 @@
 import json
 
 from flask import Flask, testing
+from sqlalchemy import event
+
+from server.db import db
 from server.core.models.db_models.cart import Cart, CartItem, UserSharedEditCart
 from server.core.models.db_models.user.user import User
 from server.services.recipe.tests.apis.test_api_ingredient import (
@@ -344,7 +347,7 @@ def test_cart_get_list_authorization(
         # given
         create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -486,7 +489,7 @@ def test_cart_item_post(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -522,6 +525,97 @@ def test_cart_item_post(
         assert result_data["ingredient"]["id"] == result_data_db["ingredient_id"]
 
 
+def test_cart_item_post_single_validation_query(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        cart = create_obj(
+            Cart(
+                name="CartName",
+                owner_user_id=user.id,
+                is_active=True
+            )
+        )
+        recipe = create_recipe(user.id)
+        ingredient = create_ingredient()
+        data = {
+            "recipe_id": recipe.id,
+            "ingredient_id": ingredient.id,
+            "quantity": 2,
+            "is_done": True,
+        }
+        data_invalid = data | {"ingredient_id": ingredient.id + 1}
+        api_route = f"{ROUTE}/{cart.id}/item"
+        executed_queries = []
+
+        def count_select_queries(conn, cursor, statement, *args):
+            if statement.startswith("SELECT"):
+                executed_queries.append(statement)
+
+        # when
+        event.listen(db.engine, "before_cursor_execute", count_select_queries)
+        try:
+            response = client.post(api_route, headers=headers, json=data)
+            validation_queries = [q for q in executed_queries if "EXISTS" in q]
+            response_invalid = client.post(api_route, headers=headers, json=data_invalid)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count_select_queries)
+
+        # then
+        assert response.status_code == 201
+        assert len(validation_queries) == 1
+        assert response_invalid.status_code == 404
+        assert "ingredient_id" in json.loads(response_invalid.data)["message"]
+
+
+def test_cart_item_post_bulk(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict],
+        user_2: tuple[User, dict]
+):
+    user, headers = user
+    user_2, headers_2 = user_2
+    with app.app_context():
+        # given
+        cart = create_obj(
+            Cart(
+                name="CartName",
+                owner_user_id=user.id,
+                is_active=True
+            )
+        )
+        recipe = create_recipe(user.id)
+        ingredient = create_ingredient()
+        data = [
+            {
+                "recipe_id": recipe.id,
+                "ingredient_id": ingredient.id,
+                "quantity": i + 1,
+                "is_done": False,
+            }
+            for i in range(3)
+        ]
+        api_route = f"{ROUTE}/{cart.id}/item/bulk"
+
+        # when
+        response = client.post(api_route, headers=headers, json=data)
+        response_other = client.post(api_route, headers=headers_2, json=data)
+
+        resp_data = json.loads(response.data)
+        result_data_db = CartItem.query.filter_by(cart_id=cart.id).all()
+
+        # then
+        assert response.status_code == 201
+        assert response_other.status_code == 401
+        assert [r["data"]["quantity"] for r in resp_data] == [1, 2, 3]
+        assert [r["data"]["id"] for r in resp_data] == [item.id for item in result_data_db]
+
+
 def test_cart_item_post_invalid_id(
         app: Flask,
         client: testing.FlaskClient,
@@ -556,7 +650,7 @@ def test_cart_item_post_authorization(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -604,7 +698,7 @@ def test_cart_item_post_invalid_payload(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -686,7 +780,7 @@ def test_cart_shared_user_post(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -739,7 +833,7 @@ def test_cart_shared_user_post_authorization(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -773,7 +867,7 @@ def test_cart_shared_user_post_invalid_payload(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -801,7 +895,7 @@ def test_cart_patch(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -853,7 +947,7 @@ def test_cart_patch_authorization(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -899,7 +993,7 @@ def test_cart_patch_invalid_payload(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1014,7 +1108,7 @@ def test_cart_item_patch_authorization(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1069,7 +1163,7 @@ def test_cart_item_patch_invalid_payload(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1121,7 +1215,7 @@ def test_cart_delete(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1170,14 +1264,14 @@ def test_cart_delete_authorization(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
         )
         cart_2 = create_obj(
             Cart(
-                name=f"CartName2",
+                name="CartName2",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1215,7 +1309,7 @@ def test_cart_item_delete(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1253,7 +1347,7 @@ def test_cart_item_delete_invalid_id(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1286,7 +1380,7 @@ def test_cart_item_delete_authorization(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1358,7 +1452,7 @@ def test_cart_shared_user_delete(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1395,7 +1489,7 @@ def test_cart_shared_user_delete_invalid_id(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1437,7 +1531,7 @@ def test_cart_shared_user_delete_authorization(
         # given
         cart = create_obj(
             Cart(
-                name=f"CartName",
+                name="CartName",
                 owner_user_id=user.id,
                 is_active=True
             )
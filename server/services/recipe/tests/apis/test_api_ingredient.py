@@ -2,8 +2,12 @@
 import json
 
 from flask import Flask, testing
+from flask_restx import fields
+from sqlalchemy import event
 
 from server.db import db
+from server.api import api
+from server.services.recipe.controller.ingredient import ingredient_controller
 from server.services.recipe.tests.apis.test_api_unit import create_unit
 from server.core.models.db_models.ingredient import Ingredient
 from server.core.models.db_models.unit import Unit
@@ -225,6 +229,76 @@ def test_ingredient_get_list_authorization(
         assert result_data_admin == expected_data
 
 
+def test_ingredient_get_list_cursor_pagination(
+        app: Flask,
+        client: testing.FlaskClient,
+        admin_headers: dict
+):
+    with app.app_context():
+        # given
+        COUNT = 5
+        PAGE_SIZE = 2
+        unit = create_unit()
+        ingredients = [create_ingredient_loop(i, unit) for i in range(0, COUNT)]
+        executed_queries = []
+
+        def count_ingredient_queries(conn, cursor, statement, *args):
+            if "FROM ingredient" in statement and "LIMIT" in statement:
+                executed_queries.append(statement)
+
+        # when
+        pages = []
+        cursor = ""
+        event.listen(db.engine, "before_cursor_execute", count_ingredient_queries)
+        try:
+            while cursor is not None:
+                response = client.get(
+                    f"{ROUTE}/?page_size={PAGE_SIZE}&cursor={cursor}&count=true",
+                    headers=admin_headers
+                )
+                pages.append(json.loads(response.data))
+                cursor = response.headers.get("X-Next-Cursor")
+                total_count = response.headers.get("X-Total-Count")
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count_ingredient_queries)
+
+        response_invalid = client.get(f"{ROUTE}/?cursor=invalid", headers=admin_headers)
+
+        # then
+        assert [[i["id"] for i in page] for page in pages] == [
+            [ingredients[0].id, ingredients[1].id],
+            [ingredients[2].id, ingredients[3].id],
+            [ingredients[4].id]
+        ]
+        assert total_count == str(COUNT)
+        # pages after the first one seek to the cursor
+        assert len(executed_queries) == len(pages)
+        assert all("ingredient.id > ?" in statement for statement in executed_queries[1:])
+        assert response_invalid.status_code == 400
+
+
+def test_ingredient_get_list_cursor_pagination_without_cursor_fields(
+        app: Flask,
+        admin_headers: dict
+):
+    with app.test_request_context(headers=admin_headers):
+        # given
+        unit = create_unit()
+        create_ingredient_loop(0, unit)
+        api_model_without_id = api.model("IngredientModelWithoutId", {
+            "name": fields.String
+        })
+
+        # when
+        _, status_code = ingredient_controller.handle_get_list(
+            reqargs={"cursor": "", "page_size": 1},
+            api_response_model=api_model_without_id
+        )
+
+        # then
+        assert status_code == 400
+
+
 # TEST-POST
 
 
@@ -1,24 +1,87 @@
 # flake8: noqa
+import re
 import json
+import pytest
 
 from datetime import timedelta, datetime
 from flask import Flask, testing
+from sqlalchemy import event
 import server.core.models.db_models
 from server.core.models.db_models.planner import (
     RecipePlanner, RecipePlannerItem, UserSharedRecipePlanner
 )
 from server.core.models.db_models.user.user import User
+from server.core.models.db_models.cart import Cart, CartItem
+from server.core.models.db_models.recipe import RecipeIngredient
 from server.services.recipe.tests.apis.test_api_ingredient import (
-    create_ingredient
+    create_ingredient, create_ingredient_loop
 )
-from server.services.recipe.tests.apis.test_api_recipe import create_recipe
+from server.services.recipe.tests.apis.test_api_recipe import (
+    create_recipe, create_recipe_in_loop
+)
+from server.services.recipe.tests.apis.test_api_unit import create_unit
+from server.services.recipe.tests.apis.test_api_category import create_category
 from server.services.recipe.tests.utils import create_obj
+from server.core.controller.order_rank import ORDER_RANK_GAP
 from server.db import db
-from server.core.tests.conftest import staff_headers
+from server.caching.redis import api_access_cache
 
 
 ROUTE = "/api/v1/planner"
 
+def create_shopping_list_planner(owner_user_id):
+    """
+    Recipe 0 (2 persons): ingredient 0 (100) and 1 (50),
+    recipe 1 (4 persons): ingredient 0 (200).
+    Planned in the week of 2024-01-01: recipe 0 for 4 and recipe 1 for 2
+    persons, recipe 0 again in the next week.
+    """
+    category = create_category()
+    unit = create_unit()
+    ingredients = [create_ingredient_loop(i, unit) for i in range(2)]
+    recipes = [create_recipe_in_loop(i, owner_user_id, category) for i in range(2)]
+    recipes[1].person_count = 4
+    db.session.commit()
+
+    for recipe, ingredient, quantity in [
+        (recipes[0], ingredients[0], 100),
+        (recipes[0], ingredients[1], 50),
+        (recipes[1], ingredients[0], 200)
+    ]:
+        create_obj(
+            RecipeIngredient(
+                recipe_id=recipe.id,
+                ingredient_id=ingredient.id,
+                quantity=quantity
+            )
+        )
+
+    planner = create_obj(
+        RecipePlanner(
+            name="RecipePlannerName",
+            owner_user_id=owner_user_id,
+            is_active=True
+        )
+    )
+    for recipe, date, person_count in [
+        (recipes[0], "2024-01-01", 4),
+        (recipes[1], "2024-01-02", 2),
+        (recipes[0], "2024-01-08", 2)
+    ]:
+        create_obj(
+            RecipePlannerItem(
+                rplanner_id=planner.id,
+                recipe_id=recipe.id,
+                date=date,
+                label="Abendessen",
+                order_number=1,
+                planned_recipe_person_count=person_count
+            )
+        )
+
+    return planner, ingredients
+
+
 # TEST GET
 
 #   PLANNER
@@ -66,6 +129,51 @@ def test_planner_get(
         assert "items" not in result_data
 
 
+def test_planner_get_shared_user_single_permission_query(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict],
+        user_2: tuple[User, dict]
+):
+    user, headers = user
+    user_2, headers_2 = user_2
+    with app.app_context():
+        # given
+        planner = create_obj(
+            RecipePlanner(
+                name="RecipePlannerName",
+                owner_user_id=user.id,
+                is_active=True
+            )
+        )
+        create_obj(
+            UserSharedRecipePlanner(
+                rplanner_id=planner.id,
+                user_id=user_2.id,
+                can_edit=False
+            )
+        )
+        api_route = f"{ROUTE}/{planner.id}"
+        executed_queries = []
+
+        def count_planner_queries(conn, cursor, statement, *args):
+            if re.search(r"FROM rplanner\b", statement):
+                executed_queries.append(statement)
+
+        # when
+        event.listen(db.engine, "before_cursor_execute", count_planner_queries)
+        try:
+            response = client.get(api_route, headers=headers_2)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count_planner_queries)
+
+        # then
+        assert response.status_code == 200
+        assert json.loads(response.data)["name"] == "RecipePlannerName"
+        assert len(executed_queries) == 1
+        assert "rplanner_user" in executed_queries[0]
+
+
 def test_planner_get_invalid_id(
         app: Flask,
         client: testing.FlaskClient,
@@ -202,7 +310,7 @@ def test_planner_get_list_authorization(
         # given
         create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -218,6 +326,59 @@ def test_planner_get_list_authorization(
         assert response_user.status_code == 200
 
 
+def test_planner_get_list_roles(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict],
+        user_2: tuple[User, dict]
+):
+    user, headers = user
+    user_2, _ = user_2
+    with app.app_context():
+        # given
+        planner_owner = create_obj(
+            RecipePlanner(name="PlannerOwner", owner_user_id=user.id, is_active=True))
+        planner_editor = create_obj(
+            RecipePlanner(name="PlannerEditor", owner_user_id=user_2.id, is_active=True))
+        planner_viewer = create_obj(
+            RecipePlanner(name="PlannerViewer", owner_user_id=user_2.id, is_active=True))
+        create_obj(
+            RecipePlanner(name="PlannerOther", owner_user_id=user_2.id, is_active=True))
+        create_obj(
+            UserSharedRecipePlanner(rplanner_id=planner_editor.id, user_id=user.id, can_edit=True))
+        create_obj(
+            UserSharedRecipePlanner(rplanner_id=planner_viewer.id, user_id=user.id, can_edit=False))
+        api_route = f"{ROUTE}/"
+
+        executed_queries = []
+
+        def count_planner_queries(conn, cursor, statement, parameters, context, executemany):
+            if "FROM rplanner" in statement:
+                executed_queries.append(statement)
+
+        # when
+        event.listen(db.engine, "before_cursor_execute", count_planner_queries)
+        try:
+            response = client.get(api_route, headers=headers)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count_planner_queries)
+
+        result_roles = {
+            planner["id"]: planner["role"]
+            for planner in json.loads(response.data)
+        }
+
+        # then
+        assert response.status_code == 200
+        assert result_roles == {
+            planner_owner.id: "owner",
+            planner_editor.id: "editor",
+            planner_viewer.id: "viewer"
+        }
+        assert len(executed_queries) == 1
+        assert "UNION" not in executed_queries[0]
+
+
 #   Planner Items
 
 def test_planner_item_get_list(
@@ -351,7 +512,7 @@ def test_planner_item_get_list_authorization(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -405,6 +566,75 @@ def test_planner_item_get_list_authorization(
         assert len(resp_user_can_access_data) == 1
 
 
+#   SHOPPING LIST
+
+def test_planner_shopping_list_get(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        planner, ingredients = create_shopping_list_planner(user.id)
+        api_route = f"{ROUTE}/{planner.id}/shopping-list?date_of_week=2024-01-03"
+        executed_queries = []
+
+        def collect_aggregation_queries(conn, cursor, statement, *args):
+            if "GROUP BY" in statement:
+                executed_queries.append(statement)
+
+        # when
+        event.listen(db.engine, "before_cursor_execute", collect_aggregation_queries)
+        try:
+            response = client.get(api_route, headers=headers)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", collect_aggregation_queries)
+
+        response_range = client.get(
+            f"{ROUTE}/{planner.id}/shopping-list?date_from=2024-01-01&date_to=2024-01-14",
+            headers=headers
+        )
+
+        result_data = json.loads(response.data)
+        result_data_range = json.loads(response_range.data)
+
+        # then
+        assert response.status_code == 200
+        assert [(r["ingredient"]["id"], r["quantity"]) for r in result_data] == [
+            (ingredients[0].id, 300.0),
+            (ingredients[1].id, 100.0)
+        ]
+        assert result_data[0]["ingredient"]["unit"]["id"] == ingredients[0].unit_id
+        assert len(executed_queries) == 1
+
+        assert response_range.status_code == 200
+        assert [r["quantity"] for r in result_data_range] == [400.0, 150.0]
+
+
+def test_planner_shopping_list_get_invalid_payload(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        planner, _ = create_shopping_list_planner(user.id)
+        api_route = f"{ROUTE}/{planner.id}/shopping-list"
+
+        # when
+        responses = [
+            client.get(f"{api_route}?date_of_week=invalid", headers=headers),
+            client.get(f"{api_route}?date_from=2024-01-01", headers=headers),
+            client.get(f"{api_route}?date_from=2024-01-08&date_to=2024-01-01", headers=headers),
+            client.get(f"{api_route}?date_from=2024-01-01&date_to=2024-03-01", headers=headers)
+        ]
+
+        # then
+        assert all(response.status_code == 400 for response in responses)
+
+
 # TEST-POST
 
 def test_planner_post(
@@ -529,7 +759,7 @@ def test_planner_item_post(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -596,7 +826,7 @@ def test_planner_item_post_authorization(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -655,22 +885,11 @@ def test_planner_item_post_invalid_payload(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
         )
-        recipe = create_recipe(user.id)
-        duplicate_item: dict = create_obj(
-            RecipePlannerItem(
-                rplanner_id=planner.id,
-                recipe_id=recipe.id,
-                date=str(datetime.now().date()),  # today!
-                label="Frühstück",
-                order_number=1,
-                planned_recipe_person_count=2
-            )
-        )
 
         data_recipe_id_not_existing = {
             "recipe_id": -1,
@@ -718,13 +937,6 @@ def test_planner_item_post_invalid_payload(
             "order_number": 1,
             "planned_recipe_person_count": 0
         }
-        data_duplicate_item = {
-            "recipe_id": recipe.id,
-            "date": str(datetime.now().date()),  # today!
-            "label": "Frühstück",
-            "order_number": 1,
-            "planned_recipe_person_count": 2
-        }
         
         api_route = f"{ROUTE}/{planner.id}/item"
 
@@ -743,8 +955,6 @@ def test_planner_item_post_invalid_payload(
             api_route, headers=headers, json=data_person_count_is_null)
         resp_person_count_to_low = client.post(
             api_route, headers=headers, json=data_person_count_to_low)
-        resp_duplicate_item = client.post(
-            api_route, headers=headers, json=data_duplicate_item)
 
         resp_recipe_id_not_exisiting_data = json.loads(resp_recipe_id_not_exisiting.data)
         resp_date_is_null_data = json.loads(resp_date_is_null.data)
@@ -753,7 +963,6 @@ def test_planner_item_post_invalid_payload(
         resp_order_number_to_low_data = json.loads(resp_order_number_to_low.data)
         resp_person_count_is_null_data = json.loads(resp_person_count_is_null.data)
         resp_person_count_to_low_data = json.loads(resp_person_count_to_low.data)
-        resp_duplicate_item_data = json.loads(resp_duplicate_item.data)
 
         # then
         assert resp_recipe_id_not_exisiting.status_code == 404
@@ -763,7 +972,6 @@ def test_planner_item_post_invalid_payload(
         assert resp_order_number_to_low.status_code == 400
         assert resp_person_count_is_null.status_code == 400
         assert resp_person_count_to_low.status_code == 400
-        assert resp_duplicate_item.status_code == 409
 
         assert "message" in resp_recipe_id_not_exisiting_data
         assert "message" in resp_date_is_null_data
@@ -772,7 +980,6 @@ def test_planner_item_post_invalid_payload(
         assert "message" in resp_order_number_to_low_data
         assert "message" in resp_person_count_is_null_data
         assert "message" in resp_person_count_to_low_data
-        assert "message" in resp_duplicate_item_data
 
         assert "recipe_id" in resp_recipe_id_not_exisiting_data["message"]
         assert "date" in resp_date_is_null_data["message"]
@@ -781,7 +988,132 @@ def test_planner_item_post_invalid_payload(
         assert "order_number" in resp_order_number_to_low_data["message"]
         assert "person_count" in resp_person_count_is_null_data["message"]
         assert "person_count" in resp_person_count_to_low_data["message"]
-        assert "already existing" in resp_duplicate_item_data["message"]
+
+
+#   SHOPPING LIST
+
+def test_planner_shopping_list_post_cart(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict],
+        user_2: tuple[User, dict]
+):
+    user, headers = user
+    user_2, _ = user_2
+    with app.app_context():
+        # given
+        planner, ingredients = create_shopping_list_planner(user.id)
+        cart = create_obj(Cart(name="CartName", owner_user_id=user.id))
+        cart_2 = create_obj(Cart(name="CartName", owner_user_id=user_2.id))
+        api_route = f"{ROUTE}/{planner.id}/shopping-list?date_of_week=2024-01-03"
+
+        # when
+        response = client.post(
+            api_route,
+            data=json.dumps({"cart_id": cart.id}),
+            content_type="application/json",
+            headers=headers
+        )
+        response_other_cart = client.post(
+            api_route,
+            data=json.dumps({"cart_id": cart_2.id}),
+            content_type="application/json",
+            headers=headers
+        )
+        response_invalid_cart = client.post(
+            api_route,
+            data=json.dumps({"cart_id": -1}),
+            content_type="application/json",
+            headers=headers
+        )
+
+        cart_items = CartItem.query.order_by(CartItem.ingredient_id).all()
+
+        # then
+        assert response.status_code == 201
+        assert response_other_cart.status_code == 401
+        assert response_invalid_cart.status_code == 404
+
+        assert [(item.cart_id, item.ingredient_id, item.quantity) for item in cart_items] == [
+            (cart.id, ingredients[0].id, 300),
+            (cart.id, ingredients[1].id, 100)
+        ]
+        assert all(item.recipe_id is None and not item.is_done for item in cart_items)
+
+
+def test_planner_shopping_list_post_cart_invalid_payload(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        planner, _ = create_shopping_list_planner(user.id)
+        api_route = f"{ROUTE}/{planner.id}/shopping-list?date_of_week=2024-01-03"
+
+        # when
+        responses = [
+            client.post(api_route, data=json.dumps(data), content_type="application/json", headers=headers)
+            for data in [[1], "1", None, {}, {"cart_id": "a"}, {"cart_id": True}]
+        ]
+
+        # then
+        assert all(response.status_code == 400 for response in responses)
+        assert CartItem.query.count() == 0
+
+
+def test_planner_shopping_list_cache_recipe_ingredient_patch(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict],
+        fake_redis
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        planner, ingredients = create_shopping_list_planner(user.id)
+        unplanned_recipe = create_recipe(user.id, create_category("OtherCategory").id)
+        create_obj(
+            RecipeIngredient(
+                recipe_id=unplanned_recipe.id,
+                ingredient_id=ingredients[0].id,
+                quantity=10
+            )
+        )
+        planned_recipe_id = planner.items_unsorted[0].recipe_id
+        api_route = f"{ROUTE}/{planner.id}/shopping-list?date_of_week=2024-01-03"
+
+        client.get(api_route, headers=headers)
+        keys_before = fake_redis.keys("*shopping-list*")
+
+        # when
+        response_unplanned = client.patch(
+            f"/api/v1/recipe/{unplanned_recipe.id}/ingredient/{ingredients[0].id}",
+            headers=headers,
+            json={"quantity": 20}
+        )
+        keys_unplanned = fake_redis.keys("*shopping-list*")
+
+        response_planned = client.patch(
+            f"/api/v1/recipe/{planned_recipe_id}/ingredient/{ingredients[1].id}",
+            headers=headers,
+            json={"quantity": 100}
+        )
+        keys_planned = fake_redis.keys("*shopping-list*")
+
+        response = client.get(api_route, headers=headers)
+        result_data = json.loads(response.data)
+
+        # then
+        assert response_unplanned.status_code == 200
+        assert response_planned.status_code == 200
+
+        # only the write of the planned recipe drops the shopping list
+        assert len(keys_before) == 1
+        assert keys_unplanned == keys_before
+        assert keys_planned == []
+        assert [r["quantity"] for r in result_data] == [300.0, 200.0]
 
 
 #   SHARED USER
@@ -798,7 +1130,7 @@ def test_planner_shared_user_post(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -831,7 +1163,7 @@ def test_planner_shared_user_post_invalid_id(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -862,7 +1194,7 @@ def test_planner_shared_user_post_authorization(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -902,7 +1234,7 @@ def test_planner_shared_user_post_invalid_payload(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -935,7 +1267,7 @@ def test_planner_patch(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -988,7 +1320,7 @@ def test_planner_patch_authorization(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1047,7 +1379,7 @@ def test_planner_patch_invalid_payload(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1167,7 +1499,7 @@ def test_planner_item_patch_authorization(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1232,7 +1564,7 @@ def test_planner_item_patch_invalid_payload(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1282,35 +1614,150 @@ def test_planner_item_patch_reorder(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
         )
         recipe = create_recipe(user.id)
-        planner_item = create_obj(
-            RecipePlannerItem(
-                rplanner_id=planner.id,
-                recipe_id=recipe.id,
-                date=str(datetime.now().date()),  # today!
-                label="Frühstück",
-                order_number=1,
-                planned_recipe_person_count=2
+        item_ids = [
+            create_obj(
+                RecipePlannerItem(
+                    rplanner_id=planner.id,
+                    recipe_id=recipe.id,
+                    date=str(datetime.now().date()),  # today!
+                    label="Frühstück",
+                    order_number=i * ORDER_RANK_GAP,
+                    planned_recipe_person_count=2
+                )
+            ).id
+            for i in range(1, 4)
+        ]
+        api_route = f"{ROUTE}/{planner.id}/item/{item_ids[0]}/reorder/2"
+
+        executed_updates = []
+
+        def count_updates(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("UPDATE"):
+                executed_updates.append(statement)
+
+        # when
+        event.listen(db.engine, "before_cursor_execute", count_updates)
+        try:
+            response = client.patch(api_route, headers=headers)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count_updates)
+
+        result_ids = [
+            item.id
+            for item in RecipePlannerItem.query.order_by(RecipePlannerItem.order_number)
+        ]
+
+        # then
+        assert response.status_code == 200
+        assert result_ids == [item_ids[1], item_ids[0], item_ids[2]]
+        assert len(executed_updates) == 1
+
+
+def test_planner_item_post_reorder_post(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        planner = create_obj(
+            RecipePlanner(
+                name="RecipePlannerName",
+                owner_user_id=user.id,
+                is_active=True
             )
         )
-        new_order_number = 10
-        api_route = f"{ROUTE}/{planner.id}/item/{planner_item.id}/reorder/{new_order_number}"
+        recipe = create_recipe(user.id)
+        api_route = f"{ROUTE}/{planner.id}/item"
+
+        def create_data(order_number):
+            return {
+                "recipe_id": recipe.id,
+                "date": "2024-01-01",
+                "label": "Frühstück",
+                "order_number": order_number,
+                "planned_recipe_person_count": 2
+            }
 
         # when
-        response = client.patch(api_route, headers=headers)
-        result_data_db = RecipePlannerItem.query.get(
-            json.loads(response.data)["id"]).to_dict()
+        item_ids = [
+            json.loads(client.post(api_route, headers=headers, json=create_data(order_number)).data)["id"]
+            for order_number in [1, 2]
+        ]
+        response_reorder = client.patch(f"{api_route}/{item_ids[1]}/reorder/1", headers=headers)
+        response_post = client.post(api_route, headers=headers, json=create_data(2))
+        response = client.get(f"{api_route}?date_of_week=2024-01-01", headers=headers)
+
+        result_data = sorted(json.loads(response.data), key=lambda item: item["order_number"])
+
+        # then
+        assert response_reorder.status_code == 200
+        assert json.loads(response_reorder.data)["order_number"] == 1
+        assert response_post.status_code == 201
+        assert json.loads(response_post.data)["order_number"] == 2
+
+        assert [(item["id"], item["order_number"]) for item in result_data] == [
+            (item_ids[1], 1),
+            (json.loads(response_post.data)["id"], 2),
+            (item_ids[0], 3)
+        ]
+
+
+def test_planner_item_put_order(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        planner = create_obj(
+            RecipePlanner(
+                name="RecipePlannerName",
+                owner_user_id=user.id,
+                is_active=True
+            )
+        )
+        recipe = create_recipe(user.id)
+        today = str(datetime.now().date())
+        item_ids = [
+            create_obj(
+                RecipePlannerItem(
+                    rplanner_id=planner.id,
+                    recipe_id=recipe.id,
+                    date=today,
+                    label="Frühstück",
+                    order_number=i,
+                    planned_recipe_person_count=2
+                )
+            ).id
+            for i in range(1, 4)
+        ]
+        new_order = list(reversed(item_ids))
+        api_route = f"{ROUTE}/{planner.id}/item/order"
+
+        # when
+        response = client.put(
+            api_route, headers=headers, json={"date": today, "ids": new_order})
+        response_invalid_date = client.put(
+            api_route, headers=headers, json={"date": "abc", "ids": new_order})
+        response_list_body = client.put(
+            api_route, headers=headers, json=new_order)
 
         # then
         assert response.status_code == 200
-        assert result_data_db["order_number"] == new_order_number
+        assert [item["id"] for item in json.loads(response.data)] == new_order
+        assert response_invalid_date.status_code == 400
+        assert response_list_body.status_code == 400
+
 
-    
 def test_planner_item_patch_reorder_invalid_payload(
         app: Flask,
         client: testing.FlaskClient,
@@ -1321,7 +1768,7 @@ def test_planner_item_patch_reorder_invalid_payload(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1364,7 +1811,7 @@ def test_planner_delete(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1413,14 +1860,14 @@ def test_planner_delete_authorization(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
         )
         planner_2 = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName2",
+                name="RecipePlannerName2",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1458,7 +1905,7 @@ def test_planner_item_delete(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1498,7 +1945,7 @@ def test_planner_item_delete_invalid_id(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1531,7 +1978,7 @@ def test_planner_item_delete_authorization(
         # given
         planner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1613,7 +2060,7 @@ def test_rplanner_shared_user_delete(
         # given
         rplanner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1639,6 +2086,47 @@ def test_rplanner_shared_user_delete(
         assert db_model_count_after == 0
 
 
+def test_rplanner_shared_user_delete_clears_access_cache(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict],
+        user_2: tuple[User, dict],
+        monkeypatch: pytest.MonkeyPatch
+):
+    user, headers = user
+    user_2, headers_2 = user_2
+    with app.app_context():
+        # given
+        rplanner = create_obj(
+            RecipePlanner(
+                name="RecipePlannerName",
+                owner_user_id=user.id,
+                is_active=True
+            )
+        )
+        create_obj(
+            UserSharedRecipePlanner(
+                rplanner_id=rplanner.id,
+                user_id=user_2.id,
+                can_edit=True
+            )
+        )
+        cleared_access = []
+        monkeypatch.setattr(
+            api_access_cache,
+            "clear_access",
+            lambda model, ids: cleared_access.append((model, ids))
+        )
+        api_route = f"{ROUTE}/{rplanner.id}/access/user/{user_2.id}"
+
+        # when
+        response = client.delete(api_route, headers=headers)
+
+        # then
+        assert response.status_code == 204
+        assert cleared_access == [(RecipePlanner, [rplanner.id])]
+
+
 def test_rplanner_shared_user_delete_invalid_id(
         app: Flask,
         client: testing.FlaskClient,
@@ -1651,7 +2139,7 @@ def test_rplanner_shared_user_delete_invalid_id(
         # given
         rplanner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1691,7 +2179,7 @@ def test_rplanner_shared_user_delete_authorization(
         # given
         rplanner = create_obj(
             RecipePlanner(
-                name=f"RecipePlannerName",
+                name="RecipePlannerName",
                 owner_user_id=user.id,
                 is_active=True
             )
@@ -1,7 +1,18 @@
 # flake8: noqa
 import json
+import time
+import threading
+
+import pytest
+
+from concurrent.futures import ThreadPoolExecutor
 
 from flask import Flask, testing
+from sqlalchemy import delete, event
+
+from server.db import db
+from server.caching.redis import api_cache
+from server.search.recipe_search import recipe_search
 
 from server.core.models.db_models.recipe import (Recipe, RecipeIngredient, RecipeRating,
     RecipeTagComposite)
@@ -9,7 +20,7 @@ from server.services.recipe.tests.utils import create_obj
 from server.core.models.db_models.user.user import User
 from server.services.recipe.tests.apis.test_api_category import create_category
 from server.services.recipe.tests.apis.test_api_tag import create_tag
-from server.services.recipe.tests.apis.test_api_ingredient import create_ingredient
+from server.services.recipe.tests.apis.test_api_ingredient import create_ingredient, create_ingredient_loop
 from server.services.recipe.tests.apis.test_api_unit import create_unit
 
 
@@ -87,6 +98,51 @@ def test_recipe_get(
         assert result_data == expected_data
 
 
+def test_recipe_get_query_budget(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        QUERY_BUDGET = 4
+        COUNT = 5
+        recipe = create_recipe(user.id)
+        for i in range(COUNT):
+            ingredient = create_ingredient_loop(i, create_unit(f"UnitName{i}"))
+            create_obj(
+                RecipeIngredient(
+                    recipe_id=recipe.id,
+                    ingredient_id=ingredient.id,
+                    quantity=i + 1
+                )
+            )
+        recipe.tags = [create_tag(f"TagName{i}") for i in range(COUNT)]
+        db.session.commit()
+        api_route = f"{ROUTE}/{recipe.id}"
+        executed_queries = []
+
+        def count_queries(conn, cursor, statement, *args):
+            executed_queries.append(statement)
+
+        # when
+        event.listen(db.engine, "before_cursor_execute", count_queries)
+        try:
+            response = client.get(api_route, headers=headers)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count_queries)
+
+        result_data = json.loads(response.data)
+
+        # then
+        assert response.status_code == 200
+        assert len(result_data["ingredients"]) == COUNT
+        assert len(result_data["tags"]) == COUNT
+        assert all(r["ingredient"]["unit"] for r in result_data["ingredients"])
+        assert len(executed_queries) <= QUERY_BUDGET
+
+
 def test_recipe_get_invalid_id(
         app: Flask,
         client: testing.FlaskClient,
@@ -163,6 +219,79 @@ def test_recipe_get_rating(
         assert resp_data["rating_count"] == 2
 
 
+def test_recipe_get_rating_batch(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict],
+        user_2: tuple[User, dict]
+):
+    user, headers = user
+    user_2, headers_2 = user_2
+    with app.app_context():
+        # given
+        category = create_category()
+        recipes = [create_recipe_in_loop(i, user.id, category) for i in range(0, 3)]
+        for user_id, rating in [(user.id, 3.0), (user_2.id, 4.0)]:
+            create_obj(
+                RecipeRating(
+                    user_id=user_id,
+                    recipe_id=recipes[0].id,
+                    rating=rating
+                )
+            )
+        create_obj(
+            RecipeRating(
+                user_id=user.id,
+                recipe_id=recipes[2].id,
+                rating=5.0
+            )
+        )
+        ids = ",".join(str(r.id) for r in [recipes[2], recipes[0], recipes[1]])
+        api_route = f"{ROUTE}/rating?ids={ids},-1"
+
+        # when
+        response = client.get(api_route, headers=headers)
+        response_invalid = client.get(f"{ROUTE}/rating?ids=a,b", headers=headers)
+
+        result_data = json.loads(response.data)
+        expected_data = [
+            {"recipe_id": recipes[2].id, "rating_avg": 5.0, "rating_count": 1},
+            {"recipe_id": recipes[0].id, "rating_avg": 3.5, "rating_count": 2},
+            {"recipe_id": recipes[1].id, "rating_avg": 0., "rating_count": 0},
+        ]
+
+        # then
+        assert response.status_code == 200
+        assert response_invalid.status_code == 400
+        assert result_data == expected_data
+
+
+def test_recipe_rating_aggregate_maintained(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict],
+        user_2: tuple[User, dict]
+):
+    user, headers = user
+    user_2, headers_2 = user_2
+    with app.app_context():
+        # given
+        recipe = create_recipe(user.id)
+        api_route = f"{ROUTE}/{recipe.id}/rating"
+
+        # when
+        client.post(api_route, headers=headers, json={"rating": 2.0})
+        client.post(api_route, headers=headers_2, json={"rating": 4.0})
+        client.patch(api_route, headers=headers_2, json={"rating": 5.0})
+        result_data_patched = json.loads(client.get(api_route, headers=headers).data)
+        client.delete(api_route, headers=headers)
+        result_data_deleted = json.loads(client.get(api_route, headers=headers).data)
+
+        # then
+        assert result_data_patched == {"rating_avg": 3.5, "rating_count": 2}
+        assert result_data_deleted == {"rating_avg": 5.0, "rating_count": 1}
+
+
 # TEST GET-LIST
 
 
@@ -191,6 +320,246 @@ def test_recipe_get_list(
         assert result_data == expected_data
 
 
+def test_recipe_get_list_sparse_fields(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        COUNT = 3
+        category = create_category()
+        recipes = [create_recipe_in_loop(i, user.id, category) for i in range(0, COUNT)]
+        api_route = f"{ROUTE}/?fields=id,name,difficulty"
+        executed_queries = []
+
+        def collect_recipe_queries(conn, cursor, statement, *args):
+            if "FROM recipe" in statement:
+                executed_queries.append(statement)
+
+        # when
+        event.listen(db.engine, "before_cursor_execute", collect_recipe_queries)
+        try:
+            response = client.get(api_route, headers=headers)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", collect_recipe_queries)
+
+        result_data = json.loads(response.data)
+        expected_data = [
+            {"id": recipe.id, "name": recipe.name, "difficulty": recipe.difficulty}
+            for recipe in recipes
+        ]
+
+        # then
+        assert response.status_code == 200
+        assert result_data == expected_data
+        assert len(executed_queries) == 1
+        assert "recipe.difficulty" in executed_queries[0]
+        assert "recipe.preperation_description" not in executed_queries[0]
+
+
+def test_recipe_get_sparse_fields(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        category = create_category()
+        recipe = create_recipe(user.id, category.id)
+        api_route = f"{ROUTE}/{recipe.id}?fields=name,category"
+
+        # when
+        response = client.get(api_route, headers=headers)
+
+        result_data = json.loads(response.data)
+        expected_data = {
+            "name": recipe.name,
+            "category": category.to_dict()
+        }
+
+        # then
+        assert response.status_code == 200
+        assert result_data == expected_data
+
+
+def test_recipe_get_list_sparse_fields_invalid(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        create_recipe(user.id)
+        api_routes = [
+            f"{ROUTE}/?fields=id,password",
+            f"{ROUTE}/?fields=name&cursor="
+        ]
+
+        # when
+        responses = [client.get(api_route, headers=headers) for api_route in api_routes]
+
+        # then
+        assert all(response.status_code == 400 for response in responses)
+
+
+def test_recipe_get_list_include(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict],
+        user_2: tuple[User, dict]
+):
+    user, headers = user
+    user_2, _ = user_2
+    with app.app_context():
+        # given
+        COUNT = 6
+        category = create_category()
+        recipes = [create_recipe_in_loop(i, user.id, category) for i in range(0, COUNT)]
+        for i, recipe in enumerate(recipes):
+            recipe.tags = [create_tag(f"TagName{i}_{j}") for j in range(2)]
+        db.session.commit()
+        for user_id, rating in [(user.id, 3.0), (user_2.id, 5.0)]:
+            create_obj(
+                RecipeRating(
+                    user_id=user_id,
+                    recipe_id=recipes[0].id,
+                    rating=rating
+                )
+            )
+        api_routes = [
+            f"{ROUTE}/?include=category,tags,images,rating&page=1&page_size=2",
+            f"{ROUTE}/?include=category,tags,images,rating&page=1&page_size={COUNT}"
+        ]
+        executed_queries = {api_route: [] for api_route in api_routes}
+
+        # when
+        responses = {}
+        for api_route in api_routes:
+            def count_queries(conn, cursor, statement, *args):
+                executed_queries[api_route].append(statement)
+
+            event.listen(db.engine, "before_cursor_execute", count_queries)
+            try:
+                responses[api_route] = client.get(api_route, headers=headers)
+            finally:
+                event.remove(db.engine, "before_cursor_execute", count_queries)
+
+        result_data = json.loads(responses[api_routes[1]].data)
+
+        # then
+        assert all(response.status_code == 200 for response in responses.values())
+        assert len(result_data) == COUNT
+        assert result_data[0]["category"]["id"] == category.id
+        assert result_data[0]["rating"] == {"rating_avg": 4.0, "rating_count": 2}
+        assert result_data[1]["rating"] == {"rating_avg": 0.0, "rating_count": 0}
+        assert all(len(r["tags"]) == 2 and r["images"] == [] for r in result_data)
+        assert len(executed_queries[api_routes[0]]) == len(executed_queries[api_routes[1]])
+
+
+def test_recipe_get_list_include_invalid(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        create_recipe(user.id)
+        api_route = f"{ROUTE}/?include=tags,creator"
+
+        # when
+        response = client.get(api_route, headers=headers)
+
+        # then
+        assert response.status_code == 400
+
+
+def test_recipe_get_batch(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        COUNT = 4
+        category = create_category()
+        recipes = [create_recipe_in_loop(i, user.id, category) for i in range(0, COUNT)]
+        ids = [recipes[2].id, -1, recipes[0].id, recipes[3].id, recipes[0].id]
+        api_route = f"{ROUTE}/batch?ids={','.join(str(id) for id in ids)}"
+        executed_queries = []
+
+        def collect_recipe_queries(conn, cursor, statement, *args):
+            # the recipe rows, not the loaders of the relationships
+            if statement.startswith("SELECT recipe.id"):
+                executed_queries.append(statement)
+
+        # when
+        event.listen(db.engine, "before_cursor_execute", collect_recipe_queries)
+        try:
+            response = client.get(api_route, headers=headers)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", collect_recipe_queries)
+
+        response_post = client.post(
+            f"{ROUTE}/batch?fields=id,name",
+            data=json.dumps({"ids": ids}),
+            content_type="application/json",
+            headers=headers
+        )
+
+        result_data = json.loads(response.data)
+        result_data_post = json.loads(response_post.data)
+
+        # then
+        assert response.status_code == 200
+        assert [r["id"] for r in result_data] == [recipes[2].id, recipes[0].id, recipes[3].id]
+        assert result_data[0]["category"]["id"] == category.id
+        assert response.headers.get("X-Missing-Ids") == "-1"
+        assert len(executed_queries) == 1
+
+        assert response_post.status_code == 200
+        assert result_data_post == [
+            {"id": recipes[id_index].id, "name": recipes[id_index].name}
+            for id_index in [2, 0, 3]
+        ]
+
+
+def test_recipe_get_batch_invalid(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        api_routes = [
+            f"{ROUTE}/batch",
+            f"{ROUTE}/batch?ids=1,a",
+            f"{ROUTE}/batch?ids={','.join(str(id) for id in range(1, 1000))}"
+        ]
+
+        # when
+        responses = [client.get(api_route, headers=headers) for api_route in api_routes]
+        responses_post = [
+            client.post(
+                f"{ROUTE}/batch",
+                data=json.dumps(body),
+                content_type="application/json",
+                headers=headers
+            )
+            for body in [{"ids": [1, "a"]}, [1, 2], "1,2", None]
+        ]
+
+        # then
+        assert all(response.status_code == 400 for response in responses)
+        assert all(response.status_code == 400 for response in responses_post)
+
+
 def test_recipe_get_list_authorization(
         app: Flask,
         client: testing.FlaskClient,
@@ -223,6 +592,106 @@ def test_recipe_get_list_authorization(
         assert len(result_other_data) == COUNT
 
 
+def test_recipe_get_list_concurrent_requests_single_query(
+        app: Flask,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        COUNT = 3
+        REQUEST_COUNT = 8
+        category = create_category()
+        recipes = [create_recipe_in_loop(i, user.id, category) for i in range(0, COUNT)]
+        expected_names = [recipe.name for recipe in recipes]
+        api_route = f"{ROUTE}/?search_type=contains&name=RecipeName"
+        barrier = threading.Barrier(REQUEST_COUNT)
+        executed_queries = []
+
+        def count_recipe_queries(conn, cursor, statement, *args):
+            if "FROM recipe" in statement:
+                executed_queries.append(statement)
+                # keep the query in flight, until all requests are waiting
+                time.sleep(0.3)
+
+        def send_request(_):
+            barrier.wait()
+            return app.test_client().get(api_route, headers=headers)
+
+        # when
+        event.listen(db.engine, "before_cursor_execute", count_recipe_queries)
+        try:
+            with ThreadPoolExecutor(max_workers=REQUEST_COUNT) as executor:
+                responses = list(executor.map(send_request, range(REQUEST_COUNT)))
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count_recipe_queries)
+
+        # then
+        assert len(executed_queries) == 1
+        for response in responses:
+            assert response.status_code == 200
+            assert [r["name"] for r in json.loads(response.data)] == expected_names
+
+
+def test_recipe_get_list_search(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        category = create_category()
+        recipes = [create_recipe_in_loop(i, user.id, category) for i in range(0, 3)]
+        recipes[0].search_description = "Pasta"
+        recipes[2].name = "Pasta Bolognese"
+        db.session.commit()
+
+        # when
+        response = client.get(f"{ROUTE}/?search=past", headers=headers)
+        response_multi_word = client.get(f"{ROUTE}/?search=Pasta bolo", headers=headers)
+        response_no_match = client.get(f"{ROUTE}/?search=pizza", headers=headers)
+
+        result_data = json.loads(response.data)
+        result_multi_word_data = json.loads(response_multi_word.data)
+        result_no_match_data = json.loads(response_no_match.data)
+
+        # then
+        assert response.status_code == 200
+        assert [r["id"] for r in result_data] == [recipes[2].id, recipes[0].id]
+        assert [r["id"] for r in result_multi_word_data] == [recipes[2].id]
+        assert result_no_match_data == []
+
+
+def test_recipe_get_list_search_truncated(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict],
+        monkeypatch: pytest.MonkeyPatch
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        monkeypatch.setattr(recipe_search, "_max_results", 2)
+        category = create_category()
+        recipes = [create_recipe_in_loop(i, user.id, category) for i in range(0, 4)]
+        recipes[0].name = "Pasta Bolognese"
+        db.session.commit()
+
+        # when
+        response_truncated = client.get(f"{ROUTE}/?search=recipe&count=true", headers=headers)
+        response = client.get(f"{ROUTE}/?search=pasta", headers=headers)
+
+        result_truncated_data = json.loads(response_truncated.data)
+
+        # then
+        assert response_truncated.status_code == 200
+        assert len(result_truncated_data) == 2
+        assert response_truncated.headers.get("X-Search-Truncated") == "true"
+        assert response_truncated.headers.get("X-Total-Count") == "2"
+        assert response.headers.get("X-Search-Truncated") is None
+
+
 # TEST-POST
 
 
@@ -646,6 +1115,60 @@ def test_recipe_ingredient_post(
         }
 
 
+def test_recipe_ingredient_post_bulk(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        recipe = create_recipe(user.id)
+        unit = create_unit()
+        ingredients = [create_ingredient_loop(i, unit) for i in range(0, 3)]
+        create_obj(RecipeIngredient(
+            recipe_id=recipe.id, ingredient_id=ingredients[2].id, quantity=1))
+        data = [
+            {"ingredient_id": ingredients[0].id, "quantity": 5},
+            {"ingredient_id": ingredients[1].id, "quantity": 10},
+            {"ingredient_id": ingredients[0].id, "quantity": 7},
+            {"ingredient_id": ingredients[2].id, "quantity": 3},
+            {"ingredient_id": ingredients[2].id + 100, "quantity": 3},
+            {"ingredient_id": ingredients[1].id, "quantity": -1},
+        ]
+        api_route = f"{ROUTE}/{recipe.id}/ingredient"
+        executed_inserts = []
+
+        def count_inserts(conn, cursor, statement, *args):
+            if statement.startswith("INSERT INTO recipe_ingredient"):
+                executed_inserts.append(statement)
+
+        # when
+        event.listen(db.engine, "before_cursor_execute", count_inserts)
+        try:
+            response = client.post(api_route, headers=headers, json=data)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count_inserts)
+
+        response_invalid = client.post(api_route, headers=headers, json={"quantity": 1})
+
+        resp_data = json.loads(response.data)
+        result_data_db = RecipeIngredient.query.filter_by(recipe_id=recipe.id).all()
+
+        # then
+        assert response.status_code == 207
+        assert [r["status"] for r in resp_data] == [201, 201, 409, 409, 404, 400]
+        assert resp_data[0]["data"] == {
+            "recipe_id": recipe.id,
+            "ingredient_id": ingredients[0].id,
+            "quantity": 5
+        }
+        assert "message" in resp_data[2]
+        assert len(executed_inserts) == 1
+        assert len(result_data_db) == 3
+        assert response_invalid.status_code == 400
+
+
 def test_recipe_rating_post(
         app: Flask,
         client: testing.FlaskClient,
@@ -974,6 +1497,76 @@ def test_recipe_delete(
         assert db_model_count_after == 0
 
 
+def test_recipe_get_list_normalized_cache_patch(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict],
+        fake_redis
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        category = create_category()
+        recipes = [create_recipe_in_loop(i, user.id, category) for i in range(0, 2)]
+        api_route = f"{ROUTE}/?page=1"
+
+        response_before = client.get(api_route, headers=headers)
+        ids_keys_before = fake_redis.keys("*:ids:*")
+
+        # when (person_count can't change the list queries)
+        response_patch = client.patch(f"{ROUTE}/{recipes[0].id}", headers=headers, json={"person_count": 5})
+        ids_keys_after = fake_redis.keys("*:ids:*")
+        response_after = client.get(api_route, headers=headers)
+
+        result_before = json.loads(response_before.data)
+        result_after = json.loads(response_after.data)
+
+        # then
+        assert response_patch.status_code == 200
+        assert len(ids_keys_before) == 1
+        assert ids_keys_after == ids_keys_before
+        assert [r["id"] for r in result_after] == [r["id"] for r in result_before]
+        assert [r["person_count"] for r in result_before] == [2, 2]
+        assert [r["person_count"] for r in result_after] == [5, 2]
+
+
+def test_recipe_get_list_normalized_cache_delete(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict],
+        fake_redis
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        category = create_category()
+        recipes = [create_recipe_in_loop(i, user.id, category) for i in range(0, 3)]
+        recipe_ids = [recipe.id for recipe in recipes]
+        api_route = f"{ROUTE}/?page=1"
+
+        response_before = client.get(api_route, headers=headers)
+
+        # when
+        response_delete = client.delete(f"{ROUTE}/{recipe_ids[1]}", headers=headers)
+        response_after = client.get(api_route, headers=headers)
+
+        # deleted, while the cached id list still contains it
+        db.session.execute(delete(Recipe).where(Recipe.id == recipe_ids[0]))
+        db.session.commit()
+        api_cache.clear_tags([api_cache.gen_entity_tag(Recipe, recipe_ids[0])])
+        response_stale_ids = client.get(api_route, headers=headers)
+
+        result_before = json.loads(response_before.data)
+        result_after = json.loads(response_after.data)
+        result_stale_ids = json.loads(response_stale_ids.data)
+
+        # then
+        assert response_delete.status_code == 204
+        assert [r["id"] for r in result_before] == recipe_ids
+        assert [r["id"] for r in result_after] == [recipe_ids[0], recipe_ids[2]]
+        assert [r["id"] for r in result_stale_ids] == [recipe_ids[2]]
+
+
 def test_recipe_delete_invalid_id(
         app: Flask,
         client: testing.FlaskClient,
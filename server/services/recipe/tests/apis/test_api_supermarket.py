@@ -2,6 +2,8 @@
 import json
 
 from flask import Flask, testing
+from sqlalchemy import event
+from sqlalchemy.orm import undefer
 from server.core.models.db_models.supermarket import (Supermarket, SupermarketArea,
     SupermarketAreaIngredientComposite, UserSharedEditSupermarket)
 from server.core.models.db_models.user.user import User
@@ -10,6 +12,8 @@ from server.services.recipe.tests.apis.test_api_ingredient import (
 )
 from server.services.recipe.tests.apis.test_api_recipe import create_recipe
 from server.services.recipe.tests.utils import create_obj
+from server.core.controller.order_rank import ORDER_RANK_GAP
+from server.db import db
 
 
 ROUTE = "/api/v1/supermarket"
@@ -50,7 +54,12 @@ def test_supermarket_get(
 
         result_data = json.loads(response.data)
         expected_data = supermarket.to_dict()
-        expected_data["areas"] = [area.to_dict()]
+        expected_area = area.to_dict()
+        # the api exposes the position instead of the rank
+        expected_area["order_number"] = expected_area.pop("position")
+        expected_data["areas"] = [expected_area]
+        # eager loaded by the detail request
+        del expected_data["areas_unsorted"]
 
         # then
         assert response.status_code == 200
@@ -226,7 +235,7 @@ def test_supermarket_get_list_query_params(
     # given
         create_obj(
             Supermarket(
-                name=f"Super1Market",
+                name="Super1Market",
                 street="Street1",
                 postcode="123456789",
                 district="Berro",
@@ -235,7 +244,7 @@ def test_supermarket_get_list_query_params(
         )
         create_obj(
             Supermarket(
-                name=f"Super2Market",
+                name="Super2Market",
                 street="Street2",
                 postcode="12345678",
                 district="Berlin",
@@ -294,7 +303,7 @@ def test_supermarket_get_list_authorization(
         # given
         create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -323,7 +332,7 @@ def test_supermarket_post(
     with app.app_context():
         # given
         data = {
-            "name": f"SupermarketName",
+            "name": "SupermarketName",
             "street": "Street",
             "postcode": "182923",
             "district": "Berlin",
@@ -356,7 +365,7 @@ def test_supermarket_post_authorization(
     with app.app_context():
         # given
         data = {
-            "name": f"SupermarketName",
+            "name": "SupermarketName",
             "street": "Street",
             "postcode": "182923",
             "district": "Berlin",
@@ -385,7 +394,7 @@ def test_supermarket_post_invalid_payload(
         # given
         create_obj(
             Supermarket(
-                name=f"SupermarketName-Dup",
+                name="SupermarketName-Dup",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -567,7 +576,7 @@ def test_supermarket_area_post(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -585,7 +594,13 @@ def test_supermarket_area_post(
         response = client.post(api_route, headers=headers, json=data)
 
         result_data = json.loads(response.data)
-        result_data_db = SupermarketArea.query.filter_by(**data).first().to_dict()
+        result_data_db = SupermarketArea.query \
+            .options(undefer(SupermarketArea.position)) \
+            .filter_by(name=data["name"]) \
+            .first() \
+            .to_dict()
+        # the api exposes the position instead of the rank
+        result_data_db["order_number"] = result_data_db.pop("position")
 
         # then
         assert response.status_code == 201
@@ -752,7 +767,7 @@ def test_supermarket_area_ingredient_post(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -796,7 +811,7 @@ def test_supermarket_shared_user_post(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -851,7 +866,7 @@ def test_supermarket_shared_user_post_authorization(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -887,7 +902,7 @@ def test_supermarket_shared_user_post_invalid_payload(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -917,7 +932,7 @@ def test_supermarket_patch(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -973,7 +988,7 @@ def test_supermarket_patch_authorization(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -1021,7 +1036,7 @@ def test_supermarket_patch_invalid_payload(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -1107,7 +1122,7 @@ def test_supermarket_area_patch(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -1167,7 +1182,7 @@ def test_supermarket_area_patch_authorization(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -1222,7 +1237,7 @@ def test_supermarket_area_patch_invalid_payload(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -1270,30 +1285,187 @@ def test_supermarket_area_patch_reorder(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
                 owner_user_id=user.id
             )
         )
-        supermarket_area = create_obj(
-            SupermarketArea(
-                name="AreaName",
-                order_number=1,
-                supermarket_id=supermarket.id
+        area_ids = [
+            create_obj(
+                SupermarketArea(
+                    name=f"AreaName{i}",
+                    order_number=i * ORDER_RANK_GAP,
+                    supermarket_id=supermarket.id
+                )
+            ).id
+            for i in range(1, 4)
+        ]
+        api_route = f"{ROUTE}/{supermarket.id}/area/{area_ids[2]}/reorder/1"
+
+        executed_updates = []
+
+        def count_updates(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("UPDATE"):
+                executed_updates.append(statement)
+
+        # when
+        event.listen(db.engine, "before_cursor_execute", count_updates)
+        try:
+            response = client.patch(api_route, headers=headers)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count_updates)
+
+        result_ids = [
+            area.id
+            for area in SupermarketArea.query.order_by(SupermarketArea.order_number)
+        ]
+
+        # then
+        assert response.status_code == 200
+        assert result_ids == [area_ids[2], area_ids[0], area_ids[1]]
+        assert len(executed_updates) == 1
+
+
+def test_supermarket_area_get_list_positions(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        supermarket = create_obj(
+            Supermarket(
+                name="SupermarketName",
+                street="Street",
+                postcode="182923",
+                district="Berlin",
+                owner_user_id=user.id
             )
         )
-        new_order_number = 10
-        api_route = f"{ROUTE}/{supermarket.id}/area/{supermarket_area.id}/reorder/{new_order_number}"
+        area_ids = [
+            create_obj(
+                SupermarketArea(
+                    name=f"AreaName{i}",
+                    order_number=i * ORDER_RANK_GAP,
+                    supermarket_id=supermarket.id
+                )
+            ).id
+            for i in [3, 1, 2]
+        ]
+        api_route = f"{ROUTE}/{supermarket.id}/area"
+
+        executed_counts = []
+
+        def count_counts(conn, cursor, statement, parameters, context, executemany):  # noqa
+            if "count(" in statement.lower():
+                executed_counts.append(statement)
 
         # when
-        response = client.patch(api_route, headers=headers)
-        result_data_db = SupermarketArea.query.get(supermarket_area.id).to_dict()
+        event.listen(db.engine, "before_cursor_execute", count_counts)
+        try:
+            response = client.get(api_route, headers=headers)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count_counts)
+
+        positions = {
+            area["id"]: area["order_number"]
+            for area in json.loads(response.data)
+        }
+
+        # then
+        assert response.status_code == 200
+        assert positions == dict(zip(area_ids, [3, 1, 2]))
+        assert len(executed_counts) == 0
+
+
+def test_supermarket_area_post_reorder_post(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        supermarket = create_obj(
+            Supermarket(
+                name="SupermarketName",
+                street="Street",
+                postcode="182923",
+                district="Berlin",
+                owner_user_id=user.id
+            )
+        )
+        api_route = f"{ROUTE}/{supermarket.id}/area"
+
+        # when
+        area_ids = [
+            json.loads(client.post(api_route, headers=headers, json={"name": name, "order_number": order_number}).data)["id"]
+            for name, order_number in [("AreaName1", 1), ("AreaName2", 2)]
+        ]
+        response_reorder = client.patch(f"{api_route}/{area_ids[1]}/reorder/1", headers=headers)
+        response_post = client.post(api_route, headers=headers, json={"name": "AreaName3", "order_number": 2})
+        response = client.get(f"{ROUTE}/{supermarket.id}", headers=headers)
+
+        result_data = json.loads(response.data)
+
+        # then
+        assert response_reorder.status_code == 200
+        assert json.loads(response_reorder.data)["order_number"] == 1
+        assert response_post.status_code == 201
+        assert json.loads(response_post.data)["order_number"] == 2
+
+        assert [(area["id"], area["order_number"]) for area in result_data["areas"]] == [
+            (area_ids[1], 1),
+            (json.loads(response_post.data)["id"], 2),
+            (area_ids[0], 3)
+        ]
+
+
+def test_supermarket_area_put_order(
+        app: Flask,
+        client: testing.FlaskClient,
+        user: tuple[User, dict]
+):
+    user, headers = user
+    with app.app_context():
+        # given
+        supermarket = create_obj(
+            Supermarket(
+                name="SupermarketName",
+                street="Street",
+                postcode="182923",
+                district="Berlin",
+                owner_user_id=user.id
+            )
+        )
+        area_ids = [
+            create_obj(
+                SupermarketArea(
+                    name=f"AreaName{i}",
+                    order_number=i,
+                    supermarket_id=supermarket.id
+                )
+            ).id
+            for i in range(1, 4)
+        ]
+        new_order = [area_ids[1], area_ids[2], area_ids[0]]
+        api_route = f"{ROUTE}/{supermarket.id}/area/order"
+
+        # when
+        response = client.put(api_route, headers=headers, json={"ids": new_order})
+        response_missing_id = client.put(
+            api_route, headers=headers, json={"ids": new_order[:2]})
+        response_list_body = client.put(
+            api_route, headers=headers, json=new_order)
 
         # then
         assert response.status_code == 200
-        assert result_data_db["order_number"] == new_order_number
+        assert [area["id"] for area in json.loads(response.data)] == new_order
+        assert response_missing_id.status_code == 400
+        assert response_list_body.status_code == 400
 
 
 def test_supermarket_area_patch_reorder_invalid_payload(
@@ -1306,7 +1478,7 @@ def test_supermarket_area_patch_reorder_invalid_payload(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -1345,7 +1517,7 @@ def test_supermarket_area_ingredient_patch(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -1399,7 +1571,7 @@ def test_supermarket_delete(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -1450,7 +1622,7 @@ def test_supermarket_delete_authorization(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -1459,7 +1631,7 @@ def test_supermarket_delete_authorization(
         )
         supermarket_2 = create_obj(
             Supermarket(
-                name=f"SupermarketName2",
+                name="SupermarketName2",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -1499,7 +1671,7 @@ def test_supermarket_area_delete(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -1537,7 +1709,7 @@ def test_supermarket_area_delete_invalid_id(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -1572,7 +1744,7 @@ def test_supermarket_area_delete_authorization(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -1636,7 +1808,7 @@ def test_supermarket_area_ingredient_delete(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -1686,7 +1858,7 @@ def test_supermarket_shared_user_delete(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -1725,7 +1897,7 @@ def test_supermarket_shared_user_delete_invalid_id(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
@@ -1769,7 +1941,7 @@ def test_supermarket_shared_user_delete_authorization(
         # given
         supermarket = create_obj(
             Supermarket(
-                name=f"SupermarketName",
+                name="SupermarketName",
                 street="Street",
                 postcode="182923",
                 district="Berlin",
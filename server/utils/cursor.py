@@ -0,0 +1,52 @@
+import base64
+import binascii
+from datetime import date, datetime
+
+import orjson
+
+from server.errors import errors
+
+
+def encode_cursor(values: list) -> str:
+    """
+    Opaque pagination cursor of the sort key values of the last row.
+    """
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode().rstrip("=")  # noqa
+
+
+def decode_cursor(cursor: str, python_types: list[type]) -> list:
+    """
+    Sort key values of the cursor, converted to the python types of the
+    sort columns (dates are serialized as ISO strings).
+    """
+    err_msg = "Query parameter 'cursor' is invalid."
+
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = orjson.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (binascii.Error, ValueError):
+        raise errors.ValueErrorGeneral(err_msg)
+
+    if not isinstance(values, list) or len(values) != len(python_types):
+        raise errors.ValueErrorGeneral(err_msg)
+
+    try:
+        return [
+            _to_python_type(value, python_type)
+            for value, python_type in zip(values, python_types)
+        ]
+    except (TypeError, ValueError):
+        raise errors.ValueErrorGeneral(err_msg)
+
+
+def _to_python_type(value, python_type: type):
+    if value is None:
+        raise ValueError()
+
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+
+    if python_type is date:
+        return date.fromisoformat(value)
+
+    return python_type(value)
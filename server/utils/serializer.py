@@ -0,0 +1,229 @@
+from functools import partial
+from typing import Any, Callable
+
+from flask_restx import fields, marshal
+from flask_restx.fields import (
+    MarshallingError, get_value, is_indexable_but_not_string
+)
+from flask_restx.marshalling import make
+
+
+Serializer = Callable[[Any], Any]
+
+# specialized formats of the field types, they raise the same exceptions
+# as the format methods before these are wrapped into a MarshallingError,
+# None is the unformatted value of Raw
+FORMATTERS = {
+    fields.Raw.format: None,
+    fields.String.format: str,
+    fields.Integer.format: int,
+    fields.Float.format: float,
+    fields.Boolean.format: fields.boolean
+}
+FORMAT_ERRORS = (MarshallingError, ValueError, TypeError)
+
+# types which are not indexable for get_value (like the db models), their
+# values are read with getattr directly
+_attribute_types: set[type] = set()
+
+_serializers: dict[int, tuple[dict, Serializer]] = {}
+
+
+def serialize(data: Any, api_model: dict) -> Any:
+    """
+    Same output as flask_restx.marshal(data, api_model), with the
+    precompiled serializer of the api model.
+    """
+    return compile_serializer(api_model)(data)
+
+
+def compile_serializer(api_model: dict) -> Serializer:
+    """
+    Compiles the api model once into a function of attribute getters and
+    the compiled serializers of the nested models.
+
+    Fields without a specialized path (masks, custom field types, ...) are
+    output by the field itself, so the result is always the one of marshal.
+    """
+    cached = _serializers.get(id(api_model))
+    if cached is not None and cached[0] is api_model:
+        return cached[1]
+
+    model_fields = getattr(api_model, "resolved", api_model)
+
+    if _requires_marshal(api_model, model_fields):
+        serializer = partial(_marshal, api_model=api_model)
+        _serializers[id(api_model)] = (api_model, serializer)
+        return serializer
+
+    field_serializers = []
+    serializer = _create_model_serializer(field_serializers)
+
+    # registered before the fields are compiled, for recursive models
+    _serializers[id(api_model)] = (api_model, serializer)
+
+    field_serializers.extend(
+        (key, _compile_field(key, field))
+        for key, field in model_fields.items()
+    )
+
+    return serializer
+
+
+# protected
+def _create_model_serializer(field_serializers: list) -> Serializer:
+    def serialize_object(obj: Any) -> dict:
+        return {key: serialize_field(obj) for key, serialize_field in field_serializers}  # noqa
+
+    def serializer(data: Any) -> Any:
+        if isinstance(data, (list, tuple)):
+            return [serialize_object(obj) for obj in data]
+        return serialize_object(data)
+
+    return serializer
+
+
+# protected
+def _requires_marshal(api_model: dict, model_fields: dict) -> bool:
+    """
+    Model masks and wildcard fields are applied by marshal only.
+    """
+    return bool(getattr(api_model, "__mask__", None)) or any(
+        isinstance(make(field), fields.Wildcard)
+        for field in model_fields.values()
+        if not isinstance(field, dict)
+    )
+
+
+# protected
+def _marshal(data: Any, api_model: dict) -> Any:
+    return marshal(data, api_model)
+
+
+# protected
+def _compile_field(key: str, field: Any) -> Serializer:
+    if isinstance(field, dict):
+        return compile_serializer(field)
+
+    field = make(field)
+    field_type = type(field)
+
+    if field_type.output is fields.Raw.output and not field.mask:
+        return _compile_raw_field(key, field)
+
+    if field_type.output is fields.Nested.output and not field.skip_none:
+        return _compile_nested_field(key, field)
+
+    if (
+        field_type.output is fields.List.output
+        and field_type.format is fields.List.format
+        and type(field.container).output is fields.Nested.output
+        and field.container.attribute is None
+        and not field.container.skip_none
+    ):
+        return _compile_list_field(key, field)
+
+    return lambda obj: field.output(key, obj)
+
+
+# protected
+def _compile_raw_field(key: str, field: fields.Raw) -> Serializer:
+    """
+    Raw.output: the default for a missing value, the formatted value
+    otherwise. Format errors are raised by field.output.
+    """
+    getter = _create_getter(key if field.attribute is None else field.attribute)  # noqa
+    format = FORMATTERS.get(type(field).format, field.format)
+    has_default = field.default is not None
+
+    def serialize_field(obj: Any) -> Any:
+        value = getter(obj)
+        if value is None:
+            return field.output(key, obj) if has_default else None
+
+        if format is None:
+            return value
+
+        try:
+            return format(value)
+        except FORMAT_ERRORS:
+            return field.output(key, obj)
+
+    return serialize_field
+
+
+# protected
+def _compile_nested_field(key: str, field: fields.Nested) -> Serializer:
+    getter = _create_getter(key if field.attribute is None else field.attribute)  # noqa
+    serialize_nested = _compile_nested_value(field)
+
+    return lambda obj: serialize_nested(getter(obj))
+
+
+# protected
+def _compile_list_field(key: str, field: fields.List) -> Serializer:
+    """
+    List.output of a list of nested models: every item is output like by
+    the Nested container.
+    """
+    getter = _create_getter(key if field.attribute is None else field.attribute)  # noqa
+    serialize_item = _compile_nested_value(field.container)
+
+    def serialize_field(obj: Any) -> Any:
+        value = getter(obj)
+        if isinstance(value, (list, tuple)):
+            return [serialize_item(item) for item in value]
+
+        if value is None:
+            return field._v("default")
+
+        return field.output(key, obj)
+
+    return serialize_field
+
+
+# protected
+def _compile_nested_value(field: fields.Nested) -> Serializer:
+    """
+    Nested.output of the already fetched value.
+    """
+    allow_null = field.allow_null
+    default = field.default
+    serializer = compile_serializer(field.model)
+
+    def serialize_value(value: Any) -> Any:
+        if value is None:
+            if allow_null:
+                return None
+            elif default is not None:
+                return default
+
+        return serializer(value)
+
+    return serialize_value
+
+
+# protected
+def _create_getter(key: Any) -> Callable[[Any], Any]:
+    """
+    get_value(key, obj), objects of not indexable types (checked once per
+    type) are read with getattr.
+    """
+    if not isinstance(key, str) or "." in key:
+        return lambda obj: get_value(key, obj)
+
+    def getter(obj: Any) -> Any:
+        if type(obj) in _attribute_types or _is_attribute_type(obj):
+            return getattr(obj, key, None)
+        return get_value(key, obj)
+
+    return getter
+
+
+# protected
+def _is_attribute_type(obj: Any) -> bool:
+    if is_indexable_but_not_string(obj):
+        return False
+
+    _attribute_types.add(type(obj))
+    return True
@@ -1,6 +1,7 @@
 DESC_UNAUTH = "Unauthorized User"
 DESC_INVUI = "Invalid User Input"
 DESC_UNEXP = "Unexpected Server Error"
+DESC_BULK_PARTIAL = "Some elements are invalid, see the status of each element"
 
 
 def desc_get(modelname: str) -> str:
@@ -11,6 +12,10 @@ def desc_list(modelname: str) -> str:
     return f"List of {modelname}s"
 
 
+def desc_batch(modelname: str) -> str:
+    return f"{modelname}s by IDs (missing IDs in the 'X-Missing-Ids' header)"
+
+
 def desc_added(modelname: str) -> str:
     return f"{modelname} added"
 